@@ -0,0 +1,232 @@
+'''
+Arrays de ALLOC no bytecode.
+
+ALLOC com valor inicial int cria um IntArray (array('q'), 8 bytes por
+posição) e com valor inicial float um FloatArray (array('d')); os demais
+valores continuam em listas, como no interpretador original. Como o
+interpretador original converte toda escrita para o tipo da posição 0
+(cast_value), uma escrita de int em IntArray ou de int/float em FloatArray
+já está convertida e vai direto para o buffer, sem cast_value.
+
+Fora do buffer, os arrays se comportam como as listas do interpretador
+original: PRINT mostra [1, 2, 3], + e * com listas e comparações usam os
+elementos e type(array)(valor) em cast_value vira list(valor). Quando uma
+escrita produz um valor que não cabe no buffer (texto, None, int maior que
+64 bits), o array passa a ser um MixedArray, que guarda os elementos em uma
+lista; a troca é feita no próprio objeto (__class__), então todas as
+referências para o array continuam válidas.
+
+fill, copy, elementwise e reduce_sum são os núcleos das instruções em bloco
+(VFILL, VCOPY, VADD/VMUL, VSUM): trabalham sobre fatias do buffer e só
+escrevem quando o resultado inteiro é igual ao das escritas uma a uma. Em
+qualquer outro caso (lista, MixedArray, posição fora do array, valor que
+degradaria o array ou erro de conversão) devolvem False/None sem alterar
+nada e o laço original é executado.
+'''
+from array import array
+
+INT_MIN, INT_MAX = -2 ** 63, 2 ** 63 - 1
+# Mensagens de IndexError do buffer e as das listas do interpretador original
+INDEX_ERRORS = {
+    'array index out of range': 'list index out of range',
+    'array assignment index out of range': 'list assignment index out of range',
+}
+
+def plain(val):
+    return val.tolist() if isinstance(val, TypedArray) else val
+
+class TypedArray(array):
+    '''
+    Base dos arrays de ALLOC: comportamento de lista por cima do buffer tipado
+    '''
+    __slots__ = ('items',)
+
+    def __new__(cls, *args):
+        if len(args) == 1:
+            # type(old)(new) em cast_value: conversão para lista, como no interpretador original
+            return list(args[0])
+        return super().__new__(cls, *args)
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __add__(self, other):
+        return self.tolist() + plain(other)
+
+    def __radd__(self, other):
+        return plain(other) + self.tolist()
+
+    def __mul__(self, times):
+        return self.tolist() * times
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        return self.tolist() == plain(other)
+
+    def __ne__(self, other):
+        return self.tolist() != plain(other)
+
+    def __lt__(self, other):
+        return self.tolist() < plain(other)
+
+    def __le__(self, other):
+        return self.tolist() <= plain(other)
+
+    def __gt__(self, other):
+        return self.tolist() > plain(other)
+
+    def __ge__(self, other):
+        return self.tolist() >= plain(other)
+
+    __hash__ = None
+
+class IntArray(TypedArray):
+    __slots__ = ()
+
+class FloatArray(TypedArray):
+    __slots__ = ()
+
+class MixedArray(TypedArray):
+    '''
+    Array que recebeu um valor fora do tipo do buffer: elementos em uma lista (items)
+    '''
+    __slots__ = ()
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __setitem__(self, index, val):
+        self.items[index] = val
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def tolist(self):
+        return list(self.items)
+
+def list_error(error):
+    '''
+    IndexError com a mensagem que a lista do interpretador original daria (None se já for de lista)
+    '''
+    message = INDEX_ERRORS.get(str(error))
+    return IndexError(message) if message is not None else None
+
+def allocate(size, val):
+    '''
+    Array de ALLOC com size posições iguais a val
+    '''
+    if val.__class__ is int and INT_MIN <= val <= INT_MAX:
+        target = IntArray('q', (val,))
+    elif val.__class__ is float:
+        target = FloatArray('d', (val,))
+    else:
+        return [val] * size
+    return array.__imul__(target, size)
+
+def degrade(target):
+    '''
+    Troca o buffer tipado por uma lista, no próprio objeto
+    '''
+    items = target.tolist()
+    array.__delitem__(target, slice(None))
+    target.items = items
+    target.__class__ = MixedArray
+
+def typed(target):
+    return target.__class__ is IntArray or target.__class__ is FloatArray
+
+def converter(target):
+    '''
+    Conversão de cast_value para a posição 0 do array
+    '''
+    return int if target.__class__ is IntArray else float
+
+def store(target, start, end, values):
+    '''
+    Escreve values (já convertidos) nas posições start..end-1 do buffer
+    '''
+    try:
+        values = array(target.typecode, values)
+    except (ValueError, TypeError, OverflowError):
+        return False
+    array.__setitem__(target, slice(start, end), values)
+    return True
+
+def fill(target, val, start, end):
+    '''
+    target[k] = val para k em start..end-1
+    '''
+    if not typed(target) or end > len(target):
+        return False
+    try:
+        val = converter(target)(val)
+    except (ValueError, TypeError, OverflowError):
+        return False
+    try:
+        values = array(target.typecode, (val,))
+    except OverflowError:
+        return False
+    return store(target, start, end, values * (end - start))
+
+def copy(target, source, start, end):
+    '''
+    target[k] = source[k] para k em start..end-1
+    '''
+    if not typed(target) or not typed(source) or end > min(len(target), len(source)):
+        return False
+    values = array.__getitem__(source, slice(start, end))
+    if source.typecode != target.typecode:
+        values = map(converter(target), values)
+    return store(target, start, end, values)
+
+def elementwise(operation, target, left, right, start, end):
+    '''
+    target[k] = operation(left[k], right[k]) para k em start..end-1
+    '''
+    if not typed(target) or not typed(left) or not typed(right) \
+            or end > min(len(target), len(left), len(right)):
+        return False
+    part = slice(start, end)
+    values = map(operation, array.__getitem__(left, part), array.__getitem__(right, part))
+    return store(target, start, end, map(converter(target), values))
+
+def reduce_sum(total, source, start, end):
+    '''
+    total + source[start] + ... + source[end-1], somado na ordem e convertido
+    a cada passo como em cast_value; None se não for possível
+    '''
+    if not typed(source) or end > len(source):
+        return None
+    values = array.__getitem__(source, slice(start, end))
+    if total.__class__ is int:
+        if source.__class__ is IntArray:
+            return total + sum(values)
+        try:
+            for val in values:
+                total = int(total + val)
+        except (ValueError, OverflowError):
+            return None
+        return total
+    if total.__class__ is float:
+        # sem sum(): a soma de floats precisa ser sequencial para dar o mesmo arredondamento
+        for val in values:
+            total = total + val
+        return total
+    return None
+
+def assign(target, pos, val):
+    '''
+    Escrita de val (já convertido por cast_value) na posição pos
+    '''
+    cls = target.__class__
+    if cls is IntArray:
+        if val.__class__ is not int or not INT_MIN <= val <= INT_MAX:
+            degrade(target)
+    elif cls is FloatArray:
+        if val.__class__ is not float:
+            degrade(target)
+    target[pos] = val
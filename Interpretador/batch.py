@@ -0,0 +1,107 @@
+'''
+Execução em lote: roda muitos programas de três endereços em um
+ProcessPoolExecutor. Cada processo cria uma VM uma única vez e a reaproveita
+para todos os programas que recebe, então a inicialização do interpretador
+(importações, compilação dos módulos) não é paga a cada arquivo. A saída de
+PRINT de cada programa é capturada separadamente; READLN lê uma entrada vazia.
+
+Uso:
+    python Interpretador/batch.py [--workers=N] [--no-optimize] [--legacy] [--output=pasta] arquivo_ou_pasta...
+
+Pastas entram com todos os arquivos .txt. Com --output, a saída de cada
+programa vai para pasta/<arquivo>.out; sem ela, é mostrada uma linha por
+programa. No fim é mostrada a vazão (programas por segundo).
+'''
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from vm import VM
+
+WORKER = None  # VM do processo de trabalho
+
+class Result:
+    '''
+    Resultado de um programa: saída de PRINT, erro (None se terminou) e tempo
+    '''
+    __slots__ = ('path', 'output', 'error', 'elapsed')
+
+    def __init__(self, path, output, error, elapsed):
+        self.path = path
+        self.output = output
+        self.error = error
+        self.elapsed = elapsed
+
+def start_worker(options):
+    global WORKER
+    WORKER = VM(**options)
+
+def run_program(path):
+    '''
+    Executa um programa na VM do processo, capturando a saída
+    '''
+    output = io.StringIO()
+    WORKER.stdin, WORKER.stdout = io.StringIO(), output
+    error = None
+    start = time.perf_counter()
+    try:
+        WORKER.load(path)
+        WORKER.run()
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    finally:
+        WORKER.stdin, WORKER.stdout = None, None
+    return Result(path, output.getvalue(), error, time.perf_counter() - start)
+
+def run_batch(paths, workers=None, **options):
+    '''
+    Executa os programas em paralelo; devolve (resultados na ordem de paths, tempo total)
+    '''
+    workers = workers or os.cpu_count() or 1
+    # lotes grandes diminuem a troca de mensagens, mas sem deixar processos parados no fim
+    chunksize = max(1, len(paths) // (4 * workers))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=start_worker, initargs=(options,)) as pool:
+        results = list(pool.map(run_program, paths, chunksize=chunksize))
+    return results, time.perf_counter() - start
+
+def expand(args):
+    paths = []
+    for arg in args:
+        if os.path.isdir(arg):
+            paths += sorted(os.path.join(arg, name) for name in os.listdir(arg) if name.endswith('.txt'))
+        else:
+            paths.append(arg)
+    return paths
+
+def main():
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    paths = expand(arg for arg in sys.argv[1:] if not arg.startswith('--'))
+    if not paths:
+        print(__doc__.strip())
+        return
+    workers = next((int(flag.split('=', 1)[1]) for flag in flags if flag.startswith('--workers=')), None)
+    folder = next((flag.split('=', 1)[1] for flag in flags if flag.startswith('--output=')), None)
+    options = {'optimize': '--no-optimize' not in flags, 'legacy': '--legacy' in flags}
+
+    results, elapsed = run_batch(paths, workers, **options)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    failed = 0
+    for result in results:
+        if result.error:
+            failed += 1
+        if folder:
+            with open(os.path.join(folder, os.path.basename(result.path) + '.out'), 'w', encoding='utf-8') as file:
+                file.write(result.output)
+        if result.error or not folder:
+            status = f"ERRO {result.error}" if result.error else f"ok ({result.output.count(chr(10))} linhas)"
+            print(f"{result.path}: {status}")
+    print(f"{len(results)} programas em {elapsed:.3f}s ({len(results) / elapsed:,.1f} programas/s), {failed} com erro")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
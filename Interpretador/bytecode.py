@@ -0,0 +1,747 @@
+'''
+Compilador do código de três endereços para bytecode e o laço de execução.
+
+compile_code transforma CODE (instruções lidas por read_code, com os operandos
+já classificados em operand.py) em uma lista de tuplas (opcode, a, b, c):
+    - números viram slots de constantes no banco de registradores;
+    - nomes de variáveis viram índices de registradores;
+    - rótulos viram o índice da instrução de destino.
+
+Na compilação o código também é ligado: LABEL e linhas em branco não viram
+instruções, a passagem da fase 1 (inicialização de globais) para main vira a
+instrução ENTER e desvios e chamadas já guardam o índice da instrução de
+destino, sem consulta a LABELS na execução.
+
+As instruções em bloco de optimizer.py (VFILL, VCOPY, VADD, VMUL, VSUM)
+executam todas as voltas de um laço contado de uma vez, com os núcleos de
+arrays.py, e desviam para o fim do laço; se não for possível, seguem para a
+instrução seguinte, que é o próprio laço.
+
+O banco de registradores é uma lista única: slots de constantes já
+preenchidos e slots de variáveis com MISSING enquanto a variável não foi
+escrita (equivale a não estar em GLOBALS no interpretador original).
+
+execute roda o bytecode com a mesma semântica de interpreter.py: toda
+variável escrita é global, a0..aN são lidos do frame enquanto não forem
+escritos, leituras de nomes desconhecidos devolvem o próprio nome e escritas
+convertem o valor para o tipo do valor anterior (cast_value).
+'''
+import operator
+import sys
+
+from arrays import IntArray, FloatArray, allocate, assign, fill, copy, elementwise, list_error, reduce_sum
+from frame import SlotFrame, StartupFrame, argument_index
+from operand import Constant, Variable, Element, classify, is_number
+from streams import LIMIT, Output, input_for
+
+# Opcodes
+LD, ADD, SUB, MULT, DIV = 0, 1, 2, 3, 4
+J, BEQ, BNE, BGT, BGE, BLT, BLE = 5, 6, 7, 8, 9, 10, 11
+PARAM, CALL, RET, PRINT, READLN, ALLOC = 12, 13, 14, 15, 16, 17
+ENTER, HALT = 18, 19          # fim da fase 1 (entra em main) e fim do programa
+LDX, STX = 20, 21             # LD com leitura/escrita de posição de array (x$i)
+GENERIC = 22                  # instrução com operandos x$i fora dos casos acima
+FAIL = 23                     # instrução inválida: lança o erro do interpretador original ao executar
+# Superinstruções de optimizer.py (operando K é o valor da constante, não um slot)
+ADDI, SUBI = 24, 25           # x = y + K, x = y - K
+BEQI, BNEI, BGTI, BGEI, BLTI, BLEI = 26, 27, 28, 29, 30, 31                    # desvio se x ? K
+ADDBEQ, ADDBNE, ADDBGT, ADDBGE, ADDBLT, ADDBLE = 32, 33, 34, 35, 36, 37  # x = x + K e desvio se x ? z
+LDRET = 38                    # LD ra x seguido de RET ra
+VFILL, VCOPY, VADD, VMUL, VSUM = 39, 40, 41, 42, 43  # laços contados sobre arrays
+
+OPCODES = {
+    'LD': LD, 'ADD': ADD, 'SUB': SUB, 'MULT': MULT, 'DIV': DIV,
+    'J': J, 'BEQ': BEQ, 'BNE': BNE, 'BGT': BGT, 'BGE': BGE, 'BLT': BLT, 'BLE': BLE,
+    'PARAM': PARAM, 'CALL': CALL, 'RET': RET, 'PRINT': PRINT, 'READLN': READLN,
+    'ALLOC': ALLOC,
+    'ADDI': ADDI, 'SUBI': SUBI, 'LDRET': LDRET,
+    'BEQI': BEQI, 'BNEI': BNEI, 'BGTI': BGTI, 'BGEI': BGEI, 'BLTI': BLTI, 'BLEI': BLEI,
+    'ADDBEQ': ADDBEQ, 'ADDBNE': ADDBNE, 'ADDBGT': ADDBGT, 'ADDBGE': ADDBGE, 'ADDBLT': ADDBLT, 'ADDBLE': ADDBLE,
+    'VFILL': VFILL, 'VCOPY': VCOPY, 'VADD': VADD, 'VMUL': VMUL, 'VSUM': VSUM,
+}
+NAMES = {code: name for name, code in OPCODES.items()}
+NAMES.update({ENTER: 'ENTER', HALT: 'HALT', LDX: 'LDX', STX: 'STX', GENERIC: 'GENERIC', FAIL: 'FAIL'})
+
+BRANCHES = (BEQ, BNE, BGT, BGE, BLT, BLE)
+ARITHMETIC = (ADD, SUB, MULT, DIV)
+
+class Missing:
+    '''
+    Marca registradores de variáveis ainda não escritas
+    '''
+    def __repr__(self):
+        return 'MISSING'
+
+MISSING = Missing()
+
+def cast_value(old_val, new_val):
+    '''
+    Converte new_val para o tipo de old_val (os tipos das variáveis são fixados pela primeira escrita)
+    '''
+    if old_val is None: return new_val
+    try:
+        if isinstance(old_val, float): return float(new_val)
+
+        if isinstance(old_val, int): return int(new_val)
+
+        return type(old_val)(new_val)
+    except (ValueError, TypeError):
+        return new_val
+
+class Program:
+    '''
+    Programa compilado
+
+    code: instruções (opcode, a, b, c), terminadas por HALT
+    lines: linha do código de três endereços de cada instrução (None para ENTER, HALT e FAIL finais)
+    registers: valores iniciais do banco de registradores (constantes e MISSING)
+    names: nome de cada slot de variável (None para constantes)
+    arguments: número do argumento de cada slot (a0 -> 0, a1 -> 1), -1 para os demais
+    slots: slot de cada nome de variável
+    main: índice da instrução do rótulo main (None se não existir)
+    '''
+    def __init__(self):
+        self.code = []
+        self.lines = []
+        self.registers = []
+        self.names = []
+        self.arguments = []
+        self.slots = {}
+        self.constants = {}
+        self.main = None
+
+    def constant(self, value):
+        # repr separa 0.0 de -0.0, que são iguais como chave de dicionário
+        key = (value.__class__, repr(value))
+        slot = self.constants.get(key)
+        if slot is None:
+            slot = self.constants[key] = len(self.registers)
+            self.registers.append(value)
+            self.names.append(None)
+            self.arguments.append(-1)
+        return slot
+
+    def variable(self, name):
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.registers)
+            self.registers.append(MISSING)
+            self.names.append(name)
+            self.arguments.append(argument_index(name))
+        return slot
+
+    def slot(self, operand):
+        '''
+        Slot de um operando escalar (Constant ou Variable); None para os demais
+        '''
+        kind = operand.__class__
+        if kind is Constant:
+            return self.constant(operand.value)
+        if kind is Variable:
+            return self.variable(operand.name)
+        return None
+
+    def descriptor(self, operand):
+        '''
+        Operando de uma instrução GENERIC: slot, (slot do array, slot do índice)
+        ou o texto de um operando mal formado
+        '''
+        if operand.__class__ is Element:
+            return (self.variable(operand.base), self.slot(operand.index))
+        slot = self.slot(operand)
+        return operand if slot is None else slot
+
+def is_scalar(operand):
+    return operand.__class__ is Constant or operand.__class__ is Variable
+
+def compile_code(code, labels):
+    '''
+    Compila e liga CODE/LABELS (formato de read_code) em um Program:
+
+        instruções da fase 1 | ENTER | instruções depois do primeiro LABEL | HALT
+
+    Na fase 1, desviar para qualquer rótulo termina a fase (o interpretador
+    original para ao chegar em um LABEL), então os rótulos da fase 1 levam
+    ao ENTER. Um CALL da fase 1 para um rótulo inexistente leva a um FAIL
+    depois do HALT (o interpretador original falha com um TypeError ao
+    comparar o PC None).
+    '''
+    program = Program()
+    program.variable('ra')
+    program.registers[program.slots['ra']] = None
+    first = next((i for i, parts in enumerate(code) if parts[0] == 'LABEL'), len(code))
+
+    startup = [i for i in range(first) if code[i][0]]
+    enter = len(startup)
+    position = {}
+    pc = enter + 1
+    for i in range(first, len(code)):
+        position[i] = pc
+        if code[i][0] and code[i][0] != 'LABEL':
+            pc += 1
+    halt = pc
+    linked = {label: position.get(i, halt) for label, i in labels.items()}
+    program.main = linked.get('main', None)
+
+    missing = False
+    for i in startup:
+        instruction = compile_instruction(program, code[i], dict.fromkeys(labels, enter))
+        if instruction[0] == CALL and instruction[1] is None:
+            instruction = (CALL, halt + 1) + instruction[2:]
+            missing = True
+        program.code.append(instruction)
+        program.lines.append(i)
+    program.code.append((ENTER, None, None, None))
+    program.lines.append(None)
+    for i in range(first, len(code)):
+        if code[i][0] and code[i][0] != 'LABEL':
+            program.code.append(compile_instruction(program, code[i], linked))
+            program.lines.append(i)
+    program.code.append((HALT, None, None, None))
+    program.lines.append(None)
+    if missing:
+        error = RuntimeError("CALL na fase 1 para um rótulo inexistente")
+        program.code.append((FAIL, error, None, None))
+        program.lines.append(None)
+    return program
+
+def compile_instruction(program, parts, labels):
+    name = parts[0]
+    op = OPCODES.get(name)
+    if op is None:
+        return (FAIL, KeyError(name), None, None)
+    args = classify(parts)[1:]
+    try:
+        if op == LD:
+            a, b = args
+            if a.__class__ is Variable and is_scalar(b):
+                return (LD, program.slot(a), program.slot(b), None)
+            if a.__class__ is Element and is_scalar(b):
+                return (STX, program.variable(a.base), program.slot(a.index), program.slot(b))
+            if a.__class__ is Variable and b.__class__ is Element:
+                return (LDX, program.slot(a), program.variable(b.base), program.slot(b.index))
+            return generic(program, op, args)
+        if op in ARITHMETIC or op == ALLOC:
+            a, b, c = args
+            if a.__class__ is Variable and is_scalar(b) and is_scalar(c):
+                return (op, program.slot(a), program.slot(b), program.slot(c))
+            return generic(program, op, args)
+        if op == J:
+            return (J, labels.get(args[0]), args[0], None)
+        if op in BRANCHES:
+            a, b, label = args
+            if is_scalar(a) and is_scalar(b):
+                return (op, program.slot(a), program.slot(b), (labels.get(label), label))
+            return generic(program, op, (a, b), (labels.get(label), label))
+        if op == ADDI or op == SUBI:
+            a, b, c = args
+            if a.__class__ is Variable and is_scalar(b) and c.__class__ is Constant:
+                return (op, program.slot(a), program.slot(b), c.value)
+            raise ValueError(f"operandos inválidos para {name}")
+        if op >= BEQI and op <= BLEI:
+            a, b, label = args
+            if is_scalar(a) and b.__class__ is Constant:
+                return (op, program.slot(a), b.value, (labels.get(label), label))
+            raise ValueError(f"operandos inválidos para {name}")
+        if op >= ADDBEQ and op <= ADDBLE:
+            a, b, c, label = args
+            if a.__class__ is Variable and b.__class__ is Constant and is_scalar(c):
+                return (op, program.slot(a), b.value, (program.slot(c), labels.get(label), label))
+            raise ValueError(f"operandos inválidos para {name}")
+        if op == LDRET:
+            if is_scalar(args[0]):
+                return (LDRET, program.slot(args[0]), None, None)
+            raise ValueError(f"operandos inválidos para {name}")
+        if op >= VFILL and op <= VSUM:
+            return vector(program, op, args, labels)
+        if op == CALL:
+            a, b = args
+            # número de argumentos constante: resolvido aqui (range aceita apenas inteiros)
+            count = len(range(b.value)) if b.__class__ is Constant and isinstance(b.value, int) else None
+            return (CALL, labels.get(a), program.descriptor(b), count)
+        a = args[0]
+        if op == READLN:
+            if a.__class__ is Variable:
+                return (READLN, program.slot(a), None, None)
+            return generic(program, op, (a,))
+        if is_scalar(a):
+            return (op, program.slot(a), None, None)
+        return generic(program, op, (a,))
+    except (ValueError, IndexError) as error:
+        return (FAIL, error, None, None)
+
+def vector(program, op, args, labels):
+    '''
+    Instrução em bloco: (op, array ou soma, operandos, (contador, limite, BLE?, saída))
+    '''
+    *operands, counter, limit, condition, label = args
+    count = 3 if op == VADD or op == VMUL else 2
+    if len(operands) != count or condition not in ('BLT', 'BLE') or not is_scalar(limit) \
+            or not all(operand.__class__ is Variable for operand in operands[:count - 1] + [counter]) \
+            or not is_scalar(operands[-1]) or op != VFILL and operands[-1].__class__ is not Variable:
+        raise ValueError(f"operandos inválidos para {NAMES[op]}")
+    loop = (program.variable(counter.name), program.slot(limit), condition == 'BLE', labels.get(label))
+    slots = [program.slot(operand) for operand in operands]
+    if count == 3:
+        return (op, slots[0], (slots[1], slots[2]), loop)
+    return (op, slots[0], slots[1], loop)
+
+def generic(program, op, args, target=None):
+    '''
+    Instrução GENERIC: operandos com posições de array fora dos casos de LDX/STX
+    '''
+    return (GENERIC, op, tuple(program.descriptor(operand) for operand in args), target)
+
+def execute(program, stdin=None, stdout=None):
+    '''
+    Executa o programa compilado.
+
+    Fase 1: executa a partir da instrução 0 até ENTER (inicialização de
+    globais). Fase 2: ENTER cria o frame de main e desvia para o rótulo main.
+    READLN lê de stdin e PRINT escreve em stdout (por padrão, a entrada e a
+    saída do processo); ver streams.py.
+    '''
+    code = program.code
+    names = program.names
+    arguments = program.arguments
+    slots = program.slots
+    R = list(program.registers)
+    RA = slots['ra']
+    stack = [StartupFrame()]
+    parameters = []
+
+    output = Output(sys.stdout if stdout is None else stdout)
+    printed = output.lines
+
+    def read_line():
+        '''
+        Linha de READLN: a saída pendente é escrita antes da leitura
+        '''
+        reader = input_for(sys.stdin if stdin is None else stdin)
+        output.flush()
+        if reader.interactive:
+            output.stream.flush()
+        return reader.read_line()
+
+    def read_number(text):
+        val = is_number(text)
+        return val if val is not None else text
+
+    def frame_value(name, index):
+        '''
+        Leitura de um nome que não é global: argumento index do frame atual,
+        resolvendo valores que são nomes de outras variáveis
+        '''
+        if index >= 0:
+            val = stack[-1].get_arg(index)
+            if val is not None:
+                return resolve(val) if isinstance(val, str) and val != name else val
+        return name
+
+    def read_slow(slot):
+        '''
+        Leitura de um registrador MISSING (frame_value sem chamadas intermediárias)
+        '''
+        index = arguments[slot]
+        if index >= 0:
+            args = stack[-1].args
+            if index < len(args):
+                val = args[index]
+                if val is not None:
+                    return resolve(val) if isinstance(val, str) and val != names[slot] else val
+        return names[slot]
+
+    def array_slow(slot):
+        '''
+        Array que não está nos registradores: argumentos do frame atual
+        '''
+        return stack[-1].get_arg(arguments[slot])
+
+    def lookup(name):
+        '''
+        Variável pelo nome (como GLOBALS.get seguido do frame atual), sem resolver nomes
+        '''
+        slot = slots.get(name)
+        target = R[slot] if slot is not None else None
+        if target is MISSING:
+            target = None
+        if target is None:
+            target = stack[-1].get_arg(argument_index(name))
+        return target
+
+    def resolve(token):
+        '''
+        Valor de um texto obtido em execução (argumento que guarda o nome de
+        outra variável), pela semântica de to_value do interpretador original
+        '''
+        val = is_number(token)
+        if val is not None:
+            return val
+        if '$' in token:
+            name, pos = token.split('$')
+            pos_val = int(resolve(pos))
+            target = lookup(name)
+            return target[pos_val] if target is not None else None
+        slot = slots.get(token)
+        if slot is not None and R[slot] is not MISSING:
+            return R[slot]
+        return frame_value(token, argument_index(token))
+
+    def store(slot, val):
+        old = R[slot]
+        cls = val.__class__
+        if old.__class__ is cls and (cls is int or cls is float) or old is MISSING or old is None:
+            R[slot] = val
+        else:
+            R[slot] = cast_value(old, val)
+
+    def read(operand):
+        '''
+        Leitura de um descritor de GENERIC
+        '''
+        kind = operand.__class__
+        if kind is int:
+            val = R[operand]
+            return read_slow(operand) if val is MISSING else val
+        if kind is tuple:
+            base, index = operand
+            pos = int(read(index))
+            target = R[base]
+            if target is MISSING or target is None: target = array_slow(base)
+            return target[pos] if target is not None else None
+        return resolve(operand)
+
+    def write(operand, val):
+        '''
+        Escrita em um descritor de GENERIC
+        '''
+        kind = operand.__class__
+        if kind is int:
+            store(operand, val)
+            return
+        if kind is tuple:
+            base, index = operand
+            pos = int(read(index))
+            target = R[base]
+            if target is MISSING or target is None: target = array_slow(base)
+        else:
+            # operando mal formado: lança o ValueError do interpretador original
+            name, index = operand.split('$')
+            pos = int(read(index))
+            target = lookup(name)
+        if target is not None:
+            assign(target, pos, cast_value(target[0], val))
+
+    def branch(op, x, y):
+        if op == BEQ: return x == y
+        if op == BNE: return x != y
+        if op == BGT: return x > y
+        if op == BGE: return x >= y
+        if op == BLT: return x < y
+        return x <= y
+
+    def arithmetic(op, x, y):
+        if op == ADD: return x + y
+        if op == SUB: return x - y
+        if op == MULT: return x * y
+        try:
+            return x / y
+        except ZeroDivisionError:
+            return 0
+
+    def generic(op, args, target, pc):
+        '''
+        Instrução com posições de array em operandos pouco comuns
+        '''
+        if op == LD:
+            write(args[0], read(args[1]))
+        elif op in ARITHMETIC:
+            write(args[0], arithmetic(op, read(args[1]), read(args[2])))
+        elif op == ALLOC:
+            size = int(read(args[1]))
+            write(args[0], allocate(size, read(args[2])))
+        elif op in BRANCHES:
+            if branch(op, read(args[0]), read(args[1])):
+                return jump(target)
+        elif op == PARAM:
+            parameters.append(read(args[0]))
+        elif op == PRINT:
+            printed.append(str(read(args[0])))
+            if len(printed) >= LIMIT: output.flush()
+        elif op == READLN:
+            write(args[0], read_number(read_line()))
+        elif op == RET:
+            return ret(read(args[0]))
+        return pc + 1
+
+    def jump(target):
+        pc, label = target
+        if pc is None:
+            raise KeyError(label)
+        return pc
+
+    def ret(val):
+        R[RA] = val
+        frame = stack.pop()
+        return frame.static_link
+
+    def argument(val):
+        '''
+        CALL avalia de novo cada parâmetro (to_value sobre o valor já calculado)
+        '''
+        if val.__class__ is str:
+            return resolve(val)
+        if val is None:
+            raise TypeError("argument of type 'NoneType' is not iterable")
+        return val
+
+    def vector(op, a, b, c, pc):
+        '''
+        Instrução em bloco: executa as voltas restantes do laço e desvia para
+        a saída, ou segue para o laço original (pc + 1)
+        '''
+        counter, limit, inclusive, exit = c
+        start = R[counter]
+        n = R[limit]
+        if n is MISSING: n = read_slow(limit)
+        if exit is None or start.__class__ is not int or n.__class__ is not int or start < 0:
+            return pc + 1
+        # o laço é um do-while: o corpo executa ao menos uma vez
+        end = max(start + 1, n + 1 if inclusive else n)
+        if op == VSUM:
+            total = reduce_sum(R[a], R[b], start, end)
+            if total is None:
+                return pc + 1
+            R[a] = total
+        elif op == VFILL:
+            val = R[b]
+            if val is MISSING: val = read_slow(b)
+            if not fill(R[a], val, start, end):
+                return pc + 1
+        elif op == VCOPY:
+            if not copy(R[a], R[b], start, end):
+                return pc + 1
+        elif not elementwise(operator.add if op == VADD else operator.mul, R[a], R[b[0]], R[b[1]], start, end):
+            return pc + 1
+        R[counter] = end
+        return exit
+
+    try:
+        pc = 0
+        while True:
+            op, a, b, c = code[pc]
+            if op == LD:
+                val = R[b]
+                if val is MISSING: val = read_slow(b)
+                old = R[a]
+                cls = val.__class__
+                if old.__class__ is cls and (cls is int or cls is float or cls is str) or old is MISSING or old is None:
+                    R[a] = val
+                elif old.__class__ is float and cls is int:
+                    R[a] = float(val)
+                else:
+                    R[a] = cast_value(old, val)
+                pc += 1
+            elif op == ADD or op == SUB or op == MULT:
+                x = R[b]
+                if x is MISSING: x = read_slow(b)
+                y = R[c]
+                if y is MISSING: y = read_slow(c)
+                if op == ADD: val = x + y
+                elif op == SUB: val = x - y
+                else: val = x * y
+                old = R[a]
+                cls = val.__class__
+                if old.__class__ is cls and (cls is int or cls is float or cls is str) or old is MISSING or old is None:
+                    R[a] = val
+                elif old.__class__ is float and cls is int:
+                    R[a] = float(val)
+                else:
+                    R[a] = cast_value(old, val)
+                pc += 1
+            elif op >= BEQ and op <= BLE:
+                x = R[a]
+                if x is MISSING: x = read_slow(a)
+                y = R[b]
+                if y is MISSING: y = read_slow(b)
+                if op == BEQ: taken = x == y
+                elif op == BNE: taken = x != y
+                elif op == BGT: taken = x > y
+                elif op == BGE: taken = x >= y
+                elif op == BLT: taken = x < y
+                else: taken = x <= y
+                if taken:
+                    pc = c[0]
+                    if pc is None: raise KeyError(c[1])
+                else:
+                    pc += 1
+            elif op >= ADDBEQ and op <= ADDBLE:
+                x = R[a]
+                if x is MISSING: x = read_slow(a)
+                val = x + b
+                old = R[a]
+                cls = val.__class__
+                if old.__class__ is cls and (cls is int or cls is float or cls is str) or old is MISSING or old is None:
+                    R[a] = val
+                elif old.__class__ is float and cls is int:
+                    R[a] = float(val)
+                else:
+                    R[a] = cast_value(old, val)
+                x = R[a]
+                z, target, label = c
+                y = R[z]
+                if y is MISSING: y = read_slow(z)
+                if op == ADDBLT: taken = x < y
+                elif op == ADDBLE: taken = x <= y
+                elif op == ADDBNE: taken = x != y
+                elif op == ADDBEQ: taken = x == y
+                elif op == ADDBGT: taken = x > y
+                else: taken = x >= y
+                if taken:
+                    pc = target
+                    if pc is None: raise KeyError(label)
+                else:
+                    pc += 1
+            elif op == ADDI or op == SUBI:
+                x = R[b]
+                if x is MISSING: x = read_slow(b)
+                if op == ADDI: val = x + c
+                else: val = x - c
+                old = R[a]
+                cls = val.__class__
+                if old.__class__ is cls and (cls is int or cls is float or cls is str) or old is MISSING or old is None:
+                    R[a] = val
+                elif old.__class__ is float and cls is int:
+                    R[a] = float(val)
+                else:
+                    R[a] = cast_value(old, val)
+                pc += 1
+            elif op >= BEQI and op <= BLEI:
+                x = R[a]
+                if x is MISSING: x = read_slow(a)
+                if op == BEQI: taken = x == b
+                elif op == BNEI: taken = x != b
+                elif op == BGTI: taken = x > b
+                elif op == BGEI: taken = x >= b
+                elif op == BLTI: taken = x < b
+                else: taken = x <= b
+                if taken:
+                    pc = c[0]
+                    if pc is None: raise KeyError(c[1])
+                else:
+                    pc += 1
+            elif op == J:
+                pc = a
+                if pc is None: raise KeyError(b)
+            elif op == DIV:
+                x = R[b]
+                if x is MISSING: x = read_slow(b)
+                y = R[c]
+                if y is MISSING: y = read_slow(c)
+                try:
+                    val = x / y
+                except ZeroDivisionError:
+                    val = 0
+                store(a, val)
+                pc += 1
+            elif op == LDX:
+                i = R[c]
+                if i is MISSING: i = read_slow(c)
+                pos = int(i)
+                target = R[b]
+                if target is MISSING or target is None: target = array_slow(b)
+                store(a, target[pos] if target is not None else None)
+                pc += 1
+            elif op == STX:
+                val = R[c]
+                if val is MISSING: val = read_slow(c)
+                i = R[b]
+                if i is MISSING: i = read_slow(b)
+                pos = int(i)
+                target = R[a]
+                if target is MISSING or target is None: target = array_slow(a)
+                if target is not None:
+                    # int em IntArray e float em FloatArray já têm o tipo da posição 0
+                    cls = val.__class__
+                    if cls is int and target.__class__ is IntArray:
+                        try:
+                            target[pos] = val
+                        except OverflowError:
+                            assign(target, pos, val)
+                    elif cls is float and target.__class__ is FloatArray:
+                        target[pos] = val
+                    else:
+                        assign(target, pos, cast_value(target[0], val))
+                pc += 1
+            elif op == PARAM:
+                val = R[a]
+                if val is MISSING: val = read_slow(a)
+                parameters.append(val)
+                pc += 1
+            elif op == CALL:
+                # A lista de PARAM vira a lista de argumentos do frame, sem cópia
+                count = c if c is not None else len(range(read(b)))
+                args = parameters
+                parameters = []
+                if len(args) != count:
+                    if len(args) < count:
+                        for val in args: argument(val)
+                        raise IndexError('pop from empty list')
+                    del args[count:]
+                # CALL avalia de novo os parâmetros: só textos (nomes) mudam
+                for val in args:
+                    if val.__class__ is str or val is None:
+                        args = [argument(val) for val in args]
+                        break
+                stack.append(SlotFrame(pc + 1, args))
+                pc = a
+                if pc is None: break
+            elif op == RET:
+                val = R[a]
+                if val is MISSING: val = read_slow(a)
+                R[RA] = val
+                pc = stack.pop().static_link
+                if pc is None: break
+            elif op == LDRET:
+                val = R[a]
+                if val is MISSING: val = read_slow(a)
+                store(RA, val)
+                pc = stack.pop().static_link
+                if pc is None: break
+            elif op == PRINT:
+                val = R[a]
+                if val is MISSING: val = read_slow(a)
+                printed.append(str(val))
+                if len(printed) >= LIMIT: output.flush()
+                pc += 1
+            elif op == READLN:
+                store(a, read_number(read_line()))
+                pc += 1
+            elif op == ALLOC:
+                size = R[b]
+                if size is MISSING: size = read_slow(b)
+                val = R[c]
+                if val is MISSING: val = read_slow(c)
+                store(a, allocate(int(size), val))
+                pc += 1
+            elif op == GENERIC:
+                pc = generic(a, b, c, pc)
+                if pc is None: break
+            elif op >= VFILL and op <= VSUM:
+                pc = vector(op, a, b, c, pc)
+            elif op == ENTER:
+                stack.append(SlotFrame())
+                pc = program.main
+                if pc is None: break
+            elif op == HALT:
+                break
+            else:
+                raise a
+    except IndexError as error:
+        # posição fora de um IntArray/FloatArray: mesma mensagem da lista
+        replacement = list_error(error)
+        if replacement is None:
+            raise
+        raise replacement from None
+    finally:
+        output.flush()
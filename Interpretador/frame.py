@@ -39,3 +39,41 @@ class Frame():
                 self.variables[id] = val
             else:
                 self.variables[id][pos] = val
+
+def argument_index(id):
+    '''
+    Número do argumento de um nome a0, a1, ... (como CALL nomeia os parâmetros); -1 para outros nomes
+    '''
+    if len(id) > 1 and id[0] == 'a' and id[1:].isdigit() and id[1:] == str(int(id[1:])):
+        return int(id[1:])
+    return -1
+
+class SlotFrame():
+    '''
+    Frame do bytecode: como toda variável escrita é global, o frame guarda apenas
+    o endereço de retorno e os argumentos, em uma lista indexada pelo número do
+    argumento (a0 -> args[0]). O número de cada registrador aN é calculado na
+    compilação (Program.arguments).
+    '''
+    __slots__ = ('static_link', 'args')
+
+    def __init__(self, static_link=None, args=()):
+        self.static_link = static_link
+        self.args = args
+
+    def get_arg(self, index):
+        return self.args[index] if 0 <= index < len(self.args) else None
+
+class StartupFrame(SlotFrame):
+    '''
+    Base da pilha do bytecode: na fase 1 não há frame (current_frame() é None no
+    interpretador original), então não há argumentos e RET falha
+    '''
+    __slots__ = ()
+
+    def __init__(self):
+        self.args = ()
+
+    @property
+    def static_link(self):
+        raise RuntimeError("RET na fase 1, fora de uma função")
@@ -1,4 +1,10 @@
 from frame import Frame
+from bytecode import compile_code, execute
+from optimizer import Optimizer, dump
+from profiler import Profiler
+from operand import Constant, Variable, Element, classify, is_number
+import tacc
+import re
 import sys
 import shlex
 
@@ -9,29 +15,50 @@ STACK: list[Frame] = []       # Pilha de frames (chamadas de funções)
 GLOBALS = {'ra': None}        # Variáveis globais
 PARAMETERS = []               # Fila de parâmetros usado pela instrução PARAM
 
-def read_code(dir):
-    with open(dir, 'r', encoding='utf-8-sig') as file:
-        lines = file.readlines()
-        
+# Caracteres que shlex.split trata de forma diferente de str.split: aspas,
+# barra invertida e espaços que não são ' \t\r\n' (inclusive os não ASCII)
+SPECIAL = re.compile(r'[\'"\\\x0b\x0c\x1c-\x1f]|[^\x00-\x7f]')
+
+def split_line(line):
+    '''
+    Tokens de uma linha sem espaços nas pontas, como shlex.split
+    '''
+    if SPECIAL.search(line) is None:
+        return line.split()
+    return shlex.split(line)
+
+def read_code(dir, classified=True):
+    '''
+    Lê o programa; com classified, os operandos já vêm classificados (operand.py).
+
+    O arquivo é lido linha a linha e cada linha é separada com str.split;
+    shlex.split só é usado em linhas com aspas, barra invertida ou espaços
+    incomuns. Operandos repetidos são classificados uma única vez. Arquivos .tacc (tacc.py) são carregados sem análise de texto.
+    '''
+    if str(dir).endswith('.tacc'):
+        return tacc.load(dir, classified)
+
     code = []
     labels = {}
-    
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if not line:
-            code.append([''])
-            continue
-            
-        parts = shlex.split(line)
-        if not parts:
-            code.append([''])
-            continue
+    cache = {}
+
+    with open(dir, 'r', encoding='utf-8-sig') as file, tacc.no_collection():
+        for i, line in enumerate(file):
+            line = line.strip()
+            if not line:
+                code.append([''])
+                continue
+
+            parts = split_line(line)
+            if not parts:
+                code.append([''])
+                continue
+
+            code.append(classify(parts, cache) if classified else parts)
+
+            if parts[0] == 'LABEL':
+                labels[parts[1]] = i
 
-        code.append(parts)
-        
-        if parts[0] == 'LABEL':
-            labels[parts[1]] = i
-            
     return code, labels
 
 def current_frame():
@@ -48,32 +75,27 @@ def get_addresses():
     addresses = CODE[PC][1:] # Retorna tudo menos o tipo da instrução
     return addresses
 
-def is_number(val):
-    if not isinstance(val, str): return val
-    if '.' in val:
-        try: return float(val)
-        except ValueError: return None
-    try: return int(val)
-    except ValueError: return None
-
 def to_value(id):
     global GLOBALS, STACK
-    
-    # id é número?
-    val = is_number(id)
-    if val is not None: 
-        return val
-        
-    # id é uma posição de array?
-    if '$' in id:
-        name, pos = id.split('$')
-        pos_val = int(to_value(pos))
-        
-        target = GLOBALS.get(name)
-        if target is None and current_frame():
-            target = current_frame().get_var(name)
-        
-        return target[pos_val] if target is not None else None
+
+    # Operando já classificado por read_code
+    kind = id.__class__
+    if kind is Constant:
+        return id.value
+    if kind is Element:
+        return element_value(id.base, id.index)
+    if kind is Variable:
+        id = id.name
+    else:
+        # id é número?
+        val = is_number(id)
+        if val is not None:
+            return val
+
+        # id é uma posição de array?
+        if '$' in id:
+            name, pos = id.split('$')
+            return element_value(name, pos)
 
     # id é uma váriável global?
     if id in GLOBALS: 
@@ -88,6 +110,15 @@ def to_value(id):
     
     return id
 
+def element_value(name, pos):
+    pos_val = int(to_value(pos))
+
+    target = GLOBALS.get(name)
+    if target is None and current_frame():
+        target = current_frame().get_var(name)
+
+    return target[pos_val] if target is not None else None
+
 def set_value(id, val):
     global GLOBALS, STACK
     
@@ -102,7 +133,11 @@ def set_value(id, val):
         except (ValueError, TypeError):
             return new_val
 
-    if '$' not in id:
+    kind = id.__class__
+    if kind is Variable:
+        id = id.name
+
+    if kind is not Element and '$' not in id:
         if id in GLOBALS:
             GLOBALS[id] = cast_value(GLOBALS[id], val)
         else:
@@ -117,7 +152,7 @@ def set_value(id, val):
             else:
                 GLOBALS[id] = val
     else:
-        name, pos = id.split('$')
+        name, pos = (id.base, id.index) if kind is Element else id.split('$')
         pos = int(to_value(pos))
         
         target_array = GLOBALS.get(name)
@@ -281,7 +316,11 @@ def ALLOC():
     
     PC += 1
 
-def main():
+def run_legacy():
+    '''
+    Executa CODE/LABELS pelos handlers de cada instrução
+    '''
+    global PC
     HANDLER = {
         'LD': LOAD,
         'ADD': ADD,
@@ -304,13 +343,7 @@ def main():
         'ALLOC': ALLOC,
         '': None
     }
-    args = sys.argv
-    if len(args)<=1:
-        return
-    global CODE, LABELS, PC
-    CODE, LABELS = read_code(args[1])
     PC = 0
-
     while PC < len(CODE) and code_type(PC) != 'LABEL':
         func = code_type(PC)
         if func:
@@ -328,5 +361,41 @@ def main():
         else:
             PC += 1
 
+def main():
+    # --legacy: executa as instruções pelos handlers acima, sem compilar para bytecode
+    # --no-optimize: compila para bytecode sem passar pelo otimizador
+    # --no-vectorize: otimiza sem trocar laços sobre arrays por instruções em bloco
+    # --no-allocate: otimiza sem reaproveitar os registradores de temporários mortos
+    # --dump: mostra o programa otimizado em vez de executá-lo
+    # --profile: executa com perfil e mostra os pontos mais custosos em stderr
+    # --profile-json=arquivo: executa com perfil e grava o resultado em JSON
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    args = [sys.argv[0]] + [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args)<=1:
+        return
+    global CODE, LABELS
+    CODE, LABELS = read_code(args[1])
+
+    if '--legacy' not in flags:
+        code, labels = (CODE, LABELS) if '--no-optimize' in flags else Optimizer(vectorize='--no-vectorize' not in flags, allocate='--no-allocate' not in flags).optimize(CODE)
+        if '--dump' in flags:
+            print(dump(code))
+            return
+        output = next((flag.split('=', 1)[1] for flag in flags if flag.startswith('--profile-json=')), None)
+        if '--profile' in flags or output:
+            profiler = Profiler(code, labels)
+            try:
+                profiler.run()
+            finally:
+                if output:
+                    profiler.write_json(output)
+                else:
+                    print(profiler.report(), file=sys.stderr)
+            return
+        execute(compile_code(code, labels))
+        return
+
+    run_legacy()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+'''
+Classificação dos operandos do código de três endereços, feita uma única vez
+por read_code:
+    - Constant: número (o texto já convertido para int ou float);
+    - Variable: nome de variável;
+    - Element: posição de array (nome$indice), com o nome da variável do array
+      e o operando do índice já classificado.
+
+Operandos mal formados (x$i$j) ficam como texto e são tratados como antes na
+execução. Rótulos continuam como texto.
+'''
+
+def is_number(val):
+    if not isinstance(val, str): return val
+    if '.' in val:
+        try: return float(val)
+        except ValueError: return None
+    try: return int(val)
+    except ValueError: return None
+
+class Constant:
+    __slots__ = ('value', 'text')
+
+    def __init__(self, value, text):
+        self.value = value
+        self.text = text
+
+    def __repr__(self):
+        return self.text
+
+class Variable:
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+class Element:
+    __slots__ = ('base', 'index', 'text')
+
+    def __init__(self, base, index, text):
+        self.base = base
+        self.index = index
+        self.text = text
+
+    def __repr__(self):
+        return self.text
+
+# Papel de cada operando por instrução: s = leitura, t = escrita, l = rótulo
+LAYOUT = {
+    'LD': 'ts', 'ADD': 'tss', 'SUB': 'tss', 'MULT': 'tss', 'DIV': 'tss', 'ALLOC': 'tss',
+    'READLN': 't', 'PRINT': 's', 'PARAM': 's', 'RET': 's',
+    'J': 'l', 'LABEL': 'l', 'CALL': 'ls',
+    'BEQ': 'ssl', 'BNE': 'ssl', 'BGT': 'ssl', 'BGE': 'ssl', 'BLT': 'ssl', 'BLE': 'ssl',
+    # Superinstruções geradas por optimizer.py
+    'ADDI': 'tss', 'SUBI': 'tss', 'LDRET': 's',
+    'BEQI': 'ssl', 'BNEI': 'ssl', 'BGTI': 'ssl', 'BGEI': 'ssl', 'BLTI': 'ssl', 'BLEI': 'ssl',
+    'ADDBEQ': 'tssl', 'ADDBNE': 'tssl', 'ADDBGT': 'tssl', 'ADDBGE': 'tssl', 'ADDBLT': 'tssl', 'ADDBLE': 'tssl',
+    # Instruções em bloco: arrays, contador (escrito), limite, BLT/BLE e rótulo de saída
+    'VFILL': 'sstsll', 'VCOPY': 'sstsll', 'VADD': 'ssstsll', 'VMUL': 'ssstsll', 'VSUM': 'tstsll',
+}
+
+def element(token):
+    parts = token.split('$')
+    if len(parts) != 2:
+        return token
+    return Element(parts[0], source(parts[1]), token)
+
+def source(token):
+    '''
+    Operando de leitura, na ordem de to_value: número, posição de array ou variável
+    '''
+    if not isinstance(token, str):
+        return token
+    value = is_number(token)
+    if value is not None:
+        return Constant(value, token)
+    if '$' in token:
+        return element(token)
+    return Variable(token)
+
+def target(token):
+    '''
+    Operando de escrita, na ordem de set_value: posição de array ou variável
+    '''
+    if not isinstance(token, str):
+        return token
+    if '$' in token:
+        return element(token)
+    return Variable(token)
+
+def classify(parts, cache=None):
+    '''
+    Troca os operandos de uma instrução lida por read_code pelos operandos
+    classificados (instruções já classificadas voltam iguais). Com cache
+    (dicionário (papel, texto) -> operando, um por programa), o mesmo texto no
+    mesmo papel é classificado uma única vez e vira o mesmo objeto.
+    '''
+    layout = LAYOUT.get(parts[0])
+    if layout is None:
+        return parts
+    classified = [parts[0]]
+    for i, token in enumerate(parts[1:]):
+        role = layout[i] if i < len(layout) else 'l'
+        if role == 'l':
+            classified.append(token)
+            continue
+        if cache is not None:
+            operand = cache.get((role, token))
+            if operand is None:
+                operand = cache[(role, token)] = source(token) if role == 's' else target(token)
+            classified.append(operand)
+        elif role == 's':
+            classified.append(source(token))
+        else:
+            classified.append(target(token))
+    return classified
@@ -0,0 +1,509 @@
+'''
+Otimizador do código de três endereços, executado sobre CODE (operandos já
+classificados por read_code) antes da compilação para bytecode:
+
+    - dobramento de constantes: ADD/SUB/MULT/DIV e desvios com dois operandos constantes;
+    - propagação de constantes e de cópias de constantes dentro de cada bloco básico;
+    - eliminação de escritas mortas (LD de constante em variável que nunca é lida);
+    - encadeamento de desvios (J para um rótulo que só faz outro J) e remoção de
+      J para o rótulo seguinte e de código inalcançável depois de J/RET;
+    - superinstruções: ADDI/SUBI (soma/subtração com constante), BEQI..BLEI
+      (comparação com constante e desvio), ADDBEQ..ADDBLE (soma com constante
+      seguida do desvio que testa a mesma variável) e LDRET (LD ra x + RET ra);
+    - laços contados de uma instrução sobre arrays (LABEL L, corpo, ADD i i 1,
+      BLT/BLE i n L) ganham uma instrução em bloco antes do laço: VFILL
+      (v$i = x), VCOPY (v$i = w$i), VADD/VMUL (v$i = w$i + u$i, w$i * u$i) e
+      VSUM (s = s + v$i). Ela executa todas as voltas de uma vez e desvia para
+      o fim do laço, ou segue para o laço original quando não consegue
+      garantir o mesmo resultado (ver arrays.py);
+    - alocação de registradores: temporários cujos valores já morreram são
+      reaproveitados por outros do mesmo tipo (ver registers.py).
+
+Toda variável escrita é global e cada escrita converte o valor para o tipo do
+valor anterior (cast_value), então propagação e eliminação só valem para
+"registradores constantes": variáveis (exceto ra) cujas escritas no programa
+inteiro são todas LD de constante do mesmo tipo. Como READLN e operandos mal
+formados (x$i$j) podem produzir nomes lidos só na execução, programas com
+eles não têm escritas eliminadas.
+
+As superinstruções existem só no bytecode: o código otimizado não roda com --legacy.
+'''
+import math
+import shlex
+
+from operand import Constant, Variable, Element, LAYOUT, is_number
+
+ARITHMETIC = {
+    'ADD': lambda x, y: x + y,
+    'SUB': lambda x, y: x - y,
+    'MULT': lambda x, y: x * y,
+}
+BRANCHES = {
+    'BEQ': lambda x, y: x == y,
+    'BNE': lambda x, y: x != y,
+    'BGT': lambda x, y: x > y,
+    'BGE': lambda x, y: x >= y,
+    'BLT': lambda x, y: x < y,
+    'BLE': lambda x, y: x <= y,
+}
+# Instruções que desempacotam todos os operandos (as demais usam só o primeiro)
+# ADDBEQ..ADDBLE e as instruções em bloco também leem as variáveis que escrevem
+COUNTERS = {'ADD' + name for name in BRANCHES}
+VECTOR = {'VFILL', 'VCOPY', 'VADD', 'VMUL', 'VSUM'}
+EXACT = {'LD', 'ADD', 'SUB', 'MULT', 'DIV', 'ALLOC', 'CALL', 'ADDI', 'SUBI', 'LDRET'} | set(BRANCHES) \
+    | {name + 'I' for name in BRANCHES} | COUNTERS | VECTOR
+
+def valid(parts):
+    '''
+    Instrução conhecida e com o número de operandos esperado (as demais falham ao executar e não são tocadas)
+    '''
+    layout = LAYOUT.get(parts[0])
+    if layout is None:
+        return not parts[0]
+    if parts[0] in EXACT:
+        return len(parts) - 1 == len(layout)
+    return len(parts) > 1
+
+def number(value):
+    return value.__class__ in (int, float) and math.isfinite(value)
+
+def constant(value):
+    '''
+    Constant com um texto que read_code lê de volta como o mesmo valor (None se não houver)
+    '''
+    text = repr(value)
+    if is_number(text) != value or is_number(text).__class__ is not value.__class__:
+        return None
+    return Constant(value, text)
+
+def is_constant(operand):
+    return operand.__class__ is Constant and number(operand.value)
+
+def labels_of(code):
+    labels = {}
+    for i, parts in enumerate(code):
+        if parts[0] == 'LABEL' and len(parts) > 1:
+            labels[parts[1]] = i
+    return labels
+
+def operands(parts):
+    '''
+    (posição, papel) de cada operando segundo LAYOUT
+    '''
+    layout = LAYOUT.get(parts[0], '')
+    return [(i, layout[i - 1] if i - 1 < len(layout) else 'l') for i in range(1, len(parts))]
+
+def reads(parts):
+    '''
+    Nomes de variáveis lidos pela instrução (incluindo arrays e índices de x$i)
+    '''
+    names = []
+    for i, role in operands(parts):
+        operand = parts[i]
+        if operand.__class__ is Element:
+            names.append(operand.base)
+            if operand.index.__class__ is Variable:
+                names.append(operand.index.name)
+        elif operand.__class__ is Variable and (role == 's' or parts[0] in COUNTERS or parts[0] in VECTOR):
+            names.append(operand.name)
+    return names
+
+def dynamic(parts):
+    '''
+    READLN e operandos mal formados (x$i$j) produzem nomes que só são lidos na execução
+    '''
+    if parts[0] == 'READLN':
+        return True
+    return any(role != 'l' and parts[i].__class__ is str for i, role in operands(parts))
+
+def written(parts):
+    '''
+    Variáveis escritas pela instrução
+    '''
+    if parts[0] == 'RET' or parts[0] == 'LDRET':
+        return ['ra']
+    return [parts[i].name for i, role in operands(parts) if role == 't' and parts[i].__class__ is Variable]
+
+def next_instruction(code, i, labels_stop=True):
+    '''
+    Índice da próxima instrução a partir de i, pulando linhas em branco (e rótulos, se labels_stop for falso)
+    '''
+    while i < len(code) and (not code[i][0] or (not labels_stop and code[i][0] == 'LABEL')):
+        i += 1
+    return i
+
+def transfer(parts, known, registers):
+    '''
+    Constantes conhecidas depois da instrução (CALL pode escrever qualquer variável)
+    '''
+    if parts[0] == 'CALL':
+        return {}
+    for name in written(parts):
+        known.pop(name, None)
+        if name in registers and parts[0] == 'LD':
+            known[name] = parts[2]
+    return known
+
+def key(operand):
+    # repr separa 0.0 de -0.0
+    return (operand.value.__class__, repr(operand.value))
+
+def meet(env, other):
+    return {name: value for name, value in env.items() if name in other and key(other[name]) == key(value)}
+
+def normalized(entries):
+    return {i: {name: key(value) for name, value in env.items()} for i, env in entries.items()}
+
+class Optimizer:
+    '''
+    Aplica as otimizações até o código parar de mudar. optimize(code) devolve (code, labels).
+    '''
+    def __init__(self, vectorize=True, allocate=True):
+        self.vectorize = vectorize
+        self.allocate = allocate
+
+    def optimize(self, code):
+        code = [list(parts) for parts in code]
+        while True:
+            before = [list(parts) for parts in code]
+            code = self.thread_jumps(code)
+            code = self.remove_unreachable(code)
+            code = self.propagate(code)
+            code = self.eliminate_dead_stores(code)
+            if code == before:
+                break
+        if self.vectorize:
+            code = self.vectorize_loops(code)
+        code = self.fuse(code)
+        if self.allocate:
+            import registers  # registers.py usa as análises deste módulo
+            code = registers.allocate(code)[0]
+        return code, labels_of(code)
+
+    # Desvios
+
+    def thread_jumps(self, code):
+        labels = labels_of(code)
+
+        def final(label):
+            seen = set()
+            while label not in seen and label in labels:
+                seen.add(label)
+                j = next_instruction(code, labels[label], False)
+                if j >= len(code) or code[j][0] != 'J' or not valid(code[j]) or code[j][1] not in labels:
+                    break
+                label = code[j][1]
+            return label
+
+        result = []
+        for i, parts in enumerate(code):
+            if valid(parts) and parts[0] == 'J':
+                target = final(parts[1])
+                if labels.get(target, -1) > i and next_instruction(code, i + 1, False) == next_instruction(code, labels[target], False):
+                    continue  # J para o rótulo seguinte
+                parts = ['J', target]
+            elif valid(parts) and (parts[0] in BRANCHES or parts[0] == 'CALL'):
+                parts = list(parts)
+                position = 1 if parts[0] == 'CALL' else 3
+                parts[position] = final(parts[position])
+            result.append(parts)
+        return result
+
+    def remove_unreachable(self, code):
+        result = []
+        reachable = True
+        for parts in code:
+            if parts[0] == 'LABEL':
+                reachable = True
+            if reachable:
+                result.append(parts)
+            if valid(parts) and parts[0] in ('J', 'RET'):
+                reachable = False
+        return result
+
+    # Constantes
+
+    def constant_registers(self, code):
+        '''
+        Variáveis cujas escritas são todas LD de uma constante do mesmo tipo
+        '''
+        kinds = {}
+        for parts in code:
+            for name in written(parts):
+                kind = None
+                if parts[0] == 'LD' and valid(parts) and is_constant(parts[2]):
+                    kind = parts[2].value.__class__
+                if kinds.get(name, kind) is not kind:
+                    kind = None
+                kinds[name] = kind
+        return {name for name, kind in kinds.items() if kind is not None and name != 'ra'}
+
+    def propagate(self, code):
+        '''
+        Troca leituras de registradores constantes pela constante que eles têm
+        com certeza naquele ponto (entries) e dobra as instruções que ficam só
+        com constantes
+        '''
+        registers = self.constant_registers(code)
+        entries = self.entries(code, registers)
+        known = {}
+        result = []
+        for i, parts in enumerate(code):
+            if parts[0] == 'LABEL':
+                known = dict(entries.get(i) or {})
+                result.append(parts)
+                continue
+            if not valid(parts):
+                known = {}
+                result.append(parts)
+                continue
+            parts = self.fold(self.substitute(parts, known))
+            if parts is None:
+                continue
+            known = transfer(parts, known, registers)
+            result.append(parts)
+        return result
+
+    def entries(self, code, registers):
+        '''
+        Constantes conhecidas na entrada de cada LABEL: interseção do que chega
+        pela instrução anterior e por todos os desvios para o rótulo. Destinos
+        de CALL, main e o primeiro LABEL começam sem constantes (chamadas e a
+        passagem da fase 1 para main); rótulos ainda não alcançados ficam fora
+        do dicionário até alguma iteração chegar neles.
+        '''
+        labels = labels_of(code)
+        forced = {labels[parts[1]] for parts in code if parts[0] == 'CALL' and valid(parts) and parts[1] in labels}
+        if 'main' in labels:
+            forced.add(labels['main'])
+        first = next((i for i, parts in enumerate(code) if parts[0] == 'LABEL'), None)
+        if first is not None:
+            forced.add(first)
+        entries = {i: {} for i in forced}
+        while True:
+            incoming = {}
+
+            def send(label, env):
+                i = labels.get(label) if label is not None else None
+                if i is not None:
+                    incoming[i] = dict(env) if i not in incoming else meet(incoming[i], env)
+
+            known = {}
+            for i, parts in enumerate(code):
+                op = parts[0]
+                if op == 'LABEL':
+                    if known is not None:
+                        incoming[i] = dict(known) if i not in incoming else meet(incoming[i], known)
+                    known = entries.get(i)
+                    if known is not None:
+                        known = dict(known)
+                    continue
+                if known is None:
+                    continue
+                if not valid(parts):
+                    known = {}
+                    continue
+                if op == 'J':
+                    send(parts[1], known)
+                    known = None
+                    continue
+                if op in BRANCHES:
+                    send(parts[3], known)
+                known = transfer(parts, known, registers)
+                if op in VECTOR:
+                    send(parts[-1], known)
+                if op == 'RET':
+                    known = None
+            for i in forced:
+                incoming[i] = {}
+            if normalized(incoming) == normalized(entries):
+                return entries
+            entries = incoming
+
+    def substitute(self, parts, known):
+        if not known:
+            return parts
+        result = [parts[0]]
+        for i, role in operands(parts):
+            operand = parts[i]
+            if operand.__class__ is Variable and role == 's' and operand.name in known:
+                operand = known[operand.name]
+            elif operand.__class__ is Element and operand.index.__class__ is Variable and operand.index.name in known:
+                index = known[operand.index.name]
+                operand = Element(operand.base, index, f"{operand.base}${index.text}")
+            result.append(operand)
+        return result
+
+    def fold(self, parts):
+        op = parts[0]
+        if op in ARITHMETIC or op == 'DIV':
+            _, a, b, c = parts
+            if is_constant(b) and is_constant(c):
+                try:
+                    if op == 'DIV':
+                        value = b.value / c.value if c.value != 0 else 0
+                    else:
+                        value = ARITHMETIC[op](b.value, c.value)
+                except OverflowError:
+                    return parts
+                if number(value) and constant(value) is not None:
+                    return ['LD', a, constant(value)]
+        elif op in BRANCHES:
+            _, a, b, label = parts
+            if is_constant(a) and is_constant(b):
+                return ['J', label] if BRANCHES[op](a.value, b.value) else None
+        return parts
+
+    def eliminate_dead_stores(self, code):
+        if any(dynamic(parts) for parts in code):
+            return code
+        used = set()
+        for parts in code:
+            used.update(reads(parts))
+        return [
+            parts for parts in code
+            if not (parts[0] == 'LD' and valid(parts) and parts[1].__class__ is Variable
+                    and parts[1].name not in used and is_constant(parts[2]))
+        ]
+
+    # Laços sobre arrays
+
+    def vectorize_loops(self, code):
+        labels = labels_of(code)
+        names = set(labels)
+
+        def fresh(name):
+            suffix = 1
+            while f"{name}{suffix}" in names:
+                suffix += 1
+            names.add(f"{name}{suffix}")
+            return f"{name}{suffix}"
+
+        result = []
+        k = 0
+        while k < len(code):
+            loop = self.counted_loop(code, k, labels, result)
+            if loop is None:
+                result.append(code[k])
+                k += 1
+                continue
+            vector, body, increment, branch, end = loop
+            label = code[k][1]
+            again, exit = fresh(f"{label}.laco"), fresh(f"{label}.fim")
+            result += [
+                code[k], vector + [branch[0], exit], ['LABEL', again],
+                body, increment, [branch[0], branch[1], branch[2], again], ['LABEL', exit],
+            ]
+            k = end + 1
+        return result
+
+    def counted_loop(self, code, k, labels, before):
+        '''
+        Laço LABEL L / corpo / ADD i i 1 / BLT|BLE i n L a partir de k:
+        (instrução em bloco sem os dois últimos operandos, corpo, incremento,
+        desvio, índice do desvio) ou None
+        '''
+        parts = code[k]
+        if parts[0] != 'LABEL' or len(parts) != 2 or labels.get(parts[1]) != k:
+            return None
+        previous = next((p for p in reversed(before) if p[0]), None)
+        if previous is not None and previous[0] in VECTOR:
+            return None  # laço original de uma instrução em bloco
+        found = []
+        j = k
+        for _ in range(3):
+            j = next_instruction(code, j + 1)
+            if j >= len(code) or not valid(code[j]):
+                return None
+            found.append(j)
+        body, increment, branch = (code[j] for j in found)
+        if increment[0] != 'ADD' or branch[0] not in ('BLT', 'BLE') or branch[3] != parts[1]:
+            return None
+        counter = increment[1]
+        if counter.__class__ is not Variable or not all(
+                operand.__class__ is Variable and operand.name == counter.name for operand in (increment[2], branch[1])):
+            return None
+        step, limit = increment[3], branch[2]
+        if step.__class__ is not Constant or step.value.__class__ is not int or step.value != 1:
+            return None
+        if not is_scalar(limit) or limit.__class__ is Variable and limit.name == counter.name \
+                or limit.__class__ is Constant and limit.value.__class__ is not int:
+            return None
+        vector = self.vector(body, counter.name)
+        if vector is None or limit.__class__ is Variable and limit.name in {o.name for o in vector[1:] if o.__class__ is Variable}:
+            return None
+        return vector + [counter, limit], body, increment, branch, found[2]
+
+    def vector(self, body, counter):
+        '''
+        Instrução em bloco equivalente ao corpo (sem contador e limite) ou None
+        '''
+        def indexed(operand):
+            return operand.__class__ is Element and operand.index.__class__ is Variable \
+                and operand.index.name == counter and operand.base != counter
+
+        op = body[0]
+        if op == 'LD' and indexed(body[1]):
+            array, source = body[1], body[2]
+            if indexed(source):
+                return ['VCOPY', Variable(array.base), Variable(source.base)]
+            if is_constant(source) or source.__class__ is Variable and source.name not in (counter, array.base):
+                return ['VFILL', Variable(array.base), source]
+        if op in ('ADD', 'MULT') and all(indexed(operand) for operand in body[1:]):
+            return ['VADD' if op == 'ADD' else 'VMUL'] + [Variable(operand.base) for operand in body[1:]]
+        if op == 'ADD' and body[1].__class__ is Variable and body[2].__class__ is Variable \
+                and body[1].name == body[2].name and indexed(body[3]) and body[1].name not in (counter, body[3].base):
+            return ['VSUM', body[1], Variable(body[3].base)]
+        return None
+
+    # Superinstruções
+
+    def fuse(self, code):
+        result = []
+        i = 0
+        while i < len(code):
+            parts = code[i]
+            j = next_instruction(code, i + 1)
+            second = code[j] if j < len(code) else None
+            if valid(parts) and second is not None and valid(second):
+                pair = self.fuse_pair(parts, second)
+                if pair is not None:
+                    result.append(pair)
+                    result.extend(code[i + 1:j])
+                    i = j + 1
+                    continue
+            result.append(self.fuse_single(parts) if valid(parts) else parts)
+            i += 1
+        return result
+
+    def fuse_pair(self, first, second):
+        op = first[0]
+        if op == 'LD' and first[1].__class__ is Variable and first[1].name == 'ra' and is_scalar(first[2]) \
+                and second[0] == 'RET' and second[1].__class__ is Variable and second[1].name == 'ra':
+            return ['LDRET', first[2]]
+        if op == 'ADD' and first[1].__class__ is Variable and first[2].__class__ is Variable \
+                and first[1].name == first[2].name and is_constant(first[3]) \
+                and second[0] in BRANCHES and second[1].__class__ is Variable \
+                and second[1].name == first[1].name and is_scalar(second[2]):
+            return ['ADD' + second[0], first[1], first[3], second[2], second[3]]
+        return None
+
+    def fuse_single(self, parts):
+        op = parts[0]
+        if op in ('ADD', 'SUB') and parts[1].__class__ is Variable and is_scalar(parts[2]) and is_constant(parts[3]):
+            return [op + 'I'] + parts[1:]
+        if op in BRANCHES and parts[1].__class__ is Variable and is_constant(parts[2]):
+            return [op + 'I'] + parts[1:]
+        return parts
+
+def is_scalar(operand):
+    return operand.__class__ is Constant or operand.__class__ is Variable
+
+def dump(code):
+    '''
+    Texto do programa, no formato lido por read_code
+    '''
+    lines = []
+    for parts in code:
+        lines.append(' '.join(shlex.quote(str(part)) for part in parts) if parts[0] else '')
+    return '\n'.join(lines)
@@ -0,0 +1,160 @@
+'''
+Perfil de execução do bytecode: quantas vezes cada instrução foi executada e
+quanto tempo de relógio ficou nela, agregado por opcode, por instrução (linha
+do código de três endereços) e por função.
+
+O laço de execute não é alterado: o perfil troca program.code por uma
+ProfiledCode, que registra contagem e tempo a cada busca de instrução
+(code[pc]). Sem --profile o laço continua lendo uma lista comum, então
+o modo desligado não custa nada.
+
+O tempo de uma instrução é o intervalo entre a sua busca e a busca da
+próxima, descontado o tempo gasto no próprio registro. Funções são os
+rótulos de destino de CALL e main; cada instrução pertence à última função
+que começa antes dela no código (as anteriores ao primeiro LABEL ficam em
+"<inicialização>"). O tempo por função é o tempo próprio, sem as chamadas.
+'''
+import json
+import time
+
+from bytecode import compile_code, execute, NAMES, CALL, ENTER
+from optimizer import dump
+
+STARTUP = '<inicialização>'
+
+class ProfiledCode(list):
+    '''
+    Lista de instruções que mede cada busca feita pelo laço de execute
+    '''
+    def __init__(self, code):
+        super().__init__(code)
+        self.counts = [0] * len(code)
+        self.times = [0.0] * len(code)
+        self.last = None
+        self.start = 0.0
+
+    def __getitem__(self, pc):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.times[self.last] += now - self.start
+        self.counts[pc] += 1
+        self.last = pc
+        self.start = time.perf_counter()
+        return list.__getitem__(self, pc)
+
+    def finish(self):
+        if self.last is not None:
+            self.times[self.last] += time.perf_counter() - self.start
+            self.last = None
+
+class Profiler:
+    '''
+    Executa CODE/LABELS (formato de read_code) com perfil; report() e to_json() mostram o resultado
+    '''
+    def __init__(self, code, labels):
+        self.source = code
+        self.labels = labels
+        self.program = compile_code(code, labels)
+        self.code = None
+        self.elapsed = 0.0
+
+    def run(self):
+        self.code = ProfiledCode(self.program.code)
+        self.program.code = self.code
+        start = time.perf_counter()
+        try:
+            execute(self.program)
+        finally:
+            self.code.finish()
+            self.elapsed = time.perf_counter() - start
+            self.program.code = list(self.code)
+
+    def functions(self):
+        '''
+        Nome da função de cada instrução (pela linha de código)
+        '''
+        called = self.called()
+        starts = {line: label for label, line in self.labels.items() if label in called}
+        owner = []
+        current = STARTUP
+        for line in range(len(self.source)):
+            current = starts.get(line, current)
+            owner.append(current)
+        return [owner[line] if line is not None else STARTUP for line in self.program.lines]
+
+    def called(self):
+        called = {'main'}
+        for parts in self.source:
+            if parts[0] == 'CALL' and len(parts) > 1:
+                called.add(parts[1])
+        return called
+
+    def opcodes(self):
+        result = {}
+        for pc, (op, *_) in enumerate(self.program.code):
+            count, elapsed = self.code.counts[pc], self.code.times[pc]
+            if count:
+                entry = result.setdefault(NAMES.get(op, str(op)), {'count': 0, 'time': 0.0})
+                entry['count'] += count
+                entry['time'] += elapsed
+        return sorted(({'opcode': name, **entry} for name, entry in result.items()), key=lambda entry: -entry['time'])
+
+    def instructions(self):
+        result = []
+        for pc, line in enumerate(self.program.lines):
+            count = self.code.counts[pc]
+            if count:
+                op = self.program.code[pc][0]
+                text = dump([self.source[line]]) if line is not None else NAMES[op]
+                result.append({'pc': pc, 'line': line + 1 if line is not None else None,
+                               'instruction': text, 'count': count, 'time': self.code.times[pc]})
+        return sorted(result, key=lambda entry: -entry['time'])
+
+    def per_function(self):
+        result = {}
+        for pc, name in enumerate(self.functions()):
+            entry = result.setdefault(name, {'calls': 0, 'count': 0, 'time': 0.0})
+            entry['count'] += self.code.counts[pc]
+            entry['time'] += self.code.times[pc]
+            op = self.program.code[pc][0]
+            if op == CALL or op == ENTER:
+                # chamada: conta para a função de destino
+                label = self.source[self.program.lines[pc]][1] if op == CALL else 'main'
+                callee = result.setdefault(label, {'calls': 0, 'count': 0, 'time': 0.0})
+                callee['calls'] += self.code.counts[pc]
+        return sorted(({'function': name, **entry} for name, entry in result.items() if entry['count'] or entry['calls']),
+                      key=lambda entry: -entry['time'])
+
+    def to_json(self):
+        return {
+            'instructions': sum(self.code.counts),
+            'time': self.elapsed,
+            'opcodes': self.opcodes(),
+            'functions': self.per_function(),
+            'lines': self.instructions(),
+        }
+
+    def report(self, limit=20):
+        '''
+        Relatório em texto, ordenado por tempo
+        '''
+        total = sum(self.code.counts)
+        measured = sum(self.code.times) or 1.0
+        lines = [f"Perfil: {total} instruções executadas em {self.elapsed:.4f}s", "", "Por opcode:"]
+        lines.append(f"  {'opcode':<10} {'execuções':>12} {'tempo (s)':>10} {'%':>6}")
+        for entry in self.opcodes():
+            lines.append(f"  {entry['opcode']:<10} {entry['count']:>12} {entry['time']:>10.4f} {entry['time'] / measured:>6.1%}")
+        lines += ["", "Por função (tempo próprio):"]
+        lines.append(f"  {'função':<20} {'chamadas':>9} {'execuções':>12} {'tempo (s)':>10} {'%':>6}")
+        for entry in self.per_function():
+            lines.append(f"  {entry['function']:<20} {entry['calls']:>9} {entry['count']:>12} {entry['time']:>10.4f} {entry['time'] / measured:>6.1%}")
+        lines += ["", f"Instruções mais custosas (até {limit}):"]
+        lines.append(f"  {'linha':>6} {'execuções':>12} {'tempo (s)':>10} {'%':>6}  instrução")
+        for entry in self.instructions()[:limit]:
+            line = entry['line'] if entry['line'] is not None else '-'
+            lines.append(f"  {line:>6} {entry['count']:>12} {entry['time']:>10.4f} {entry['time'] / measured:>6.1%}  {entry['instruction']}")
+        return '\n'.join(lines)
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_json(), file, ensure_ascii=False, indent=2)
@@ -0,0 +1,375 @@
+'''
+Alocação de registradores do código de três endereços: os temporários
+(t1, .t1 do gerador, ...) cujos valores já morreram são reaproveitados, então o programa
+usa menos variáveis distintas (menos posições no vetor de registradores do
+bytecode e menos entradas em GLOBALS no interpretador original).
+
+A análise de vivacidade é feita sobre o programa inteiro, porque toda
+variável escrita é global e uma função pode ler o que outra escreveu: CALL
+segue para o rótulo da função e RET volta para todas as instruções depois de
+um CALL. Os intervalos de vida (da primeira à última instrução em que a
+variável está viva) são distribuídos por varredura linear: cada intervalo
+ocupa um registrador livre do mesmo tipo ou abre um novo, que recebe o nome
+da primeira variável que o ocupa.
+
+Só são renomeadas variáveis que podem trocar de nome sem mudar o resultado:
+    - escritas no programa e nunca lidas antes de serem escritas (uma
+      variável lida sem valor devolve o próprio nome);
+    - com um tipo conhecido na compilação, igual em todas as escritas: cada
+      escrita é convertida para o tipo do valor anterior (cast_value), então
+      dois valores só dividem um registrador se tiverem o mesmo tipo;
+    - que não são arrays, ra nem argumentos aN (que valem o que PARAM passou,
+      ou None se a chamada passou menos argumentos).
+Programas com READLN, operandos mal formados ou desvios na fase 1 ficam como estão.
+
+Uso:
+    python registers.py arquivo [--no-optimize]
+'''
+import sys
+
+from frame import argument_index
+from operand import Constant, Variable, Element
+from optimizer import BRANCHES, COUNTERS, VECTOR, Optimizer, dynamic, labels_of, reads, valid, written
+
+UNKNOWN = 'unknown'
+NUMBER = 'number'       # int ou float, conforme a execução
+NUMERIC = ('int', 'float', NUMBER)
+ARITHMETIC = {'ADD', 'SUB', 'MULT', 'ADDI', 'SUBI'} | COUNTERS
+JUMPS = set(BRANCHES) | {name + 'I' for name in BRANCHES} | COUNTERS
+
+def successors(code, labels):
+    '''
+    Sucessores de cada instrução no grafo do programa inteiro (None se o programa não puder ser analisado)
+    '''
+    if 'main' not in labels:
+        return None
+    first = next((i for i, parts in enumerate(code) if parts[0] == 'LABEL'), len(code))
+    returns = [i + 1 for i, parts in enumerate(code) if parts[0] == 'CALL' and i + 1 < len(code)]
+    result = []
+    for i, parts in enumerate(code):
+        op = parts[0]
+        if op and not valid(parts):
+            return None
+        following = [i + 1] if i + 1 < len(code) else []
+        if i < first:
+            if op == 'J' or op in JUMPS or op in VECTOR or op in ('CALL', 'RET', 'LDRET'):
+                return None
+            following = [labels['main']] if i + 1 == first else following
+        elif op == 'J' or op in JUMPS or op in VECTOR or op == 'CALL':
+            target = parts[1] if op in ('J', 'CALL') else parts[-1]
+            if target not in labels:
+                return None
+            following = [labels[target]] if op in ('J', 'CALL') else following + [labels[target]]
+        elif op in ('RET', 'LDRET'):
+            following = returns
+        result.append(following)
+    return result
+
+def liveness(code, following, names):
+    '''
+    Conjuntos de variáveis vivas na entrada e na saída de cada instrução, como
+    inteiros com um bit por variável de names
+    '''
+    bits = {name: 1 << i for i, name in enumerate(names)}
+    uses = []
+    defs = []
+    for parts in code:
+        use = 0
+        for name in reads(parts):
+            use |= bits.get(name, 0)
+        define = 0
+        for name in written(parts):
+            define |= bits.get(name, 0)
+        uses.append(use)
+        defs.append(define)
+    predecessors = [[] for _ in code]
+    for i, targets in enumerate(following):
+        for j in targets:
+            predecessors[j].append(i)
+    live_in = [0] * len(code)
+    live_out = [0] * len(code)
+    pending = list(range(len(code)))
+    queued = [True] * len(code)
+    while pending:
+        i = pending.pop()
+        queued[i] = False
+        out = 0
+        for j in following[i]:
+            out |= live_in[j]
+        live_out[i] = out
+        entry = uses[i] | (out & ~defs[i])
+        if entry != live_in[i]:
+            live_in[i] = entry
+            for j in predecessors[i]:
+                if not queued[j]:
+                    queued[j] = True
+                    pending.append(j)
+    return live_in, live_out, defs
+
+def arguments(code, labels, following, first):
+    '''
+    Argumentos aN que toda leitura encontra no frame: lidos só no corpo de
+    funções (do rótulo de um CALL até o próximo rótulo de função) cujas
+    chamadas passam todas mais de N parâmetros, sem desvios de um corpo para
+    outro e sem escritas em aN. Os demais podem valer None (argumento que falta)
+    '''
+    counts = {}
+    for parts in code:
+        if parts[0] == 'CALL':
+            if parts[2].__class__ is not Constant or parts[2].value.__class__ is not int:
+                return set()
+            counts.setdefault(parts[1], []).append(parts[2].value)
+    starts = {labels[name] for name in counts} | {labels['main']}
+    owner = [None] * len(code)
+    for i in range(first, len(code)):
+        owner[i] = code[i][1] if i in starts else owner[i - 1]
+    for i in range(first, len(code)):
+        if code[i][0] not in ('CALL', 'RET', 'LDRET') and any(owner[j] != owner[i] for j in following[i]):
+            return set()
+    safe = set()
+    unsafe = set()
+    for i, parts in enumerate(code):
+        for name in reads(parts):
+            index = argument_index(name)
+            if index >= 0:
+                passed = owner[i] in counts and owner[i] != 'main' and min(counts[owner[i]]) > index
+                (safe if passed else unsafe).add(name)
+        unsafe.update(name for name in written(parts) if argument_index(name) >= 0)
+    return safe - unsafe
+
+def join(old, new):
+    if old is None or old == new:
+        return new
+    if new is None:
+        return old
+    return NUMBER if old in NUMERIC and new in NUMERIC else UNKNOWN
+
+def infer_types(code, names, first, unset, passed=()):
+    '''
+    Tipo (int, float, str) de cada variável escrita, quando todas as escritas
+    produzem o mesmo tipo; NUMBER quando é número mas int ou float depende da
+    execução, UNKNOWN quando nem isso se sabe. A fase 1 (antes do índice first)
+    sempre executa primeiro, então uma variável cuja primeira escrita nela é
+    LD de constante fica com o tipo da constante enquanto as escritas seguintes
+    puderem ser convertidas para ele: cast_value mantém o valor sem conversão
+    quando ela falha (int('b')), então uma variável int ou float com alguma
+    escrita que pode não ser numérica fica UNKNOWN (str converte qualquer
+    valor). Variáveis de unset podem ser lidas antes de escritas (valem o
+    próprio nome, ou None para ra); os argumentos de passed valem um dos
+    valores passados por PARAM.
+    '''
+    types = dict.fromkeys(names)
+    fixed = set()
+    for parts in code[:first]:
+        for name in written(parts):
+            if name not in fixed and parts[0] == 'LD' and parts[2].__class__ is Constant:
+                types[name] = parts[2].value.__class__.__name__
+            fixed.add(name)
+    fixed = {name for name in fixed if types[name] is not None}
+
+    argument = None     # join dos valores passados por PARAM, se todos forem números
+    parameters = [parts[1] for parts in code if parts[0] == 'PARAM']
+
+    def kind(operand):
+        if operand.__class__ is Constant:
+            return operand.value.__class__.__name__
+        if operand.__class__ is Variable:
+            if argument_index(operand.name) >= 0:
+                return argument if operand.name in passed else UNKNOWN
+            if operand.name in unset:
+                return UNKNOWN
+            return types[operand.name] if operand.name in types else 'str'
+        return UNKNOWN
+
+    def produced(parts):
+        op = parts[0]
+        if op == 'LD':
+            return kind(parts[2])
+        if op in ('RET', 'LDRET'):
+            return kind(parts[1])
+        if op in ARITHMETIC or op == 'DIV':
+            left, right = kind(parts[2] if op not in COUNTERS else parts[1]), kind(parts[3] if op not in COUNTERS else parts[2])
+            if left is None or right is None:
+                return None
+            if left in NUMERIC and right in NUMERIC:
+                if op == 'DIV':
+                    return NUMBER   # divisão por zero devolve int 0
+                return 'float' if 'float' in (left, right) else 'int' if left == right else NUMBER
+            # quando não falha, x - y, x / y e x + número são números; str * int é str
+            if op in ('SUB', 'SUBI', 'DIV') or op != 'MULT' and (left in NUMERIC or right in NUMERIC) \
+                    or op == 'MULT' and 'float' in (left, right):
+                return NUMBER
+        return UNKNOWN
+
+    changed = True
+    while changed:
+        changed = False
+        current = None
+        for operand in parameters:
+            current = join(current, kind(operand))
+        current = current if current is None or current in NUMERIC else UNKNOWN
+        if current != argument:
+            argument = current
+            changed = True
+        for parts in code:
+            targets = written(parts)
+            if not targets:
+                continue
+            value = produced(parts)
+            for name in targets:
+                if name in fixed:
+                    # None: ainda sem tipo, revisto na próxima volta
+                    if types[name] != 'str' and value is not None and value not in NUMERIC:
+                        fixed.discard(name)
+                        types[name] = UNKNOWN
+                        changed = True
+                    continue
+                old = types[name]
+                new = join(old, value)
+                if new != old:
+                    types[name] = new
+                    changed = True
+    return types
+
+def candidates(code, types, live_entry, names):
+    '''
+    Variáveis que podem ser renomeadas
+    '''
+    excluded = {'ra'}
+    for parts in code:
+        if parts[0] == 'ALLOC':
+            excluded.update(written(parts))
+        for operand in parts[1:]:
+            if operand.__class__ is Element:
+                excluded.add(operand.base)
+        if parts[0] in VECTOR:
+            excluded.update(operand.name for operand in parts[1:] if operand.__class__ is Variable)
+    return [name for i, name in enumerate(names)
+            if name not in excluded and argument_index(name) < 0 and types[name] not in (None, UNKNOWN, NUMBER)
+            and not live_entry >> i & 1]
+
+def bits_of(value, names):
+    while value:
+        low = value & -value
+        value ^= low
+        yield names[low.bit_length() - 1]
+
+def intervals(live_in, live_out, defs, names, mask):
+    '''
+    (início, fim) de cada variável com bit em mask, da primeira à última
+    instrução em que ela está viva, e as escritas mortas (valor nunca lido,
+    como as declarações da fase 1), que ficam fora do intervalo
+    '''
+    starts = {}
+    ends = {}
+    dead = {}
+    for i in range(len(live_in)):
+        for name in bits_of((live_in[i] | live_out[i]) & mask, names):
+            starts.setdefault(name, i)
+            ends[name] = i
+        for name in bits_of(defs[i] & ~live_out[i] & mask, names):
+            dead.setdefault(name, []).append(i)
+    return {name: (start, ends[name]) for name, start in starts.items()}, dead
+
+def allocate(code):
+    '''
+    (código com os temporários renomeados, {nome antigo: registrador})
+    '''
+    if any(dynamic(parts) for parts in code):
+        return code, {}
+    labels = labels_of(code)
+    following = successors(code, labels)
+    if following is None or not code:
+        return code, {}
+    names = sorted({name for parts in code for name in written(parts)})
+    live_in, live_out, defs = liveness(code, following, names)
+    # sem fase 1 a execução começa em main
+    first = next(i for i, parts in enumerate(code) if parts[0] == 'LABEL')
+    entry = labels['main'] if first == 0 else 0
+    unset = {name for i, name in enumerate(names) if live_in[entry] >> i & 1}
+    types = infer_types(code, names, first, unset, arguments(code, labels, following, first))
+    renamable = candidates(code, types, live_in[entry], names)
+    bits = {name: 1 << i for i, name in enumerate(names)}
+    spans, dead = intervals(live_in, live_out, defs, names, sum(bits[name] for name in renamable))
+
+    def handover(owner, name, point):
+        # owner é lido pela última vez em point, e a instrução só escreve name
+        return not (live_out[point] | defs[point]) & bits[owner] and not live_in[point] & bits[name]
+
+    def clobbers(name, other):
+        # uma escrita morta de name enquanto other está vivo
+        return any(live_out[point] & bits[other] for point in dead.get(name, ()))
+
+    def compatible(name, register):
+        return not any(clobbers(name, other) or clobbers(other, name) for other in occupants[register])
+
+    mapping = {}
+    active = []     # (fim, nome, registrador)
+    free = {}       # tipo -> registradores livres
+    occupants = {}  # registrador -> nomes
+    for name in sorted(spans, key=lambda name: (spans[name][0], spans[name][1], name)):
+        start, end = spans[name]
+        still = []
+        for occupant in active:
+            finish, owner, register = occupant
+            if finish < start or finish == start and handover(owner, name, start):
+                free.setdefault(types[owner], []).append(register)
+            else:
+                still.append(occupant)
+        active = still
+        pool = free.setdefault(types[name], [])
+        register = next((register for register in pool if compatible(name, register)), None)
+        if register is None:
+            register = name
+            occupants[register] = []
+        else:
+            pool.remove(register)
+        occupants[register].append(name)
+        mapping[name] = register
+        active.append((end, name, register))
+    renamed = {old: new for old, new in mapping.items() if old != new}
+    if not renamed:
+        return code, mapping
+    return [rename(parts, renamed) for parts in code], mapping
+
+def rename(parts, renamed):
+    result = [parts[0]]
+    for operand in parts[1:]:
+        if operand.__class__ is Variable and operand.name in renamed:
+            operand = Variable(renamed[operand.name])
+        elif operand.__class__ is Element and operand.index.__class__ is Variable and operand.index.name in renamed:
+            index = renamed[operand.index.name]
+            operand = Element(operand.base, Variable(index), f"{operand.base}${index}")
+        result.append(operand)
+    return result
+
+def report(code, mapping):
+    '''
+    Registradores antes e depois da alocação (code é o programa antes de allocate)
+    '''
+    variables = {name for parts in code for name in written(parts) + reads(parts)}
+    registers = set(mapping.values())
+    lines = [
+        f"Temporários renomeáveis: {len(mapping)} -> {len(registers)} registradores",
+        f"Variáveis distintas:     {len(variables)} -> {len(variables) - len(mapping) + len(registers)}",
+    ]
+    for register in sorted(registers):
+        shared = sorted(name for name, target in mapping.items() if target == register)
+        if len(shared) > 1:
+            lines.append(f"  {register}: {', '.join(shared)}")
+    return '\n'.join(lines)
+
+def main():
+    import interpreter
+    flags = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not args:
+        print(__doc__.split('Uso:')[1].strip())
+        return
+    code, _ = interpreter.read_code(args[0])
+    if '--no-optimize' not in flags:
+        code, _ = Optimizer(allocate=False).optimize(code)
+    print(report(code, allocate(code)[1]))
+
+if __name__ == "__main__":
+    main()
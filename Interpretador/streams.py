@@ -0,0 +1,76 @@
+'''
+Entrada e saída do bytecode.
+
+PRINT não chama print() a cada instrução: Output junta as linhas impressas e
+as escreve de uma vez no stream quando passam de LIMIT, antes de cada READLN
+(para que o que já foi impresso apareça antes do pedido de entrada) e no fim
+da execução, inclusive quando ela termina com erro.
+
+READLN lê por um Input. Quando a entrada é um arquivo ou pipe, o Input lê
+todo o conteúdo na primeira leitura e já o separa em linhas; cada READLN só
+avança um índice. Em um terminal, cada READLN lê uma linha, como input(). O
+Input de cada stream é guardado enquanto o stream existir, então execuções
+seguidas no mesmo processo continuam a leitura de onde a anterior parou.
+'''
+import weakref
+
+LIMIT = 4096  # linhas guardadas antes de escrever no stream
+
+class Output:
+    '''
+    Saída de PRINT: lines guarda as linhas ainda não escritas no stream
+    '''
+    __slots__ = ('stream', 'lines')
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lines = []
+
+    def flush(self):
+        if self.lines:
+            self.stream.write('\n'.join(self.lines) + '\n')
+            self.lines.clear()
+
+class Input:
+    '''
+    Entrada de READLN: read_line() devolve a próxima linha sem o fim de
+    linha ou lança EOFError, como input()
+    '''
+    __slots__ = ('stream', 'interactive', 'lines', 'position', '__weakref__')
+
+    def __init__(self, stream):
+        self.stream = stream
+        isatty = getattr(stream, 'isatty', None)
+        self.interactive = not hasattr(stream, 'read') or isatty is not None and isatty()
+        self.lines = None
+        self.position = 0
+
+    def read_line(self):
+        if self.interactive:
+            line = self.stream.readline()
+            if not line:
+                raise EOFError('EOF when reading a line')
+            return line[:-1] if line[-1] == '\n' else line
+        if self.lines is None:
+            self.lines = self.stream.read().split('\n')
+            if self.lines[-1] == '':
+                self.lines.pop()
+        if self.position >= len(self.lines):
+            raise EOFError('EOF when reading a line')
+        self.position += 1
+        return self.lines[self.position - 1]
+
+INPUTS = weakref.WeakKeyDictionary()
+
+def input_for(stream):
+    '''
+    Input do stream, o mesmo em todas as execuções
+    '''
+    try:
+        reader = INPUTS.get(stream)
+    except TypeError:
+        # stream sem referência fraca: um Input por execução
+        return Input(stream)
+    if reader is None:
+        reader = INPUTS[stream] = Input(stream)
+    return reader
@@ -0,0 +1,132 @@
+'''
+Formato binário do código de três endereços já lido (.tacc).
+
+read_code separa cada linha em tokens e classifica os operandos (operand.py).
+save grava o resultado em um arquivo .tacc e load o recupera sem nenhuma
+análise de texto: o arquivo é mapeado em memória (mmap) e, depois do
+cabeçalho, contém um objeto marshal com
+
+    operands: operandos distintos do programa, cada um uma tupla
+        ('c', valor, texto) para Constant, ('v', nome) para Variable,
+        ('e', base, índice do operando do índice, texto) para Element e
+        ('s', texto) para rótulos e operandos mal formados;
+    code: uma tupla por linha, (instrução, índices dos operandos...);
+    labels: rótulo -> linha, como em read_code.
+
+load cria cada operando distinto uma única vez e as instruções compartilham
+esses objetos. O formato de marshal muda entre versões do Python, então o
+cabeçalho guarda a versão usada e load recusa arquivos de outra versão.
+
+Uso:
+    python Interpretador/tacc.py programa.txt [programa.tacc]
+'''
+import contextlib
+import gc
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+from operand import Constant, Variable, Element
+
+MAGIC = b'TACC'
+VERSION = 1
+# identificação, versão do formato, versão do Python (maior, menor)
+HEADER = struct.Struct('<4sHBB')
+
+@contextlib.contextmanager
+def no_collection():
+    '''
+    Desliga o coletor de ciclos durante a carga de um programa: as listas
+    criadas não formam ciclos, e cada coleta percorreria o programa inteiro
+    '''
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def save(path, code, labels):
+    '''
+    Grava CODE/LABELS (formato de read_code, com operandos classificados) em path
+    '''
+    records = []
+    positions = {}
+
+    def position(operand):
+        cls = operand.__class__
+        if cls is Constant:
+            key = ('c', operand.value.__class__.__name__, operand.text)
+            record = ('c', operand.value, operand.text)
+        elif cls is Variable:
+            key = record = ('v', operand.name)
+        elif cls is Element:
+            record = ('e', operand.base, position(operand.index), operand.text)
+            key = record
+        else:
+            key = record = ('s', str(operand))
+        found = positions.get(key)
+        if found is None:
+            found = positions[key] = len(records)
+            records.append(record)
+        return found
+
+    lines = tuple((parts[0], *(position(operand) for operand in parts[1:])) for parts in code)
+    data = marshal.dumps((tuple(records), lines, dict(labels)))
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, *sys.version_info[:2]))
+        file.write(data)
+
+def load(path, classified=True):
+    '''
+    (code, labels) de um arquivo .tacc; sem classified, operandos em texto
+    '''
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path}: não é um arquivo .tacc")
+        magic, version, major, minor = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: não é um arquivo .tacc (versão {VERSION})")
+        if (major, minor) != sys.version_info[:2]:
+            raise ValueError(f"{path}: gerado pelo Python {major}.{minor}; gere o arquivo de novo com tacc.py")
+        body = memoryview(data)[HEADER.size:]
+        try:
+            with no_collection():
+                records, lines, labels = marshal.loads(body)
+        finally:
+            body.release()
+
+    with no_collection():
+        return build(records, lines, labels, classified)
+
+def build(records, lines, labels, classified):
+    operands = []
+    for record in records:
+        kind = record[0]
+        if kind == 'v':
+            operands.append(Variable(record[1]))
+        elif kind == 'c':
+            operands.append(Constant(record[1], record[2]))
+        elif kind == 'e':
+            operands.append(Element(record[1], operands[record[2]], record[3]))
+        else:
+            operands.append(record[1])
+    if not classified:
+        operands = [repr(operand) if operand.__class__ is not str else operand for operand in operands]
+    get = operands.__getitem__
+    return [[name, *map(get, rest)] for name, *rest in lines], labels
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        return
+    from interpreter import read_code
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + '.tacc'
+    save(target, *read_code(source))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+'''
+Máquina virtual do Interpretador: o estado de uma execução (código lido,
+rótulos e programa compilado) fica em um objeto VM, e não nas variáveis
+globais de interpreter.py, então o mesmo processo pode executar vários
+programas, um depois do outro.
+
+O bytecode (execute) já guarda registradores, pilha e parâmetros em variáveis
+locais, e cada run() começa do zero. Com legacy, os handlers originais
+continuam usando as globais de interpreter.py (CODE, LABELS, GLOBALS, STACK,
+PARAMETERS), e a VM as recoloca no estado inicial antes de cada execução e
+em reset().
+
+READLN e PRINT usam a entrada e a saída dadas à VM (stdin e stdout,
+quaisquer objetos com readline() e write()), ou as do processo.
+
+Programas carregados de arquivo ficam em cache pelo caminho: enquanto o
+arquivo não muda (mesmo mtime e tamanho), load() reaproveita o código lido e
+o programa compilado, sem ler, otimizar e compilar de novo.
+'''
+import contextlib
+import os
+import sys
+from collections import OrderedDict
+
+import interpreter
+from bytecode import compile_code, execute
+from operand import classify
+from optimizer import Optimizer, labels_of
+
+class VM:
+    '''
+    Executa programas de três endereços: load() lê, otimiza e compila; run() executa
+    '''
+    def __init__(self, optimize=True, vectorize=True, legacy=False, stdin=None, stdout=None, cache_size=256):
+        self.optimize = optimize
+        self.vectorize = vectorize
+        self.legacy = legacy
+        self.stdin = stdin
+        self.stdout = stdout
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # caminho -> ((mtime, tamanho), (code, labels, program))
+        self.code = None
+        self.labels = None
+        self.program = None
+
+    def load(self, code, labels=None):
+        '''
+        Carrega um programa: caminho de arquivo ou lista de instruções no
+        formato de read_code (os rótulos são calculados se labels for None)
+        '''
+        if isinstance(code, (str, os.PathLike)):
+            self.code, self.labels, self.program = self.load_file(code)
+            return
+        code = [classify(parts) for parts in code]
+        self.code, self.labels, self.program = self.compile(code, labels_of(code) if labels is None else labels)
+
+    def load_file(self, path):
+        '''
+        (code, labels, program) do arquivo, pelo cache se o arquivo não mudou
+        '''
+        path = os.path.abspath(path)
+        info = os.stat(path)
+        version = (info.st_mtime_ns, info.st_size)
+        entry = self.cache.get(path)
+        if entry is not None and entry[0] == version:
+            self.cache.move_to_end(path)
+            return entry[1]
+        loaded = self.compile(*interpreter.read_code(path))
+        if self.cache_size:
+            self.cache[path] = (version, loaded)
+            self.cache.move_to_end(path)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return loaded
+
+    def compile(self, code, labels):
+        if self.legacy:
+            return code, labels, None
+        optimized, optimized_labels = (Optimizer(vectorize=self.vectorize).optimize(code)
+                                       if self.optimize else (code, labels))
+        return code, labels, compile_code(optimized, optimized_labels)
+
+    def run(self):
+        if self.code is None:
+            raise RuntimeError("nenhum programa carregado")
+        if self.program is not None:
+            execute(self.program, self.stdin, self.stdout)
+            return
+        self.reset_globals()
+        interpreter.CODE, interpreter.LABELS = self.code, self.labels
+        stdin = sys.stdin
+        if self.stdin is not None:
+            sys.stdin = self.stdin
+        try:
+            with contextlib.redirect_stdout(self.stdout or sys.stdout):
+                interpreter.run_legacy()
+        finally:
+            sys.stdin = stdin
+
+    def reset(self):
+        '''
+        Descarta o programa carregado e o estado dos handlers originais (o cache continua)
+        '''
+        self.code = None
+        self.labels = None
+        self.program = None
+        self.reset_globals()
+
+    def reset_globals(self):
+        interpreter.CODE, interpreter.LABELS = None, None
+        interpreter.PC = 0
+        interpreter.GLOBALS = {'ra': None}
+        interpreter.STACK.clear()
+        interpreter.PARAMETERS.clear()
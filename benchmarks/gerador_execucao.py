@@ -0,0 +1,87 @@
+"""
+Benchmark do gerador de código (modules/Gerador): compila um programa fonte
+com laços, arrays e chamadas recursivas e compara o fluxo com arquivo
+intermediário (python main.py --tac grava o código de três endereços e o
+Interpretador o executa em outro processo) com python main.py --executar,
+que gera as instruções em memória e as executa na VM no mesmo processo.
+Confere que as saídas são iguais.
+
+Uso:
+    python benchmarks/gerador_execucao.py [repeticoes]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+FOLDER = os.path.join(ROOT, 'tmp', 'gerador')
+SOURCE = os.path.join(FOLDER, 'programa.txt')
+TAC = os.path.join(FOLDER, 'programa_tac.txt')
+
+PROGRAM = """
+int fib(int n) {
+    while (n<2) {
+        return n;
+    }
+    return fib(n-1)+fib(n-2);
+}
+int soma(int v[100], int n) {
+    int i;
+    int s;
+    i = 0;
+    s = 0;
+    while (i<n) {
+        s = s+v[i];
+        i = i+1;
+    }
+    return s;
+}
+int main() {
+    int i;
+    int v[100];
+    i = 0;
+    while (i<100) {
+        v[i] = i*i%7;
+        i = i+1;
+    }
+    print(soma(v, 100), fib(18));
+    return 0;
+}
+"""
+
+def run(command: list, **options) -> str:
+    return subprocess.run([sys.executable, *command], capture_output=True, text=True, check=True, **options).stdout
+
+def withFile() -> str:
+    with open(TAC, 'w', encoding='utf-8') as file:
+        file.write(run(['main.py', '--tac', SOURCE]))
+    return run([os.path.join('Interpretador', 'interpreter.py'), TAC])
+
+def inProcess() -> str:
+    return run(['main.py', '--executar', SOURCE])
+
+def measure(function, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        output = function()
+    return (time.perf_counter() - start) / rounds, output
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    os.makedirs(FOLDER, exist_ok=True)
+    with open(SOURCE, 'w', encoding='utf-8') as file:
+        file.write(PROGRAM)
+    intermediate, expected = measure(withFile, rounds)
+    direct, output = measure(inProcess, rounds)
+    if output != expected:
+        print("ERRO: saídas diferentes")
+        sys.exit(1)
+    print(f"Compilar e executar (média de {rounds}): {output.split()}")
+    print(f"  Arquivo intermediário: {intermediate:8.3f}s")
+    print(f"  Em memória (--executar): {direct:8.3f}s ({intermediate / direct:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark de memória dos arrays do Interpretador: um programa aloca um
+array de floats e um de ints (ALLOC), preenche cada posição com um valor
+diferente e soma os dois. Compara os arrays tipados do bytecode
+(Interpretador/arrays.py, array('d') e array('q')) com listas Python
+([c]*b, como no interpretador original): pico de memória alocada durante a
+execução (tracemalloc) e tempo (sem tracemalloc).
+
+Uso:
+    python benchmarks/interpretador_arrays.py [tamanho_do_array]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+import bytecode
+import interpreter
+from bytecode import compile_code, execute
+
+PROGRAM = os.path.join(ROOT, 'tmp', 'interpretador', 'arrays.txt')
+
+def generateProgram(size: int) -> str:
+    return "\n".join([
+        "LABEL main",
+        f"ALLOC v {size} 0.0",
+        f"ALLOC w {size} 0",
+        "LD i 0",
+        "LABEL FILL",
+        "MULT t i 1.5",
+        "LD v$i t",
+        "MULT k i 7",
+        "LD w$i k",
+        "ADD i i 1",
+        f"BLT i {size} FILL",
+        "LD s 0.0",
+        "LD n 0",
+        "LD i 0",
+        "LABEL SUM",
+        "ADD s s v$i",
+        "ADD n n w$i",
+        "ADD i i 1",
+        f"BLT i {size} SUM",
+        "PRINT s",
+        "PRINT n",
+        "RET 0",
+    ]) + "\n"
+
+def listAllocate(size, val):
+    return [val] * size
+
+def run(code, labels, allocate, traced: bool):
+    """
+    Executa o programa com a função de ALLOC indicada; devolve (tempo, pico de memória, saída)
+    """
+    original = bytecode.allocate
+    bytecode.allocate = allocate
+    output = io.StringIO()
+    try:
+        program = compile_code(code, labels)
+        if traced:
+            tracemalloc.start()
+        with contextlib.redirect_stdout(output):
+            start = time.perf_counter()
+            execute(program)
+            elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if traced else 0
+    finally:
+        if traced:
+            tracemalloc.stop()
+        bytecode.allocate = original
+    return elapsed, peak, output.getvalue()
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    os.makedirs(os.path.dirname(PROGRAM), exist_ok=True)
+    with open(PROGRAM, 'w', encoding='utf-8') as file:
+        file.write(generateProgram(size))
+    code, labels = interpreter.read_code(PROGRAM)
+    print(f"Dois arrays de {size} posições (float e int)")
+
+    results = []
+    for name, allocate in (("Listas:          ", listAllocate), ("Arrays tipados:  ", bytecode.allocate)):
+        _, peak, output = run(code, labels, allocate, True)
+        elapsed = min(run(code, labels, allocate, False)[0] for _ in range(3))
+        results.append((name, elapsed, peak, output))
+    if len({output for *_, output in results}) != 1:
+        print("ERRO: saídas diferentes")
+        sys.exit(1)
+    for name, elapsed, peak, _ in results:
+        print(f"{name} {peak / 2 ** 20:9.1f} MiB de pico {peak / (2 * size):8.1f} bytes/posição {elapsed:8.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark do Interpretador: executa um laço de código de três endereços
+(aritmética, comparação e desvio, como os laços de Interpretador/code3.txt)
+com o bytecode compilado (melhor de 3 execuções) e com os handlers de texto
+originais (--legacy), conferindo que as duas saídas são iguais.
+
+Uso:
+    python benchmarks/interpretador_bytecode.py [iteracoes]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+import interpreter
+from bytecode import compile_code, execute
+
+PROGRAM = os.path.join(ROOT, 'tmp', 'interpretador', 'laco.txt')
+
+def generateLoop(iterations: int) -> str:
+    return "\n".join([
+        "LABEL main",
+        "LD i 0",
+        "LD s 0",
+        "LD t 0.0",
+        "LABEL LOOP",
+        "ADD s s i",
+        "MULT t i 2",
+        "SUB t t 1",
+        "DIV t t 2",
+        "ADD s s t",
+        "ADD i i 1",
+        f"BLT i {iterations} LOOP",
+        "PRINT s",
+        "PRINT t",
+        "RET 0",
+    ]) + "\n"
+
+def runBytecode(code, labels):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        program = compile_code(code, labels)
+        start = time.perf_counter()
+        execute(program)
+    return time.perf_counter() - start, output.getvalue()
+
+def runLegacy(code, labels):
+    """
+    Executa main() do interpretador com --legacy, restaurando o estado global do módulo
+    """
+    interpreter.GLOBALS = {'ra': None}
+    interpreter.STACK.clear()
+    interpreter.PARAMETERS.clear()
+    argv = sys.argv
+    sys.argv = ['interpreter.py', '--legacy', PROGRAM]
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            start = time.perf_counter()
+            interpreter.main()
+            elapsed = time.perf_counter() - start
+    finally:
+        sys.argv = argv
+    return elapsed, output.getvalue()
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    os.makedirs(os.path.dirname(PROGRAM), exist_ok=True)
+    with open(PROGRAM, 'w', encoding='utf-8') as file:
+        file.write(generateLoop(iterations))
+    instructions = iterations * 7
+    print(f"Laço: {iterations} iterações, {instructions} instruções executadas")
+
+    code, labels = interpreter.read_code(PROGRAM)
+    bytecode, output = min(runBytecode(code, labels) for _ in range(3))
+    legacy, legacyOutput = runLegacy(code, labels)
+    if output != legacyOutput:
+        print("ERRO: saídas diferentes")
+        print(output, legacyOutput)
+        sys.exit(1)
+    print(f"Bytecode: {bytecode:8.3f}s {instructions / bytecode:14,.0f} instruções/s")
+    print(f"Legado:   {legacy:8.3f}s {instructions / legacy:14,.0f} instruções/s")
+    print(f"Aceleração: {legacy / bytecode:.1f}x")
+
+if __name__ == "__main__":
+    main()
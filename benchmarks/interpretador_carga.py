@@ -0,0 +1,103 @@
+"""
+Benchmark da carga de programas do Interpretador: gera um programa de três
+endereços com centenas de milhares de instruções e mede o tempo de leitura
+com o read_code original (readlines() e shlex.split em toda linha), com o
+read_code atual (str.split, shlex só em linhas com aspas) e com o arquivo
+.tacc pré-compilado (Interpretador/tacc.py, sem análise de texto). Confere
+que os três resultados são iguais.
+
+Uso:
+    python benchmarks/interpretador_carga.py [instrucoes]
+"""
+import os
+import shlex
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+import interpreter
+import tacc
+from operand import classify
+from optimizer import dump
+
+FOLDER = os.path.join(ROOT, 'tmp', 'interpretador')
+
+def generateProgram(instructions: int) -> str:
+    lines = ["LABEL main", "ALLOC v 100 0", "LD i 0"]
+    block = 0
+    while len(lines) < instructions:
+        lines += [
+            f"LABEL L{block}",
+            f"ADD t{block % 50} i {block}",
+            f"MULT u t{block % 50} 2.5",
+            "LD v$i u",
+            "ADD i i 1",
+            f"BLT i 100 L{block}",
+            "",
+            "LD i 0",
+            f"PRINT 'bloco {block}'" if block % 100 == 0 else "PRINT i",
+        ]
+        block += 1
+    return "\n".join(lines + ["RET 0"]) + "\n"
+
+def shlexReadCode(path: str):
+    """
+    read_code antes do leitor rápido
+    """
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        lines = file.readlines()
+    code = []
+    labels = {}
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            code.append([''])
+            continue
+        parts = shlex.split(line)
+        if not parts:
+            code.append([''])
+            continue
+        code.append(classify(parts))
+        if parts[0] == 'LABEL':
+            labels[parts[1]] = i
+    return code, labels
+
+def measure(load, path: str):
+    best, result = None, None
+    for _ in range(3):
+        start = time.perf_counter()
+        result = load(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    instructions = int(sys.argv[1]) if len(sys.argv) > 1 else 300000
+    os.makedirs(FOLDER, exist_ok=True)
+    source = os.path.join(FOLDER, 'carga.txt')
+    compiled = os.path.join(FOLDER, 'carga.tacc')
+    with open(source, 'w', encoding='utf-8') as file:
+        file.write(generateProgram(instructions))
+    tacc.save(compiled, *interpreter.read_code(source))
+
+    results = [
+        ("shlex.split:     ", *measure(shlexReadCode, source), os.path.getsize(source)),
+        ("read_code:       ", *measure(interpreter.read_code, source), os.path.getsize(source)),
+        (".tacc (mmap):    ", *measure(tacc.load, compiled), os.path.getsize(compiled)),
+    ]
+    expected = results[0][2]
+    for _, _, (code, labels), _ in results:
+        if dump(code) != dump(expected[0]) or labels != expected[1]:
+            print("ERRO: programas diferentes")
+            sys.exit(1)
+    lines = len(expected[0])
+    print(f"Carga de {lines} linhas")
+    slowest = results[0][1]
+    for name, elapsed, _, size in results:
+        print(f"  {name} {elapsed:8.3f}s {lines / elapsed:12,.0f} linhas/s {size / 2 ** 20:7.1f} MiB ({slowest / elapsed:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark de entrada e saída do Interpretador (Interpretador/streams.py): um
+programa imprime um milhão de linhas com PRINT e outro lê um milhão de
+números com READLN e os soma.
+
+A saída vai para um arquivo com buffer de linha (como um terminal, uma
+escrita por linha) e é comparada com LIMIT = 1, que escreve cada PRINT no
+momento em que é executado, como print(). A entrada vem de um arquivo e é
+comparada com a leitura de uma linha por READLN (como input() em um
+terminal).
+
+Uso:
+    python benchmarks/interpretador_es.py [linhas]
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+import interpreter
+import streams
+from bytecode import compile_code, execute
+from optimizer import Optimizer
+
+FOLDER = os.path.join(ROOT, 'tmp', 'interpretador')
+
+def generatePrint(lines: int) -> str:
+    return "\n".join([
+        "LABEL main",
+        "LD i 0",
+        "LABEL L",
+        "PRINT i",
+        "ADD i i 1",
+        f"BLT i {lines} L",
+        "RET 0",
+    ]) + "\n"
+
+def generateRead(lines: int) -> str:
+    return "\n".join([
+        "LABEL main",
+        "LD s 0",
+        "LD i 0",
+        "LABEL L",
+        "READLN x",
+        "ADD s s x",
+        "ADD i i 1",
+        f"BLT i {lines} L",
+        "PRINT s",
+        "RET 0",
+    ]) + "\n"
+
+class LineByLine:
+    """
+    Entrada que se apresenta como terminal: uma linha por READLN
+    """
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readline(self):
+        return self.stream.readline()
+
+    def isatty(self):
+        return True
+
+def load(name: str, source: str):
+    path = os.path.join(FOLDER, name)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(source)
+    return compile_code(*Optimizer().optimize(interpreter.read_code(path)[0]))
+
+def measureOutput(program, limit: int):
+    path = os.path.join(FOLDER, 'es_saida.out')
+    original = streams.LIMIT
+    streams.LIMIT = limit
+    try:
+        with open(path, 'w', encoding='utf-8', buffering=1) as stdout:
+            start = time.perf_counter()
+            execute(program, stdout=stdout)
+            elapsed = time.perf_counter() - start
+    finally:
+        streams.LIMIT = original
+    with open(path, encoding='utf-8') as file:
+        return elapsed, file.read()
+
+def measureInput(program, path: str, lineByLine: bool):
+    output = io.StringIO()
+    with open(path, encoding='utf-8') as stdin:
+        start = time.perf_counter()
+        execute(program, stdin=LineByLine(stdin) if lineByLine else stdin, stdout=output)
+        return time.perf_counter() - start, output.getvalue()
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    os.makedirs(FOLDER, exist_ok=True)
+    printing = load('es_print.txt', generatePrint(lines))
+    reading = load('es_readln.txt', generateRead(lines))
+    data = os.path.join(FOLDER, 'es_entrada.txt')
+    with open(data, 'w', encoding='utf-8') as file:
+        file.write("".join(f"{i % 1000}\n" for i in range(lines)))
+
+    unbuffered, expected = measureOutput(printing, 1)
+    buffered, output = measureOutput(printing, streams.LIMIT)
+    lineByLine, expectedSum = measureInput(reading, data, True)
+    tokenized, total = measureInput(reading, data, False)
+    if output != expected or total != expectedSum:
+        print("ERRO: saídas diferentes")
+        sys.exit(1)
+    print(f"PRINT de {lines} linhas (arquivo com buffer de linha):")
+    print(f"  Uma escrita por PRINT: {unbuffered:8.3f}s {lines / unbuffered:12,.0f} linhas/s")
+    print(f"  Saída em bloco:        {buffered:8.3f}s {lines / buffered:12,.0f} linhas/s ({unbuffered / buffered:.2f}x)")
+    print(f"READLN de {lines} linhas (arquivo):")
+    print(f"  Uma linha por READLN:  {lineByLine:8.3f}s {lines / lineByLine:12,.0f} linhas/s")
+    print(f"  Entrada pré-separada:  {tokenized:8.3f}s {lines / tokenized:12,.0f} linhas/s ({lineByLine / tokenized:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark da execução em lote do Interpretador (Interpretador/batch.py): gera
+muitos programas pequenos de três endereços (laços e Fibonacci recursivo com
+tamanhos diferentes) e compara um processo `python interpreter.py arquivo`
+por programa com o ProcessPoolExecutor de batch.py, que reaproveita uma VM
+por processo. Confere que as saídas são iguais e mostra a vazão.
+
+Uso:
+    python benchmarks/interpretador_lote.py [numero_de_programas] [processos]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+from batch import run_batch
+from interpretador_bytecode import generateLoop
+from interpretador_recursao import generateFib
+
+PROGRAMS = os.path.join(ROOT, 'tmp', 'interpretador', 'lote')
+INTERPRETER = os.path.join(ROOT, 'Interpretador', 'interpreter.py')
+
+def generatePrograms(count: int) -> list:
+    os.makedirs(PROGRAMS, exist_ok=True)
+    paths = []
+    for i in range(count):
+        source = generateLoop(100 + 10 * i) if i % 2 else generateFib(5 + i % 8)
+        path = os.path.join(PROGRAMS, f"programa{i:05}.txt")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        paths.append(path)
+    return paths
+
+def runProcesses(paths: list):
+    start = time.perf_counter()
+    outputs = [subprocess.run([sys.executable, INTERPRETER, path], capture_output=True, text=True, check=True).stdout
+               for path in paths]
+    return time.perf_counter() - start, outputs
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    paths = generatePrograms(count)
+    print(f"{count} programas")
+
+    single, expected = runProcesses(paths)
+    print(f"  Um processo por programa: {single:8.3f}s {count / single:10,.1f} programas/s")
+    for n in sorted({1, workers}):
+        results, elapsed = run_batch(paths, n)
+        if [result.output for result in results] != expected or any(result.error for result in results):
+            print("ERRO: saídas diferentes")
+            sys.exit(1)
+        print(f"  Lote com {n} processo(s):  {elapsed:8.3f}s {count / elapsed:10,.1f} programas/s ({single / elapsed:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark da classificação de operandos do Interpretador: executa laços com
+leituras e escritas de posições de array (v$i) e aritmética com os handlers
+originais sobre operandos em texto (read_code(..., classified=False), que
+converte e separa o texto a cada acesso), com os mesmos handlers sobre os
+operandos classificados por read_code e com o bytecode.
+
+Uso:
+    python benchmarks/interpretador_operandos.py [tamanho_do_array] [repeticoes]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+import interpreter
+from bytecode import compile_code, execute
+
+PROGRAM = os.path.join(ROOT, 'tmp', 'interpretador', 'operandos.txt')
+
+def generateProgram(size: int, repetitions: int) -> str:
+    return "\n".join([
+        "LABEL main",
+        f"ALLOC v {size} 0",
+        "LD i 0",
+        "LABEL FILL",
+        "MULT t i 3",
+        "LD v$i t",
+        "ADD i i 1",
+        f"BLT i {size} FILL",
+        "LD k 0",
+        "LD s 0",
+        "LABEL OUTER",
+        "LD i 0",
+        "LABEL SUM",
+        "ADD s s v$i",
+        "LD x v$i",
+        "SUB x x 1",
+        "LD v$i x",
+        "ADD i i 1",
+        f"BLT i {size} SUM",
+        "ADD k k 1",
+        f"BLT k {repetitions} OUTER",
+        "PRINT s",
+        "PRINT v$0",
+        "RET 0",
+    ]) + "\n"
+
+def runLegacy(classified: bool):
+    """
+    Executa run_legacy() com o estado global do módulo restaurado
+    """
+    interpreter.CODE, interpreter.LABELS = interpreter.read_code(PROGRAM, classified)
+    interpreter.GLOBALS = {'ra': None}
+    interpreter.STACK.clear()
+    interpreter.PARAMETERS.clear()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        interpreter.run_legacy()
+        return time.perf_counter() - start, output.getvalue()
+
+def runBytecode():
+    code, labels = interpreter.read_code(PROGRAM)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        program = compile_code(code, labels)
+        start = time.perf_counter()
+        execute(program)
+        return time.perf_counter() - start, output.getvalue()
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    os.makedirs(os.path.dirname(PROGRAM), exist_ok=True)
+    with open(PROGRAM, 'w', encoding='utf-8') as file:
+        file.write(generateProgram(size, repetitions))
+    instructions = size * 4 + size * repetitions * 7 + repetitions * 3
+    print(f"Array de {size} posições, {repetitions} repetições, {instructions} instruções executadas")
+
+    results = [
+        ("Handlers, operandos em texto:     ", runLegacy(False)),
+        ("Handlers, operandos classificados:", runLegacy(True)),
+        ("Bytecode:                         ", runBytecode()),
+    ]
+    outputs = {output for _, (_, output) in results}
+    if len(outputs) != 1:
+        print("ERRO: saídas diferentes")
+        sys.exit(1)
+    for name, (elapsed, _) in results:
+        print(f"{name} {elapsed:8.3f}s {instructions / elapsed:14,.0f} instruções/s")
+
+if __name__ == "__main__":
+    main()
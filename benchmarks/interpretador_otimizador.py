@@ -0,0 +1,89 @@
+"""
+Benchmark do otimizador do Interpretador (Interpretador/optimizer.py): para
+cada programa, conta as instruções do código (sem linhas em branco) e as
+instruções despachadas pelo laço do bytecode antes e depois da otimização,
+mede o tempo de execução (melhor de 3) e confere que as saídas são iguais.
+
+Uso:
+    python benchmarks/interpretador_otimizador.py [iteracoes_do_laco] [n_fib]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+import interpreter
+from bytecode import compile_code, execute
+from optimizer import Optimizer
+from interpretador_bytecode import generateLoop
+from interpretador_recursao import generateFib
+
+PROGRAMS = os.path.join(ROOT, 'tmp', 'interpretador')
+
+class CountingCode(list):
+    """
+    Lista de instruções que conta os acessos feitos pelo laço de execute
+    """
+    def __init__(self, code):
+        super().__init__(code)
+        self.count = 0
+
+    def __getitem__(self, index):
+        self.count += 1
+        return super().__getitem__(index)
+
+def run(code, labels):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        program = compile_code(code, labels)
+        start = time.perf_counter()
+        execute(program)
+        return time.perf_counter() - start, output.getvalue()
+
+def dispatches(code, labels) -> int:
+    program = compile_code(code, labels)
+    program.code = CountingCode(program.code)
+    with contextlib.redirect_stdout(io.StringIO()):
+        execute(program)
+    return program.code.count
+
+def instructions(code) -> int:
+    return sum(1 for parts in code if parts[0])
+
+def measure(name: str, path: str):
+    code, labels = interpreter.read_code(path)
+    optimized, optimizedLabels = Optimizer().optimize(code)
+    before, output = min(run(code, labels) for _ in range(3))
+    after, optimizedOutput = min(run(optimized, optimizedLabels) for _ in range(3))
+    if output != optimizedOutput:
+        print(f"ERRO: saídas diferentes em {name}")
+        sys.exit(1)
+    staticBefore, staticAfter = instructions(code), instructions(optimized)
+    dynamicBefore, dynamicAfter = dispatches(code, labels), dispatches(optimized, optimizedLabels)
+    print(f"{name}:")
+    print(f"  Instruções no código:  {staticBefore:12,} -> {staticAfter:12,}")
+    print(f"  Instruções executadas: {dynamicBefore:12,} -> {dynamicAfter:12,} ({dynamicAfter / dynamicBefore:.0%})")
+    print(f"  Tempo:                 {before:11.4f}s -> {after:11.4f}s ({before / after:.2f}x)")
+
+def write(name: str, source: str) -> str:
+    path = os.path.join(PROGRAMS, name)
+    os.makedirs(PROGRAMS, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(source)
+    return path
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    measure("code.txt", os.path.join(ROOT, 'Interpretador', 'code.txt'))
+    measure("code3.txt", os.path.join(ROOT, 'Interpretador', 'code3.txt'))
+    measure(f"Laço ({iterations} iterações)", write('otimizador_laco.txt', generateLoop(iterations)))
+    measure(f"fib({n})", write('otimizador_fib.txt', generateFib(n)))
+
+if __name__ == "__main__":
+    main()
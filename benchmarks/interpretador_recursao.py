@@ -0,0 +1,152 @@
+"""
+Benchmark de chamadas do Interpretador: Fibonacci recursivo sem memorização
+e a função de Ackermann em código de três endereços, executados com o
+bytecode e com os handlers originais (--legacy). Como toda variável escrita
+é global, valores que precisam atravessar uma chamada vão como argumento
+(o resultado parcial em fibsoma, m em ack).
+
+Uso:
+    python benchmarks/interpretador_recursao.py [n_fib] [m_ack] [n_ack]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+import interpreter
+from bytecode import compile_code, execute
+
+PROGRAM = os.path.join(ROOT, 'tmp', 'interpretador', 'recursao.txt')
+
+def generateFib(n: int) -> str:
+    return "\n".join([
+        "LABEL fib",
+        "BLT a0 2 FIB_BASE",
+        "SUB t a0 1",
+        "PARAM t",
+        "CALL fib 1",
+        "SUB t a0 2",
+        "PARAM t",
+        "PARAM ra",
+        "CALL fibsoma 2",
+        "RET ra",
+        "LABEL FIB_BASE",
+        "RET a0",
+        "LABEL fibsoma",
+        "PARAM a0",
+        "CALL fib 1",
+        "ADD t ra a1",
+        "RET t",
+        "LABEL main",
+        f"PARAM {n}",
+        "CALL fib 1",
+        "PRINT ra",
+        "RET 0",
+    ]) + "\n"
+
+def generateAckermann(m: int, n: int) -> str:
+    return "\n".join([
+        "LABEL ack",
+        "BNE a0 0 ACK_M",
+        "ADD t a1 1",
+        "RET t",
+        "LABEL ACK_M",
+        "BNE a1 0 ACK_N",
+        "SUB t a0 1",
+        "PARAM t",
+        "PARAM 1",
+        "CALL ack 2",
+        "RET ra",
+        "LABEL ACK_N",
+        "SUB t a1 1",
+        "PARAM a0",
+        "PARAM t",
+        "CALL ack 2",
+        "SUB t a0 1",
+        "PARAM t",
+        "PARAM ra",
+        "CALL ack 2",
+        "RET ra",
+        "LABEL main",
+        f"PARAM {m}",
+        f"PARAM {n}",
+        "CALL ack 2",
+        "PRINT ra",
+        "RET 0",
+    ]) + "\n"
+
+def ackermannCalls(m: int, n: int) -> int:
+    """
+    Número de CALLs executados por ack(m, n) (versão iterativa da recursão)
+    """
+    stack, total = [m], 0
+    while stack:
+        total += 1
+        m = stack.pop()
+        if m == 0:
+            n += 1
+        elif n == 0:
+            n = 1
+            stack.append(m - 1)
+        else:
+            stack.append(m - 1)
+            stack.append(m)
+            n -= 1
+    return total
+
+def fibCalls(n: int) -> int:
+    """
+    Número de CALLs executados por fib(n)
+    """
+    total = [0, 0]
+    for i in range(2, n + 1):
+        # CALL fib, CALL fibsoma e o CALL fib dentro de fibsoma
+        total.append(3 + total[i - 1] + total[i - 2])
+    return total[n] + 1
+
+def runBytecode(code, labels):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        program = compile_code(code, labels)
+        start = time.perf_counter()
+        execute(program)
+        return time.perf_counter() - start, output.getvalue()
+
+def runLegacy(code, labels):
+    interpreter.CODE, interpreter.LABELS = code, labels
+    interpreter.GLOBALS = {'ra': None}
+    interpreter.STACK.clear()
+    interpreter.PARAMETERS.clear()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        start = time.perf_counter()
+        interpreter.run_legacy()
+        return time.perf_counter() - start, output.getvalue()
+
+def measure(name: str, source: str, total: int):
+    os.makedirs(os.path.dirname(PROGRAM), exist_ok=True)
+    with open(PROGRAM, 'w', encoding='utf-8') as file:
+        file.write(source)
+    code, labels = interpreter.read_code(PROGRAM)
+    bytecode, output = min(runBytecode(code, labels) for _ in range(3))
+    legacy, legacyOutput = runLegacy(code, labels)
+    if output != legacyOutput:
+        print("ERRO: saídas diferentes")
+        sys.exit(1)
+    print(f"{name} = {output.strip()}: {total} chamadas")
+    print(f"  Bytecode: {bytecode:8.3f}s {total / bytecode:12,.0f} chamadas/s")
+    print(f"  Legado:   {legacy:8.3f}s {total / legacy:12,.0f} chamadas/s")
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    m, k = (int(sys.argv[2]), int(sys.argv[3])) if len(sys.argv) > 3 else (2, 300)
+    measure(f"fib({n})", generateFib(n), fibCalls(n))
+    measure(f"ack({m}, {k})", generateAckermann(m, k), ackermannCalls(m, k))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark das instruções em bloco do Interpretador (VFILL, VCOPY, VADD,
+VMUL, VSUM, geradas pelo otimizador para laços contados sobre arrays): um
+programa preenche, copia, soma, multiplica e acumula arrays de ALLOC com um
+laço por operação. Compara o bytecode sem otimização, otimizado sem as
+instruções em bloco (--no-vectorize) e otimizado com elas, conferindo que as
+saídas são iguais.
+
+Uso:
+    python benchmarks/interpretador_vetores.py [tamanho_do_array]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+import interpreter
+from bytecode import compile_code, execute
+from optimizer import Optimizer
+
+PROGRAM = os.path.join(ROOT, 'tmp', 'interpretador', 'vetores.txt')
+
+def generateProgram(size: int) -> str:
+    def loop(label: str, body: str) -> list:
+        return ["LD i 0", f"LABEL {label}", body, "ADD i i 1", f"BLT i n {label}"]
+
+    return "\n".join([
+        "LABEL main",
+        f"LD n {size}",
+        f"ALLOC v {size} 0.0",
+        f"ALLOC w {size} 0.0",
+        f"ALLOC u {size} 0",
+        *loop("FILL", "LD v$i 1.5"),
+        *loop("FILLINT", "LD u$i 3"),
+        *loop("COPY", "LD w$i v$i"),
+        *loop("SUM", "ADD w$i w$i v$i"),
+        *loop("PRODUCT", "MULT v$i w$i u$i"),
+        "LD s 0.0",
+        *loop("REDUCE", "ADD s s v$i"),
+        "PRINT s",
+        "PRINT i",
+        "RET 0",
+    ]) + "\n"
+
+def run(code, labels):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        program = compile_code(code, labels)
+        start = time.perf_counter()
+        execute(program)
+        return time.perf_counter() - start, output.getvalue()
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    os.makedirs(os.path.dirname(PROGRAM), exist_ok=True)
+    with open(PROGRAM, 'w', encoding='utf-8') as file:
+        file.write(generateProgram(size))
+    code, labels = interpreter.read_code(PROGRAM)
+    print(f"Seis laços sobre arrays de {size} posições")
+
+    modes = [
+        ("Sem otimização:       ", (code, labels)),
+        ("Otimizado (sem bloco):", Optimizer(vectorize=False).optimize(code)),
+        ("Otimizado (em bloco): ", Optimizer().optimize(code)),
+    ]
+    results = [(name, *min(run(*program) for _ in range(3))) for name, program in modes]
+    if len({output for *_, output in results}) != 1:
+        print("ERRO: saídas diferentes")
+        sys.exit(1)
+    slowest = results[0][1]
+    for name, elapsed, _ in results:
+        print(f"{name} {elapsed:8.4f}s {6 * size / elapsed:14,.0f} posições/s ({slowest / elapsed:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark da VM do Interpretador (Interpretador/vm.py) em um processo que
+executa os mesmos programas muitas vezes, como um serviço: compara carregar
+cada programa do zero (ler, otimizar e compilar, cache_size=0) com o cache
+por caminho e mtime, que reaproveita o programa compilado enquanto o arquivo
+não muda. A saída vai para um StringIO injetado na VM.
+
+Uso:
+    python benchmarks/interpretador_vm.py [execucoes_por_programa]
+"""
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+
+from vm import VM
+
+PROGRAMS = [os.path.join(ROOT, 'Interpretador', name) for name in ('code.txt', 'code2.txt', 'code3.txt')]
+
+def run(vm: VM, rounds: int):
+    output = io.StringIO()
+    vm.stdout = output
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in PROGRAMS:
+            vm.load(path)
+            vm.run()
+    return time.perf_counter() - start, output.getvalue()
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    total = rounds * len(PROGRAMS)
+    print(f"{total} execuções ({len(PROGRAMS)} programas, {rounds} vezes cada)")
+    cold, expected = run(VM(cache_size=0), rounds)
+    warm, output = run(VM(), rounds)
+    if output != expected:
+        print("ERRO: saídas diferentes")
+        sys.exit(1)
+    print(f"  Sem cache: {cold:8.3f}s {total / cold:10,.0f} execuções/s")
+    print(f"  Com cache: {warm:8.3f}s {total / warm:10,.0f} execuções/s ({cold / warm:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark do Léxico: compara a máquina de modos caractere a caractere
+(Lexico.generateLegacyOutput) com o scanner compilado (Scanner.generateOutput).
+
+Uso:
+    python benchmarks/lexico_scanner.py [numero_de_funcoes]
+"""
+import contextlib
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    from modules.FileSystem import LocalFileSystem
+    from modules.Lexico.Lexico import Lexico
+
+TEMPLATE = """int funcao{n}(int a, float b[10]) {{
+    int indice;
+    float total;
+    char letra;
+    indice = 0;
+    total = 0.5;
+    letra = '\\n';
+    while (indice <= a) {{
+        total = total + b[indice]*2.25 - indice/3;
+        indice = indice + 1;/* comentario {n} */
+        if (total >= 100 && !(indice == a)) {{ break; }} else {{ print("maior que cem \\"{n}\\"", total); }}
+    }}
+    x{n}--;
+    readln(letra);
+    return indice % 7;
+}}
+"""
+
+def generateSource(functions: int) -> str:
+    rng = random.Random(functions)
+    parts = [TEMPLATE.format(n=rng.randint(0, 10**6)) for _ in range(functions)]
+    return ''.join(parts)
+
+def measure(function):
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        start = time.perf_counter()
+        output = function()
+        elapsed = time.perf_counter() - start
+    return output, elapsed
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = generateSource(functions)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        lexico = Lexico(LocalFileSystem())
+    lexico.inputDataFile = text
+
+    legacy, legacyTime = measure(lexico.generateLegacyOutput)
+    compiled, compiledTime = measure(lambda: lexico.scanner.generateOutput(text))
+
+    print(f"Entrada: {len(text)} caracteres")
+    print(f"Legado:    {legacyTime:8.3f}s  {len(text) / legacyTime:14,.0f} caracteres/s")
+    print(f"Compilado: {compiledTime:8.3f}s  {len(text) / compiledTime:14,.0f} caracteres/s")
+    print(f"Ganho: {legacyTime / compiledTime:.1f}x")
+    print(f"Saídas idênticas: {legacy == compiled}")
+    if legacy != compiled:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark dos tokens do Léxico: compara a memória ocupada pelos tokens
+compactos (LexicalToken com __slots__ e categoria inteira) com as strings
+"<ID,x>" usadas antes pelo Sintático e com uma NamedTuple equivalente,
+e o custo de classificar o lookahead (split da string x índice da categoria).
+
+Uso:
+    python benchmarks/lexico_tokens.py [numero_de_funcoes]
+"""
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+from typing import NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    from modules.FileSystem import LocalFileSystem
+    from modules.Lexico.Lexico import Lexico
+    from modules.Lexico.types import KIND_NAMES, LexicalToken
+
+from lexico_scanner import generateSource
+
+class TupleToken(NamedTuple):
+    kind: str
+    lexeme: str
+    line: int
+    column: int
+
+def legacyKind(token: str) -> str:
+    """
+    Extração da categoria como era feita em Sintatico.getLookAheadToken
+    """
+    if ',' in token:
+        index = 1
+        current = token[index]
+        kind = ""
+        while current != ',':
+            kind += current
+            index += 1
+            current = token[index]
+        return kind
+    return token
+
+def measureMemory(build):
+    tracemalloc.start()
+    tokens = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tokens, size
+
+def measureTime(function, tokens):
+    start = time.perf_counter()
+    for token in tokens:
+        function(token)
+    return time.perf_counter() - start
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = generateSource(functions)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        lexico = Lexico(LocalFileSystem())
+        scanner = lexico.scanner
+        # aquece o registro de categorias e o cache de prefixos fora da medição
+        list(scanner.tokens(text[:1000]))
+
+        # os lexemas são compartilhados pelas três representações; mede-se só o custo de cada token
+        source = list(scanner.tokens(text))
+        compact, compactSize = measureMemory(
+            lambda: [LexicalToken(token.kind, token.lexeme, token.line, token.column) for token in source])
+        strings, stringsSize = measureMemory(lambda: [scanner.format(token) for token in compact])
+        tuples, tuplesSize = measureMemory(
+            lambda: [TupleToken(token.name, token.lexeme, token.line, token.column) for token in compact])
+
+    count = len(compact)
+    print(f"Tokens: {count}")
+    print(f"LexicalToken (slots): {compactSize / 2**20:8.2f} MiB  {compactSize / count:6.1f} bytes/token")
+    print(f"String <ID,x>:        {stringsSize / 2**20:8.2f} MiB  {stringsSize / count:6.1f} bytes/token (sem linha e coluna)")
+    print(f"NamedTuple:           {tuplesSize / 2**20:8.2f} MiB  {tuplesSize / count:6.1f} bytes/token")
+
+    names = KIND_NAMES
+    splitTime = measureTime(legacyKind, strings)
+    kindTime = measureTime(lambda token: names[token.kind], compact)
+    print(f"Lookahead por split:  {splitTime:8.3f}s")
+    print(f"Lookahead por kind:   {kindTime:8.3f}s")
+    print(f"Ganho: {splitTime / kindTime:.1f}x")
+
+if __name__ == "__main__":
+    main()
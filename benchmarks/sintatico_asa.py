@@ -0,0 +1,142 @@
+"""
+Benchmark da árvore sintática abstrata: mede o custo de montar a ASA durante a
+análise preditiva, a memória por nó (node com __slots__ x um nó equivalente com
+__dict__, como o esqueleto antigo de asa.py) e a vazão dos percursos
+(ASA.walk com pilha explícita e Visitor). Antes confere as mensagens de erro
+dos programas de CASES, iguais com e sem a ASA.
+
+Uso:
+    python benchmarks/sintatico_asa.py [numero_de_comandos]
+"""
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    from modules.FileSystem import LocalFileSystem
+    from modules.Lexico.Lexico import Lexico
+    from modules.Sintatico.Sintatico import Sintatico
+    from modules.Sintatico.asa import ASA, Visitor, node
+
+from sintatico_stress import generateSource
+
+CASES = [
+    # dois operandos seguidos: a gramática aceita, as expressões não
+    ("int main() {\n    int a;\n    int b;\n    a b;\n    return 0;\n}\n",
+     "ERRO: operador esperado entre dois operandos na linha 4"),
+    ("int main() {\n    int a;\n    a+1 = 2;\n    return a;\n}\n",
+     "ERRO: atribuição a uma expressão que não é variável na linha 3"),
+    # operadores que só são prefixos na posição de operador binário
+    ("int main() {\n    int x;\n    x = 1 ! 2;\n    return x;\n}\n",
+     "ERRO: operador binário esperado no lugar de ! na linha 3"),
+    ("int main() {\n    int x;\n    x = x--2;\n    return x;\n}\n",
+     "ERRO: operador binário esperado no lugar de -- na linha 3"),
+]
+
+class DictNode:
+    """
+    Nó com __dict__, para comparação de memória
+    """
+    def __init__(self, kind, value, children, line):
+        self.kind = kind
+        self.value = value
+        self.children = children
+        self.line = line
+
+class Counter(Visitor):
+    def __init__(self):
+        self.count = 0
+
+    def genericVisit(self, n: node):
+        self.count += 1
+        for child in n.children:
+            self.visit(child)
+
+def copyTree(asa: ASA, factory):
+    """
+    Copia a árvore em pós-ordem com pilha explícita usando factory para criar os nós
+    """
+    done = []
+    stack = [(asa.root, False)]
+    while stack:
+        current, visited = stack.pop()
+        if visited:
+            size = len(current.children)
+            children = tuple(done[len(done) - size:]) if size else ()
+            del done[len(done) - size:]
+            done.append(factory(current.kind, current.value, children, current.line))
+        else:
+            stack.append((current, True))
+            for child in reversed(current.children):
+                stack.append((child, False))
+    return done[0]
+
+def measureCopy(asa: ASA, factory):
+    tracemalloc.start()
+    copy = copyTree(asa, factory)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return copy, size
+
+def parse(sintatico: Sintatico, tokens, buildAsa: bool) -> float:
+    sintatico.buildAsa = buildAsa
+    sintatico.languageStack = []
+    sintatico.input(tokens)
+    start = time.perf_counter()
+    sintatico.parse()
+    return time.perf_counter() - start
+
+def checkCases(lexico: Lexico, sintatico: Sintatico):
+    for text, expected in CASES:
+        for buildAsa in (False, True):
+            sintatico.errorMessage = None
+            try:
+                parse(sintatico, list(lexico.scanner.tokens(text)), buildAsa)
+            except SyntaxError:
+                pass
+            if sintatico.errorMessage != expected:
+                print(f"ERRO: {sintatico.errorMessage!r} no lugar de {expected!r} (buildAsa={buildAsa})")
+                sys.exit(1)
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    text = generateSource(statements, 100)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        lexico = Lexico(LocalFileSystem())
+        sintatico = Sintatico(LocalFileSystem())
+    checkCases(lexico, sintatico)
+    tokens = list(lexico.scanner.tokens(text))
+    print(f"Entrada: {statements} comandos, {len(tokens)} tokens")
+
+    withoutAsa = parse(sintatico, tokens, False)
+    withAsa = parse(sintatico, tokens, True)
+    asa = sintatico.asa
+    sintatico.languageStack = []
+    print(f"Análise sem ASA: {withoutAsa:8.3f}s")
+    print(f"Análise com ASA: {withAsa:8.3f}s")
+
+    start = time.perf_counter()
+    nodes = asa.size()
+    walkTime = time.perf_counter() - start
+    counter = Counter()
+    start = time.perf_counter()
+    counter.visit(asa.root)
+    visitTime = time.perf_counter() - start
+    print(f"Nós: {nodes}")
+    print(f"ASA.walk: {nodes / walkTime:14,.0f} nós/s")
+    print(f"Visitor:  {counter.count / visitTime:14,.0f} nós/s")
+
+    _, slotsSize = measureCopy(asa, node)
+    _, dictSize = measureCopy(asa, DictNode)
+    print(f"node (__slots__): {slotsSize / nodes:6.1f} bytes/nó")
+    print(f"nó com __dict__:  {dictSize / nodes:6.1f} bytes/nó")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark da análise incremental (Lexico.incremental e Sintatico.incremental):
+gera um programa com muitas funções, analisa uma vez e aplica edições típicas
+de um editor (trocar um número, inserir uma linha, inserir uma função e
+inserir uma linha no começo, que desloca as linhas de todo o resto). Para cada
+edição mede a análise completa (léxico e sintático do zero) e a incremental,
+e confere que as duas árvores têm os mesmos nós e linhas.
+
+Uso:
+    python benchmarks/sintatico_incremental.py [numero_de_funcoes] [repeticoes]
+"""
+import contextlib
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    from modules.FileSystem import LocalFileSystem
+    from modules.Lexico.Lexico import Lexico
+    from modules.Sintatico.Sintatico import Sintatico
+
+def generateFunction(index: int) -> str:
+    return f"""int f{index}(int n) {{
+    int r;
+    int i;
+    r = {index};
+    i = 0;
+    while (i<n) {{
+        r = r+i*{index % 7 + 1}-(r/3)%5;
+        print(r, "f{index}", i);
+        i = i+1;
+    }}
+    return r;
+}}
+"""
+
+def generateSource(functions: int) -> str:
+    parts = [f"int g{index} h{index}\n" if index % 10 == 0 else "" for index in range(functions)]
+    return ''.join(part + generateFunction(index) for index, part in enumerate(parts))
+
+def edits(text: str, functions: int):
+    middle = text.index(f"int f{functions // 2}(")
+    constant = text.index("r = ", middle) + 4
+    line = text.index("    i = 0;", middle)
+    yield "trocar um número", text[:constant] + "12345" + text[text.index(';', constant):]
+    yield "inserir uma linha", text[:line] + "    r = r+1;\n" + text[line:]
+    yield "inserir uma função", text[:middle] + generateFunction(functions) + text[middle:]
+    yield "linha no começo", "\n" + text
+
+def tree(sintatico: Sintatico):
+    return [(current.kind, current.value, current.line) for current, _ in sintatico.asa.walk()]
+
+def analyze(lexico: Lexico, sintatico: Sintatico, text: str) -> float:
+    lexico.inputDataFile = text
+    start = time.perf_counter()
+    sintatico.input(lexico.tokens(), lexico.change)
+    sintatico.parse()
+    return time.perf_counter() - start
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        lexico = Lexico(LocalFileSystem())
+        sintatico = Sintatico(LocalFileSystem())
+        incrementalLexico = Lexico(LocalFileSystem())
+        incrementalSintatico = Sintatico(LocalFileSystem())
+    incrementalLexico.incremental = True
+    incrementalSintatico.incremental = True
+    text = generateSource(functions)
+    analyze(incrementalLexico, incrementalSintatico, text)
+    print(f"Entrada: {functions} funções, {len(incrementalLexico.tokenList)} tokens, {text.count(chr(10))} linhas")
+
+    for name, edited in edits(text, functions):
+        full = min(analyze(lexico, sintatico, edited) for _ in range(repetitions))
+        incremental = []
+        for _ in range(repetitions):
+            analyze(incrementalLexico, incrementalSintatico, text)
+            incremental.append(analyze(incrementalLexico, incrementalSintatico, edited))
+        change = incrementalLexico.change
+        if tree(sintatico) != tree(incrementalSintatico):
+            print(f"ERRO: árvores diferentes depois de {name}")
+            sys.exit(1)
+        best = min(incremental)
+        print(f"{name:20} completa {full * 1000:8.2f} ms  incremental {best * 1000:8.2f} ms  "
+              f"({full / best:6.1f}x, tokens trocados {change.start}:{change.newEnd})")
+
+if __name__ == "__main__":
+    main()
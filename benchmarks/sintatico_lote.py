@@ -0,0 +1,73 @@
+"""
+Benchmark do modo em lote do front end (main.py --lote): gera muitos
+programas-fonte de tamanhos diferentes (alguns com erros léxicos e
+sintáticos) e analisa todos em sequência no próprio processo e com o
+ProcessPoolExecutor de main.analisarLote, de 1 processo até o número de
+núcleos. Mostra a vazão, o ganho e a eficiência por núcleo, e confere que os
+diagnósticos são os mesmos em todas as execuções.
+
+Uso:
+    python benchmarks/sintatico_lote.py [numero_de_arquivos] [funcoes_por_arquivo]
+"""
+import os
+import pickle
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main as compilador
+from sintatico_incremental import generateSource
+
+SOURCES = os.path.join(ROOT, 'tmp', 'sintatico', 'lote')
+
+def generateFiles(count: int, functions: int) -> list:
+    os.makedirs(SOURCES, exist_ok=True)
+    paths = []
+    for i in range(count):
+        text = generateSource(functions // 2 + i % functions)
+        if i % 10 == 3:
+            text = text.replace("i = i+1;", "i = i+1$;", 1)
+        elif i % 10 == 7:
+            text = text.replace("return r;", "return ;", 1)
+        path = os.path.join(SOURCES, f"fonte{i:05}.txt")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        paths.append(path)
+    return paths
+
+def diagnostics(results: list) -> list:
+    return [(result.arquivo, result.tokens, result.mensagens, result.erro) for result in results]
+
+def runSequential(paths: list):
+    from modules.Lexico.types import KIND_NAMES
+    compilador.iniciarProcesso(list(KIND_NAMES), pickle.dumps(compilador.carregarAnalisadores()))
+    start = time.perf_counter()
+    results = [compilador.analisar(path) for path in paths]
+    return results, time.perf_counter() - start
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    functions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    cores = os.cpu_count() or 1
+    paths = generateFiles(count, functions)
+    results, sequential = runSequential(paths)
+    expected = diagnostics(results)
+    tokens = sum(result.tokens for result in results)
+    failed = sum(1 for result in results if result.erro or result.mensagens)
+    print(f"{count} arquivos, {tokens} tokens, {failed} com erro, {cores} núcleo(s)")
+    print(f"  Sequencial:        {sequential:8.3f}s {tokens / sequential:12,.0f} tokens/s")
+    for workers in sorted({1, 2, cores // 2 or 1, cores}):
+        results, elapsed = compilador.analisarLote(paths, workers)
+        if diagnostics(results) != expected:
+            print("ERRO: diagnósticos diferentes")
+            sys.exit(1)
+        speedup = sequential / elapsed
+        print(f"  {workers:3} processo(s):    {elapsed:8.3f}s {tokens / elapsed:12,.0f} tokens/s "
+              f"({speedup:.2f}x, eficiência {speedup / min(workers, cores):.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark da inicialização do Sintático: compara a carga das configurações
+sem cache (YAML + first/follow + tabela LL(1)) com a carga a partir do cache
+em tmp/sintatico, dentro do processo e executando main.py de ponta a ponta.
+
+Uso:
+    python benchmarks/sintatico_startup.py [repeticoes]
+"""
+import contextlib
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    from modules.FileSystem import LocalFileSystem
+    from modules.Sintatico.Sintatico import Sintatico, CACHE_PATH, CACHE_FILE
+
+CACHE = os.path.join(ROOT, CACHE_PATH, CACHE_FILE)
+
+def clearCache():
+    if os.path.exists(CACHE):
+        os.remove(CACHE)
+
+def startup(cold: bool) -> float:
+    if cold:
+        clearCache()
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        start = time.perf_counter()
+        Sintatico(LocalFileSystem())
+        return time.perf_counter() - start
+
+def process(cold: bool) -> float:
+    if cold:
+        clearCache()
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'main.py', 'entrada.txt'], stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+def compare(title: str, function, repetitions: int):
+    cold = statistics.median(function(True) for _ in range(repetitions))
+    function(True)
+    warm = statistics.median(function(False) for _ in range(repetitions))
+    print(f"{title}")
+    print(f"  Sem cache: {cold * 1000:8.2f} ms")
+    print(f"  Com cache: {warm * 1000:8.2f} ms")
+    print(f"  Ganho: {cold / warm:.1f}x")
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    compare("Sintatico.startConfig", startup, repetitions)
+    compare("python main.py entrada.txt", process, max(1, repetitions // 4))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Teste de carga do Sintático: gera uma função com muitos comandos (100 mil por
+padrão) e expressões e blocos profundamente aninhados, e analisa o fluxo de
+tokens com o analisador preditivo de pilha explícita. O limite de recursão do
+Python é reduzido durante a análise para mostrar que a pilha do Python não
+cresce com o tamanho da entrada. A descida recursiva com retrocesso é
+executada na mesma entrada para comparação.
+
+Uso:
+    python benchmarks/sintatico_stress.py [numero_de_comandos] [profundidade]
+"""
+import contextlib
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+with contextlib.redirect_stdout(open(os.devnull, 'w')):
+    from modules.FileSystem import LocalFileSystem
+    from modules.Lexico.Lexico import Lexico
+    from modules.Sintatico.Sintatico import Sintatico
+
+STATEMENTS = [
+    "x = a + b * (c - 1) < d&&e||f;",
+    "while (i < n) { i = i + 1; print(i, v[i]); }",
+    "readln(x);",
+    "v[i] = f(a, b, 3) % 2;",
+    "y = !x;",
+    "s = \"texto\";",
+    "break;",
+]
+
+def generateSource(statements: int, depth: int) -> str:
+    lines = ["int main() {", " int x;"]
+    for n in range(statements):
+        lines.append(" " + STATEMENTS[n % len(STATEMENTS)])
+    lines.append(" x = " + "(" * depth + "a" + ")" * depth + ";")
+    lines.append(" " + "{" * depth + " x = 1; " + "}" * depth)
+    lines.append(" return x;")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def run(sintatico: Sintatico, lexico: Lexico, text: str, recursionLimit: int):
+    sintatico.languageStack = []
+    sintatico.errorMessage = ""
+    sintatico.input(lexico.scanner.tokens(text))
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(recursionLimit)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            sintatico.parse()
+        result = "ok"
+    except RecursionError:
+        result = "RecursionError"
+    except SyntaxError as error:
+        result = f"SyntaxError: {str(error)[:60]}"
+    finally:
+        elapsed = time.perf_counter() - start
+        sys.setrecursionlimit(limit)
+    matches = sum(1 for entry in sintatico.languageStack if not isinstance(entry, str))
+    return result, elapsed, matches
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    text = generateSource(statements, depth)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        lexico = Lexico(LocalFileSystem())
+        sintatico = Sintatico(LocalFileSystem())
+    print(f"Entrada: {statements} comandos, profundidade {depth}, {len(text)} caracteres")
+
+    sintatico.predictive = True
+    result, elapsed, matches = run(sintatico, lexico, text, 200)
+    print(f"Preditivo (limite de recursão 200): {result}, {elapsed:.2f}s, {matches / elapsed:,.0f} tokens/s (léxico + sintático)")
+    if result != "ok":
+        sys.exit(1)
+
+    sintatico.predictive = False
+    result, elapsed, matches = run(sintatico, lexico, text, sys.getrecursionlimit())
+    print(f"Descida recursiva: {result} após {matches} tokens, {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
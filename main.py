@@ -1,27 +1,259 @@
-from modules import lexico, sintatico
+import contextlib
+import io
+import os
+import pickle
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PROCESSO = None
+"""
+(léxico, sintático) do processo de trabalho do modo em lote
+"""
+
+class Resultado:
+    """
+    Resultado da análise de um arquivo no modo em lote: quantidade de tokens,
+    mensagens do léxico, erro do sintático (None se não houve) e tempo
+    """
+    __slots__ = ('arquivo', 'tokens', 'mensagens', 'erro', 'tempo')
+
+    def __init__(self, arquivo: str, tokens: int, mensagens: list, erro, tempo: float):
+        self.arquivo = arquivo
+        self.tokens = tokens
+        self.mensagens = mensagens
+        self.erro = erro
+        self.tempo = tempo
+
+def compilar(arquivo: str):
+    """
+    Léxico, sintático e gerador no mesmo processo, sem arquivos intermediários:
+    os tokens vão direto para o sintático e a ASA direto para o gerador. As
+    mensagens de carga dos módulos são descartadas para não se misturarem com a
+    saída do programa.
+
+    Returns:
+        O gerador, com a lista de instruções de três endereços em gerador.code
+    """
+    if not os.path.isfile(arquivo):
+        print(f"Arquivo {arquivo} não encontrado")
+        sys.exit(1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        from modules import lexico, sintatico, gerador
+        lexico.input(arquivo)
+        sintatico.input(lexico.tokens())
+        try:
+            sintatico.parse()
+            gerador.generate(sintatico.asa)
+        except SyntaxError as error:
+            mensagem = sintatico.errorMessage or str(error)
+        else:
+            mensagem = None
+    if mensagem is not None:
+        print(mensagem)
+        sys.exit(1)
+    return gerador
+
+def executar(arquivo: str):
+    """
+    Compila e executa o programa na VM do Interpretador, que recebe a lista de instruções em memória
+    """
+    gerador = compilar(arquivo)
+    sys.path.insert(0, os.path.join(ROOT, 'Interpretador'))
+    from vm import VM
+    vm = VM()
+    vm.load(gerador.code)
+    vm.run()
+
+def observar(arquivo: str, intervalo: float = 0.5):
+    """
+    Modo para integração com editores: analisa o arquivo de novo a cada
+    alteração (mtime ou tamanho) com o léxico e o sintático incrementais, que
+    reaproveitam os tokens e as declarações globais que não mudaram, e mostra
+    os erros ou o tempo da análise. Termina com Ctrl+C.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        from modules import lexico, sintatico
+    lexico.incremental = True
+    sintatico.incremental = True
+    ultimo = None
+    try:
+        while True:
+            try:
+                estado = os.stat(arquivo)
+            except FileNotFoundError:
+                estado = None
+            chave = None if estado is None else (estado.st_mtime_ns, estado.st_size)
+            if chave != ultimo:
+                ultimo = chave
+                if estado is None:
+                    print(f"Arquivo {arquivo} não encontrado")
+                else:
+                    inicio = time.perf_counter()
+                    lexico.input(arquivo)
+                    sintatico.input(lexico.tokens(), lexico.change)
+                    try:
+                        sintatico.parse()
+                        mensagem = "sem erros"
+                    except SyntaxError as error:
+                        mensagem = sintatico.errorMessage or str(error)
+                    print(f"{arquivo}: {mensagem} ({(time.perf_counter() - inicio) * 1000:.1f} ms)")
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        pass
+
+def carregarAnalisadores():
+    """
+    Léxico e sintático novos (fora dos singletons de modules), com as configurações já carregadas
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        from modules.FileSystem import LocalFileSystem
+        from modules.Lexico.Lexico import Lexico
+        from modules.Sintatico.Sintatico import Sintatico
+        return Lexico(LocalFileSystem()), Sintatico(LocalFileSystem())
+
+def iniciarProcesso(categorias: list, analisadores: bytes):
+    """
+    Inicializa um processo de trabalho com a sua própria cópia do léxico e do
+    sintático carregados no processo principal. As categorias de token são
+    registradas na mesma ordem do processo principal, porque as tabelas do
+    sintático guardam os identificadores inteiros delas.
+    """
+    global PROCESSO
+    with contextlib.redirect_stdout(io.StringIO()):
+        from modules.Lexico.types import KIND_NAMES, internKind
+        for nome in categorias[len(KIND_NAMES):]:
+            internKind(nome)
+        if KIND_NAMES[:len(categorias)] != categorias:
+            raise RuntimeError("Categorias de token diferentes no processo de trabalho")
+        PROCESSO = pickle.loads(analisadores)
+
+def analisar(arquivo: str) -> Resultado:
+    """
+    Léxico e sintático de um arquivo no processo de trabalho; as mensagens
+    de erro do léxico são capturadas em vez de impressas
+    """
+    lexico, sintatico = PROCESSO
+    inicio = time.perf_counter()
+    saida = io.StringIO()
+    tokens = []
+    erro = None
+    try:
+        if not os.path.isfile(arquivo):
+            raise FileNotFoundError(f"Arquivo {arquivo} não encontrado")
+        with contextlib.redirect_stdout(saida):
+            lexico.input(arquivo)
+            tokens = list(lexico.tokens())
+            sintatico.input(tokens)
+            sintatico.parse()
+    except SyntaxError as error:
+        erro = sintatico.errorMessage or str(error)
+    except Exception as error:
+        erro = f"{type(error).__name__}: {error}"
+    return Resultado(arquivo, len(tokens), saida.getvalue().splitlines(), erro, time.perf_counter() - inicio)
+
+def analisarLote(arquivos: list, processos: int = None):
+    """
+    Analisa os arquivos em paralelo em um ProcessPoolExecutor
+
+    Returns:
+        (resultados na ordem de arquivos, tempo total)
+    """
+    processos = processos or os.cpu_count() or 1
+    analisadores = pickle.dumps(carregarAnalisadores(), pickle.HIGHEST_PROTOCOL)
+    from modules.Lexico.types import KIND_NAMES
+    # lotes grandes diminuem a troca de mensagens, mas sem deixar processos parados no fim
+    lote = max(1, len(arquivos) // (4 * processos))
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processos, initializer=iniciarProcesso,
+                             initargs=(list(KIND_NAMES), analisadores)) as pool:
+        resultados = list(pool.map(analisar, arquivos, chunksize=lote))
+    return resultados, time.perf_counter() - inicio
+
+def expandir(argumentos: list) -> list:
+    """
+    Arquivos dos argumentos; pastas entram com todos os seus arquivos .txt
+    """
+    arquivos = []
+    for argumento in argumentos:
+        if os.path.isdir(argumento):
+            arquivos += sorted(os.path.join(argumento, nome) for nome in os.listdir(argumento) if nome.endswith('.txt'))
+        else:
+            arquivos.append(argumento)
+    return arquivos
+
+def lote(argumentos: list, processos: int = None):
+    """
+    Modo em lote: analisa vários arquivos (ou pastas) em paralelo e mostra os
+    erros de cada um, um resumo e a vazão
+    """
+    arquivos = expandir(argumentos)
+    resultados, tempo = analisarLote(arquivos, processos)
+    falhas = 0
+    tokens = 0
+    for resultado in resultados:
+        tokens += resultado.tokens
+        if resultado.erro or resultado.mensagens:
+            falhas += 1
+            print(f"{resultado.arquivo}:")
+            for mensagem in resultado.mensagens:
+                print(f"  {mensagem}")
+            if resultado.erro:
+                print(f"  {resultado.erro}")
+    processos = processos or os.cpu_count() or 1
+    print(f"{len(resultados)} arquivos, {tokens} tokens em {tempo:.3f}s com {processos} processo(s) "
+          f"em {os.cpu_count()} núcleo(s): {len(resultados) / tempo:,.1f} arquivos/s, {tokens / tempo:,.0f} tokens/s; "
+          f"{falhas} com erro")
+    if falhas:
+        sys.exit(1)
 
 def main():
     """
     Função principal do compilador
 
     sys.argv[1]: nome do arquivo de entrada de dados
+    --tac: mostra o código de três endereços gerado (também gravado em tmp/gerador/codigo.txt)
+    --executar: compila e executa o programa no mesmo processo
+    --observar: analisa o arquivo de novo, de forma incremental, a cada alteração
+    --lote: léxico e sintático de todos os arquivos (ou pastas) dados, em paralelo
+    --processos=N: quantidade de processos do modo em lote (padrão: número de núcleos)
 
     Returns:
         None
     """
-    if len(sys.argv) < 2:
+    opcoes = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+    argumentos = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not argumentos:
         print("Nome do arquivo precisa ser fornecido")
         sys.exit(1)
-    arquivo = sys.argv[1]
+    if '--lote' in opcoes:
+        processos = next((int(opcao.split('=', 1)[1]) for opcao in opcoes if opcao.startswith('--processos=')), None)
+        lote(argumentos, processos)
+        return None
+    arquivo = argumentos[0]
+    if '--observar' in opcoes:
+        observar(arquivo)
+        return None
+    if '--executar' in opcoes:
+        executar(arquivo)
+        return None
+    if '--tac' in opcoes:
+        print(compilar(arquivo).output(), end='')
+        return None
+    from modules import lexico, sintatico
     print('Arquivo de entrada: ', arquivo)
     print('Iniciando Léxico')
     lexico.input(arquivo)
-    buffer = lexico.output()
-    print('Léxico finalizado')
-    sintatico.input(buffer)
+    tokens = lexico.tokens(saida=True)
+    sintatico.input(tokens)
     sintatico.output()
+    # Completa a saída do léxico caso o sintático tenha parado antes do fim
+    for _ in tokens:
+        pass
+    print('Léxico finalizado')
     return None
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
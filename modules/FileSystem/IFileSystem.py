@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Literal
+from typing import Literal, Optional
 
 class IFileSystem(ABC):
         @abstractmethod
@@ -10,6 +10,17 @@ class IFileSystem(ABC):
                 path: caminho do arquivo.
             """
             ...    
+
+        @abstractmethod
+        def downloadBinaryFile(self, path: str) -> Optional[bytes]:
+            """
+            Realiza o download de um arquivo binário.
+            Args:
+                path: caminho do arquivo.
+            Returns:
+                O conteúdo do arquivo ou None se ele não existir.
+            """
+            ...
         
         @abstractmethod
         def uploadFile(self, path: str, fileName: str, mode: Literal['wb', 'w'], data):
@@ -21,5 +32,15 @@ class IFileSystem(ABC):
                 mode: tipo de escrita, wb (binário) ou w (string).
                 data: o dado a ser enviado para escrita.
             """
-            ...    
-        
\ No newline at end of file
+            ...
+
+        @abstractmethod
+        def openFile(self, path: str, fileName: str, mode: Literal['wb', 'w']):
+            """
+            Abre um arquivo para escrita incremental, criando o caminho se necessário.
+            Args:
+                path: caminho do arquivo.
+                fileName: nome do arquivo com a extensão do dado.
+                mode: tipo de escrita, wb (binário) ou w (string).
+            """
+            ...
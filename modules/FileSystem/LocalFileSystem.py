@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 from .IFileSystem import IFileSystem
 import os;
 
@@ -12,6 +12,13 @@ class LocalFileSystem(IFileSystem):
                 return file.read()
         except:
             print("Fail to read file or buffer.")
+
+    def downloadBinaryFile(self, path: str) -> Optional[bytes]:
+        pathWithFile = os.path.join(ROOT_PATH, path)
+        if not os.path.isfile(pathWithFile):
+            return None
+        with open(pathWithFile, 'rb') as file:
+            return file.read()
         
     def uploadFile(self, path: str, fileName: str, mode: Literal['wb', 'w'], data):
         try:      
@@ -20,4 +27,9 @@ class LocalFileSystem(IFileSystem):
             with open(os.path.join(rootWithPath, fileName), mode) as file:
                 file.write(data)
         except Exception as e:
-            print("Fail to write file or buffer.")
\ No newline at end of file
+            print("Fail to write file or buffer.")
+
+    def openFile(self, path: str, fileName: str, mode: Literal['wb', 'w']):
+        rootWithPath = os.path.join(ROOT_PATH, path)
+        os.makedirs(rootWithPath, exist_ok=True)
+        return open(os.path.join(rootWithPath, fileName), mode)
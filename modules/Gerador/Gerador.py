@@ -0,0 +1,539 @@
+import os
+import re
+import shlex
+from injector import inject
+
+from modules.FileSystem import IFileSystem
+from modules.Sintatico.asa import ASA, Visitor, node
+from .IGerador import IGerador
+from typing import Dict, List, Optional, Set, Tuple
+
+ARITHMETIC = {'+': 'ADD', '-': 'SUB', '*': 'MULT', '/': 'DIV'}
+BRANCH = {'==': 'BEQ', '!=': 'BNE', '<': 'BLT', '<=': 'BLE', '>': 'BGT', '>=': 'BGE'}
+NEGATED = {'BEQ': 'BNE', 'BNE': 'BEQ', 'BLT': 'BGE', 'BGE': 'BLT', 'BGT': 'BLE', 'BLE': 'BGT'}
+DEFAULT = {'int': '0', 'float': '0.0', 'bool': '0', 'char': '0'}
+"""
+Valor inicial de cada tipo; como o Interpretador mantém o tipo do primeiro valor
+de cada variável, a declaração também fixa o tipo (0.0 faz a variável ser float)
+"""
+RESERVED = re.compile(r'a\d+|ra')
+"""
+Nomes com significado no Interpretador (argumentos do quadro e retorno)
+"""
+STACK = '.pilha'
+TOP = '.topo'
+STACK_SIZE = 100000
+"""
+Posições da pilha em que as funções recursivas guardam locais e temporários vivos durante uma chamada
+"""
+
+def isNumber(text: str) -> bool:
+    """
+    Se o Interpretador lê o operando como número (is_number de operand.py)
+    """
+    try:
+        float(text) if '.' in text else int(text)
+    except ValueError:
+        return False
+    return True
+
+class Symbol:
+    """
+    Variável do código fonte:
+        token: nome no código de três endereços (global, nome.local ou aN)
+        type: tipo declarado (do elemento, para arrays)
+        array: se é um array
+    """
+    __slots__ = ('token', 'type', 'array')
+
+    def __init__(self, token: str, type: str, array: bool):
+        self.token = token
+        self.type = type
+        self.array = array
+
+class Gerador(IGerador, Visitor):
+    """
+    Gera código de três endereços para o Interpretador percorrendo a ASA.
+
+    O código segue o formato dos programas do Interpretador: cada função é um
+    LABEL com o seu nome e termina em RET, parâmetros são lidos de a0, a1, ...,
+    o retorno vem de ra e a execução começa no LABEL main. As declarações
+    (globais, locais e temporários, com o tipo de C) ficam antes do primeiro
+    LABEL, executadas uma vez antes de main; os arrays são criados por ALLOC.
+
+    No Interpretador toda variável escrita é global. Por isso os locais de cada
+    função recebem o prefixo nome. (os parâmetros só são copiados quando são
+    escritos) e os temporários (.tN) e rótulos (.LN) são únicos no programa, de
+    modo que uma chamada não altera os valores de quem chamou. Nas chamadas que
+    podem voltar à própria função (recursão direta ou indireta), os locais e os
+    temporários ainda em uso são guardados em .pilha antes do CALL e restaurados
+    depois. Arrays locais são alocados uma vez, como em uma variável static.
+    """
+    fs: IFileSystem
+    code: List[List[str]]
+    declarations: List[List[str]]
+    """
+    Instruções antes do primeiro LABEL, executadas uma vez antes de main
+    """
+    body: List[List[str]]
+    globals: Dict[str, Symbol]
+    scope: Dict[str, Symbol]
+    functions: Dict[str, node]
+    reaches: Dict[str, Set[str]]
+    """
+    Funções alcançáveis a partir de cada função pelo grafo de chamadas
+    """
+    types: Dict[str, str]
+    """
+    Tipo de cada variável do código gerado, pelo token
+    """
+    function: Optional[str]
+    spilled: List[str]
+    """
+    Locais escalares da função atual, guardados nas chamadas recursivas
+    """
+    pending: List[str]
+    """
+    Temporários com valores ainda não usados pela expressão atual
+    """
+    loops: List[str]
+    temps: int
+    labels: int
+    usesStack: bool
+    literals: List[Tuple[str, int]]
+    """
+    Texto e linha de cada literal, conferidos com os nomes de variáveis no fim
+    """
+
+    @inject
+    def __init__(self, fs: IFileSystem):
+        self.fs = fs
+        self.code = []
+
+    def generate(self, asa: ASA) -> List[List[str]]:
+        self.declarations = []
+        self.body = []
+        self.globals = {}
+        self.scope = {}
+        self.functions = {}
+        self.types = {}
+        self.function = None
+        self.spilled = []
+        self.pending = []
+        self.loops = []
+        self.temps = 0
+        self.labels = 0
+        self.usesStack = False
+        self.literals = []
+
+        declarations = asa.root.children
+        for declaration in declarations:
+            if declaration.kind == 'Function':
+                name = declaration.value[1]
+                if name in self.functions:
+                    self.error(f"função {name} já declarada", declaration.line)
+                self.functions[name] = declaration
+        if 'main' not in self.functions:
+            self.error("função main não declarada", asa.root.line)
+        self.reaches = self.callGraph()
+        for declaration in declarations:
+            self.visit(declaration)
+        if self.usesStack:
+            self.declarations += [['ALLOC', STACK, str(STACK_SIZE), ''], ['LD', TOP, '0']]
+        for text, line in self.literals:
+            if text in self.types or text in (STACK, TOP):
+                self.literalError(text, line)
+        self.code = self.declarations + self.body
+        return self.code
+
+    def output(self) -> str:
+        text = '\n'.join(' '.join(shlex.quote(part) for part in parts) for parts in self.code) + '\n'
+        self.fs.uploadFile(os.path.join('tmp', 'gerador'), 'codigo.txt', 'w', text)
+        return text
+
+    def error(self, message: str, line: int):
+        raise SyntaxError(f"ERRO: {message} na linha {line}")
+
+    def emit(self, *parts: str):
+        self.body.append(list(parts))
+
+    def temp(self, type: str) -> str:
+        """
+        Temporário declarado com o tipo da expressão: a divisão inteira guardada
+        nele é truncada como em C, e temporários de mesmo tipo podem dividir um
+        registrador na alocação do Interpretador (registers.py)
+        """
+        self.temps += 1
+        token = f'.t{self.temps}'
+        self.declarations.append(['LD', token, DEFAULT[type]])
+        self.types[token] = type
+        return token
+
+    def label(self) -> str:
+        self.labels += 1
+        return f'.L{self.labels}'
+
+    def into(self, value: str, dest: Optional[str]) -> str:
+        if dest is None or dest == value:
+            return value
+        self.emit('LD', dest, value)
+        return dest
+
+    def hold(self, token: str):
+        if token.startswith('.t'):
+            self.pending.append(token)
+
+    def release(self, token: str):
+        if self.pending and self.pending[-1] == token:
+            self.pending.pop()
+
+    # Declarações
+
+    def callGraph(self) -> Dict[str, Set[str]]:
+        calls = {}
+        for name, function in self.functions.items():
+            called = set()
+            stack = [function]
+            while stack:
+                current = stack.pop()
+                if current.kind == 'Call':
+                    called.add(current.value)
+                stack.extend(current.children)
+            calls[name] = called
+        reaches = {}
+        for name in calls:
+            seen = set()
+            stack = list(calls[name])
+            while stack:
+                current = stack.pop()
+                if current not in seen:
+                    seen.add(current)
+                    stack.extend(calls.get(current, ()))
+            reaches[name] = seen
+        return reaches
+
+    def declare(self, var: node, type: str, token: str, scope: Dict[str, Symbol]):
+        if var.value in scope:
+            self.error(f"variável {var.value} já declarada", var.line)
+        array = bool(var.children)
+        scope[var.value] = Symbol(token, type, array)
+        self.types[token] = type
+        if array:
+            self.declarations.append(['ALLOC', token, var.children[0].value, DEFAULT[type]])
+        else:
+            self.declarations.append(['LD', token, DEFAULT[type]])
+        return array
+
+    def visitVarDecl(self, n: node):
+        for var in n.children:
+            if self.function is None:
+                token = '.' + var.value if RESERVED.fullmatch(var.value) else var.value
+                self.declare(var, n.value, token, self.globals)
+            elif not self.declare(var, n.value, f'{self.function}.{var.value}', self.scope):
+                self.spilled.append(self.scope[var.value].token)
+
+    def visitFunction(self, n: node):
+        name = n.value[1]
+        params, locals, block = n.children
+        self.function = name
+        self.scope = {}
+        self.spilled = []
+        self.emit('LABEL', name)
+        written = self.written(block)
+        for index, param in enumerate(params.children):
+            var = param.children[0]
+            if var.value in self.scope:
+                self.error(f"parâmetro {var.value} já declarado", var.line)
+            argument = f'a{index}'
+            if var.value in written and not var.children:
+                token = f'{name}.{var.value}'
+                self.declare(var, param.value, token, self.scope)
+                self.spilled.append(token)
+                self.emit('LD', token, argument)
+            else:
+                self.scope[var.value] = Symbol(argument, param.value, bool(var.children))
+                self.types[argument] = param.value
+        for declaration in locals.children:
+            self.visit(declaration)
+        self.statement(block)
+        if not self.body[-1][0] == 'RET':
+            self.emit('RET', '0')
+        self.function = None
+
+    def written(self, block: node) -> Set[str]:
+        """
+        Nomes escritos diretamente no corpo (atribuição, READLN, ++ e --)
+        """
+        names = set()
+        stack = [block]
+        while stack:
+            current = stack.pop()
+            target = None
+            if current.kind in ('Assign', 'Readln') or (current.kind == 'Unary' and current.value in ('++', '--')):
+                target = current.children[0]
+            if target is not None and target.kind == 'Name':
+                names.add(target.value)
+            stack.extend(current.children)
+        return names
+
+    def lookup(self, n: node) -> Symbol:
+        symbol = self.scope.get(n.value) or self.globals.get(n.value)
+        if symbol is None:
+            self.error(f"variável {n.value} não declarada", n.line)
+        return symbol
+
+    # Comandos
+
+    def statement(self, n: node):
+        if n.kind == 'Call':
+            self.call(n)
+        else:
+            self.visit(n)
+
+    def visitBlock(self, n: node):
+        for child in n.children:
+            self.statement(child)
+
+    def visitIf(self, n: node):
+        condition, then, otherwise = n.children
+        orElse = self.label()
+        end = self.label()
+        self.jump(condition, orElse, False)
+        self.statement(then)
+        self.emit('J', end)
+        self.emit('LABEL', orElse)
+        self.statement(otherwise)
+        self.emit('LABEL', end)
+
+    def visitWhile(self, n: node):
+        """
+        Laço com o teste no fim (o teste também é feito uma vez antes de entrar):
+        um desvio por iteração, no formato LABEL/.../Bcc que o otimizador reconhece
+        """
+        condition, body = n.children
+        top = self.label()
+        end = self.label()
+        self.jump(condition, end, False)
+        self.emit('LABEL', top)
+        self.loops.append(end)
+        self.statement(body)
+        self.loops.pop()
+        self.jump(condition, top, True)
+        self.emit('LABEL', end)
+
+    def visitBreak(self, n: node):
+        if not self.loops:
+            self.error("break fora de um laço", n.line)
+        self.emit('J', self.loops[-1])
+
+    def visitPrint(self, n: node):
+        for child in n.children:
+            self.emit('PRINT', self.expression(child))
+
+    def visitReadln(self, n: node):
+        self.emit('READLN', self.lvalue(n.children[0]))
+
+    def visitReturn(self, n: node):
+        self.emit('RET', self.expression(n.children[0]))
+
+    # Expressões
+
+    def expression(self, n: node, dest: Optional[str] = None) -> str:
+        """
+        Gera a expressão e retorna o operando com o seu valor; com dest, o valor é escrito em dest
+        """
+        return getattr(self, 'visit' + n.kind)(n, dest)
+
+    def typeOf(self, n: node) -> str:
+        kind = n.kind
+        if kind == 'Num':
+            return 'float' if '.' in n.value else 'int'
+        if kind in ('Name', 'Index'):
+            return self.lookup(n if kind == 'Name' else n.children[0]).type
+        if kind == 'Call':
+            function = self.functions.get(n.value)
+            return function.value[0] if function is not None else 'int'
+        if kind == 'Assign':
+            return self.typeOf(n.children[0])
+        if kind == 'Unary':
+            return 'bool' if n.value == '!' else self.typeOf(n.children[0])
+        if kind == 'Binary' and (n.value in ARITHMETIC or n.value == '%'):
+            return 'float' if 'float' in (self.typeOf(n.children[0]), self.typeOf(n.children[1])) else 'int'
+        return 'char' if kind == 'Literal' else 'bool'
+
+    def visitNum(self, n: node, dest: Optional[str] = None) -> str:
+        return self.into(n.value, dest)
+
+    def visitBool(self, n: node, dest: Optional[str] = None) -> str:
+        return self.into('1' if n.value else '0', dest)
+
+    def visitLiteral(self, n: node, dest: Optional[str] = None) -> str:
+        # No código de três endereços o texto é o próprio operando: um nome de
+        # variável lida antes de escrita vale o nome. Os textos que o
+        # Interpretador leria como número, posição de array ou variável do
+        # programa (conferidos no fim de generate) não podem ser representados
+        text = n.value[1:-1]
+        if isNumber(text) or '$' in text or RESERVED.fullmatch(text):
+            self.literalError(text, n.line)
+        self.literals.append((text, n.line))
+        return self.into(text, dest)
+
+    def literalError(self, text: str, line: int):
+        self.error(f"o texto {text!r} não pode ser representado no código de três endereços", line)
+
+    def visitName(self, n: node, dest: Optional[str] = None) -> str:
+        return self.into(self.lookup(n).token, dest)
+
+    def visitIndex(self, n: node, dest: Optional[str] = None) -> str:
+        return self.into(self.element(n), dest)
+
+    def element(self, n: node) -> str:
+        base, subscript = n.children
+        if base.kind != 'Name' or not self.lookup(base).array:
+            self.error("índice aplicado a uma expressão que não é array", n.line)
+        index = self.expression(subscript)
+        if '$' in index:
+            index = self.into(index, self.temp('int'))
+        return f'{self.lookup(base).token}${index}'
+
+    def lvalue(self, n: node) -> str:
+        if n.kind == 'Index':
+            return self.element(n)
+        if n.kind != 'Name' or self.lookup(n).array:
+            self.error("atribuição a uma expressão que não é variável", n.line)
+        return self.lookup(n).token
+
+    def visitAssign(self, n: node, dest: Optional[str] = None) -> str:
+        left, right = n.children
+        target = self.lvalue(left)
+        self.hold(target.split('$')[-1])
+        self.expression(right, target)
+        self.release(target.split('$')[-1])
+        return self.into(target, dest)
+
+    def visitUnary(self, n: node, dest: Optional[str] = None) -> str:
+        operator = n.value
+        operand = n.children[0]
+        if operator == '+':
+            return self.expression(operand, dest)
+        if operator == '!':
+            return self.boolean(n, dest)
+        if operator in ('++', '--'):
+            target = self.lvalue(operand)
+            self.emit('ADD' if operator == '++' else 'SUB', target, target, '1')
+            return self.into(target, dest)
+        value = self.expression(operand)
+        result = dest or self.temp(self.typeOf(operand))
+        self.emit('SUB', result, '0', value)
+        return result
+
+    def visitBinary(self, n: node, dest: Optional[str] = None) -> str:
+        operator = n.value
+        if operator not in ARITHMETIC and operator != '%':
+            return self.boolean(n, dest)
+        left, right = n.children
+        integer = self.typeOf(n) != 'float'
+        a = self.expression(left)
+        self.hold(a)
+        b = self.expression(right)
+        self.release(a)
+        if operator == '%':
+            quotient = self.temp('int')
+            self.emit('DIV', quotient, a, b)
+            product = self.temp('int')
+            self.emit('MULT', product, quotient, b)
+            result = dest or self.temp('int')
+            self.emit('SUB', result, a, product)
+            return result
+        if operator == '/' and integer and (dest is None or self.types.get(dest.split('$')[0]) == 'float'):
+            quotient = self.temp('int')
+            self.emit('DIV', quotient, a, b)
+            return self.into(quotient, dest)
+        result = dest or self.temp(self.typeOf(n))
+        self.emit(ARITHMETIC[operator], result, a, b)
+        return result
+
+    def boolean(self, n: node, dest: Optional[str] = None) -> str:
+        """
+        Valor 1 ou 0 de uma comparação ou expressão lógica, pelos desvios de jump
+        """
+        true = self.label()
+        end = self.label()
+        self.jump(n, true, True)
+        result = dest or self.temp('bool')
+        self.emit('LD', result, '0')
+        self.emit('J', end)
+        self.emit('LABEL', true)
+        self.emit('LD', result, '1')
+        self.emit('LABEL', end)
+        return result
+
+    def jump(self, n: node, label: str, when: bool):
+        """
+        Desvia para label quando o valor lógico de n for when; senão segue em frente.
+        && e || são avaliados em curto-circuito.
+        """
+        operator = n.value
+        if n.kind == 'Binary' and operator in BRANCH:
+            left, right = n.children
+            a = self.expression(left)
+            self.hold(a)
+            b = self.expression(right)
+            self.release(a)
+            branch = BRANCH[operator]
+            self.emit(branch if when else NEGATED[branch], a, b, label)
+        elif n.kind == 'Binary' and operator in ('&&', '||'):
+            left, right = n.children
+            if (operator == '&&') == when:
+                skip = self.label()
+                self.jump(left, skip, not when)
+                self.jump(right, label, when)
+                self.emit('LABEL', skip)
+            else:
+                self.jump(left, label, when)
+                self.jump(right, label, when)
+        elif n.kind == 'Unary' and operator == '!':
+            self.jump(n.children[0], label, not when)
+        elif n.kind == 'Bool':
+            if n.value == when:
+                self.emit('J', label)
+        else:
+            value = self.expression(n)
+            self.emit('BNE' if when else 'BEQ', value, '0', label)
+
+    def visitCall(self, n: node, dest: Optional[str] = None) -> str:
+        self.call(n)
+        return self.into('ra', dest or self.temp(self.typeOf(n)))
+
+    def call(self, n: node):
+        name = n.value
+        function = self.functions.get(name)
+        if function is None:
+            self.error(f"função {name} não declarada", n.line)
+        params = function.children[0].children
+        if len(params) != len(n.children):
+            self.error(f"{name} recebe {len(params)} argumento(s), mas foram passados {len(n.children)}", n.line)
+        arguments = []
+        for param, argument in zip(params, n.children):
+            if param.children[0].children:
+                if argument.kind != 'Name' or not self.lookup(argument).array:
+                    self.error(f"o argumento de {param.children[0].value} em {name} precisa ser um array", argument.line)
+                arguments.append(self.lookup(argument).token)
+            else:
+                arguments.append(self.expression(argument))
+            self.hold(arguments[-1])
+        for argument in reversed(arguments):
+            self.release(argument)
+        saved = []
+        if self.function == name or self.function in self.reaches[name]:
+            saved = self.spilled + self.pending
+            self.usesStack = self.usesStack or bool(saved)
+        for token in saved:
+            self.emit('LD', f'{STACK}${TOP}', token)
+            self.emit('ADD', TOP, TOP, '1')
+        for argument in arguments:
+            self.emit('PARAM', argument)
+        self.emit('CALL', name, str(len(arguments)))
+        for token in reversed(saved):
+            self.emit('SUB', TOP, TOP, '1')
+            self.emit('LD', token, f'{STACK}${TOP}')
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from modules.Sintatico.asa import ASA
+
+class IGerador(ABC):
+    """
+    Interface do gerador de código de três endereços
+    """
+    @abstractmethod
+    def generate(self, asa: ASA) -> List[List[str]]:
+        """
+        Gera as instruções do Interpretador (LD, ADD, BGT, CALL, ALLOC, ...) a
+        partir da árvore sintática do Sintático, no formato de read_code: uma
+        lista de tokens por instrução.
+        """
+        ...
+
+    @abstractmethod
+    def output(self) -> str:
+        """
+        Retorna o código gerado como texto, no formato lido pelo Interpretador
+        """
+        ...
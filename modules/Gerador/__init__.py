@@ -0,0 +1,11 @@
+from injector import Module, singleton, provider
+
+from modules.FileSystem import IFileSystem
+from .Gerador import Gerador
+from .IGerador import IGerador
+
+class GeradorModule(Module):
+    @singleton
+    @provider
+    def instance_complier_gerador(self, fs: IFileSystem) -> IGerador:
+        return Gerador(fs)
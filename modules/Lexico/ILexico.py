@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
+
+from .types import LexicalToken
 
 class ILexico(ABC):
     """
@@ -11,6 +14,14 @@ class ILexico(ABC):
         """
         ...    
     
+    @abstractmethod
+    def tokens(self, saida: bool = False) -> Iterator[LexicalToken]:
+        """
+        Gera os tokens da entrada sob demanda, terminando com o token EOF.
+        Com saida=True, a saída textual também é gravada à medida que os tokens são lidos.
+        """
+        ...
+
     @abstractmethod
     def output(self) -> str:
         """
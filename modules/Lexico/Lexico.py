@@ -1,16 +1,44 @@
 
 import os
+from bisect import bisect_left
 from injector import inject
 import yaml
 
 from modules.FileSystem import IFileSystem
 from .ILexico import ILexico
-from .types import LexicoModes, Token, Identifier
-from typing import List, cast, Dict
+from .Scanner import Scanner
+from .types import LexicoModes, Token, Identifier, LexicalToken, TokenChange, KIND_IDS, WHITESPACE
+from typing import Iterator, List, Optional, cast, Dict
 
 PRIVATE_TOKENS = 'private_tokens.yml'
 IDENTIFIERS = 'identifiers.yml'
 
+def commonPrefix(first: str, second: str) -> int:
+    """
+    Tamanho do maior prefixo comum, por busca binária comparando fatias (a comparação é feita em C)
+    """
+    low, high = 0, min(len(first), len(second))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[:middle] == second[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def commonSuffix(first: str, second: str, limit: int) -> int:
+    """
+    Tamanho do maior sufixo comum, limitado a limit caracteres
+    """
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[len(first) - middle:] == second[len(second) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
 class Lexico(ILexico):
     line: int = 1
     startTokenLine: int = 1
@@ -30,6 +58,39 @@ class Lexico(ILexico):
     """
     mode: LexicoModes
     fs: IFileSystem
+    scanner: Scanner
+    """
+    Scanner compilado a partir das configurações
+    """
+    compiled: bool = True
+    """
+    Usa o scanner compilado em vez da máquina de modos caractere a caractere
+    """
+    incremental: bool = False
+    """
+    Guarda os tokens da última entrada e, na seguinte, reanalisa só o trecho alterado (ver relex)
+    """
+    tokenList: List[LexicalToken] = []
+    """
+    Tokens da última entrada no modo incremental, terminando com o token EOF
+    """
+    previousText: Optional[str] = None
+    marks: List[int] = []
+    """
+    Posições da última entrada em que o scanner começa um token sem nada pendente (ver Scanner.scan)
+    """
+    markCounts: List[int] = []
+    """
+    Quantidade de tokens gerados antes de cada posição de marks
+    """
+    errors: List[int] = []
+    """
+    Índices dos tokens de erro em tokenList
+    """
+    change: Optional[TokenChange] = None
+    """
+    Diferença entre tokenList e a lista anterior, para o Sintático reaproveitar o que não mudou
+    """
 
     @inject
     def __init__(self, fs: IFileSystem):
@@ -59,6 +120,7 @@ class Lexico(ILexico):
         print("Carregando configurações do Léxico")
         self.privateTokens = self.loadPrivateTokens()
         self.identifiers = self.loadIdentifiers()
+        self.scanner = Scanner(self.privateTokens, self.identifiers)
         print("Configurações carregadas")
 
     def setReadingMode(self):
@@ -83,6 +145,17 @@ class Lexico(ILexico):
         """
         Gera o output de acordo com os dados de entrada
         """
+        if self.compiled:
+            return self.scanner.generateOutput(self.inputDataFile)
+        return self.generateLegacyOutput()
+
+    def generateLegacyOutput(self):
+        """
+        Gera o output percorrendo a entrada caractere a caractere
+        """
+        # linha e coluna são da instância: cada entrada recomeça da linha 1
+        self.line = self.startTokenLine = 1
+        self.column = self.startTokenColumn = 0
         output = ""
         word = ""
         self.mode = LexicoModes.READING
@@ -347,7 +420,127 @@ class Lexico(ILexico):
         
     def input(self, path):
         self.inputDataFile = self.fs.downloadFile(path)
+
+    def tokens(self, saida: bool = False) -> Iterator[LexicalToken]:
+        """
+        Gera os tokens da entrada sob demanda.
+        Com saida=True, cada token também é escrito em tmp/lexico/saida.txt à
+        medida que é lido, sem montar a saída inteira em memória.
+        No modo incremental (sem saida) os tokens vêm de relex.
+        """
+        if self.incremental and not saida:
+            return iter(self.relex())
+        return self.streamTokens(saida)
+
+    def streamTokens(self, saida: bool) -> Iterator[LexicalToken]:
+        if not saida:
+            yield from self.scanner.tokens(self.inputDataFile)
+            return
+        with self.fs.openFile(os.path.join('tmp','lexico'), 'saida.txt', 'w') as file:
+            for token in self.scanner.tokens(self.inputDataFile, trivia=True):
+                file.write(self.scanner.format(token))
+                if token.kind != WHITESPACE:
+                    yield token
         
+    def relex(self) -> List[LexicalToken]:
+        """
+        Reanalisa a entrada a partir da anterior. O scanner recomeça na última
+        posição anotada antes do primeiro caractere alterado e para na primeira
+        posição anotada dentro do trecho final que não mudou que também estava
+        anotada na análise anterior (deslocada pela diferença de tamanho): dali
+        em diante os tokens são os anteriores, com a linha deslocada e, na
+        linha da emenda, a coluna corrigida. As mensagens de erro de todos os
+        tokens de erro são repetidas, na ordem do texto.
+
+        Returns:
+            A nova lista de tokens, também em self.tokenList; a diferença para
+            a anterior fica em self.change
+        """
+        text = self.inputDataFile or ''
+        old = self.previousText
+        previous = self.tokenList
+        if old == text:
+            self.change = TokenChange(previous, previous, len(previous), len(previous), len(previous), 0)
+            self.printErrors(previous, self.errors)
+            return previous
+        oldMarks = self.marks
+        oldCounts = self.markCounts
+        delta = len(text) - len(old or '')
+        if old is None:
+            first = resume = 0
+        else:
+            prefix = commonPrefix(old, text)
+            resume = len(text) - commonSuffix(old, text, min(len(old), len(text)) - prefix)
+            # o token anterior a uma posição anotada pode depender do caractere
+            # nela e de o texto terminar logo depois, então o recomeço fica pelo
+            # menos dois caracteres antes do primeiro alterado
+            first = max(bisect_left(oldMarks, prefix - 1) - 1, 0)
+        restart = oldMarks[first] if first < len(oldMarks) else 0
+        count = oldCounts[first] if first < len(oldCounts) else 0
+        tokens = previous[:count]
+        marks = oldMarks[:first]
+        markCounts = oldCounts[:first]
+        errors = [index for index in self.errors if index < count]
+        self.printErrors(tokens, errors)
+        error = KIND_IDS[self.scanner.kinds['error']]
+        fresh: List[int] = []
+        seen = 0
+        resync = None
+        for token in self.scanner.tokens(text, index=restart, fresh=fresh, report=False):
+            while seen < len(fresh):
+                position = fresh[seen]
+                seen += 1
+                if old is not None and position >= resume:
+                    index = bisect_left(oldMarks, position - delta)
+                    if index < len(oldMarks) and oldMarks[index] == position - delta:
+                        resync = position, index
+                        break
+                marks.append(position)
+                markCounts.append(len(tokens))
+            if resync is not None:
+                break
+            if token.kind == error:
+                self.printErrors([token], [0])
+                errors.append(len(tokens))
+            tokens.append(token)
+        newEnd = len(tokens)
+        if resync is None:
+            self.change = TokenChange(previous, tokens, count, len(previous), newEnd, 0)
+        else:
+            position, index = resync
+            end = oldCounts[index]
+            oldPosition = position - delta
+            lineDelta = text.count('\n', 0, position) - old.count('\n', 0, oldPosition)
+            columnDelta = (position - text.rfind('\n', 0, position)) - (oldPosition - old.rfind('\n', 0, oldPosition))
+            oldLine = old.count('\n', 0, oldPosition) + 1
+            rest = end
+            while rest < len(previous) and previous[rest].line == oldLine:
+                token = previous[rest]
+                tokens.append(LexicalToken(token.kind, token.lexeme, token.line + lineDelta, token.column + columnDelta))
+                rest += 1
+            if lineDelta:
+                tokens += [LexicalToken(token.kind, token.lexeme, token.line + lineDelta, token.column) for token in previous[rest:]]
+            else:
+                tokens += previous[rest:]
+            shift = newEnd - end
+            marks += [mark + delta for mark in oldMarks[index:]] if delta else oldMarks[index:]
+            markCounts += [mark + shift for mark in oldCounts[index:]] if shift else oldCounts[index:]
+            suffix = [position + shift for position in self.errors if position >= end]
+            self.printErrors(tokens, suffix)
+            errors += suffix
+            self.change = TokenChange(previous, tokens, count, end, newEnd, lineDelta)
+        self.previousText = text
+        self.tokenList = tokens
+        self.marks = marks
+        self.markCounts = markCounts
+        self.errors = errors
+        return tokens
+
+    def printErrors(self, tokens: List[LexicalToken], errors: List[int]):
+        for index in errors:
+            token = tokens[index]
+            print(f"Erro ao ler token \"{token.lexeme}\" na linha {token.line} e coluna {token.column}")
+
     def output(self) -> str:
         generatedOutput = self.generateOutput()
         self.fs.uploadFile(os.path.join('tmp','lexico'), 'saida.txt', 'w', generatedOutput)
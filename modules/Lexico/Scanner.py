@@ -0,0 +1,311 @@
+import re
+import string
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .types import Token, Identifier, LexicalToken, KIND_NAMES, KIND_IDS, EOF, WHITESPACE, internKind
+
+BLANK = KIND_NAMES[WHITESPACE]
+
+DIGITS = frozenset(string.digits)
+IDENTIFIER_START = frozenset(string.ascii_letters + '_')
+IDENTIFIER_CHARS = IDENTIFIER_START | DIGITS
+BLANKS = frozenset(' \n')
+
+IDENTIFIER_RUN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+DIGIT_RUN = re.compile(r'[0-9]*')
+BLANK_RUN = re.compile(r'[ \n]+')
+STRING = re.compile(r'"[^"\\]*(?:\\[\s\S][^"\\]*)*"')
+# O comentário é fechado quando a palavra lida, sem espaços e quebras de
+# linha, termina em "*/" (o "*" de abertura também conta, como em "/*/").
+COMMENT_TAIL = re.compile(r'\*(?:[ \n]*/|[\s\S]*?\*[ \n]*/)')
+
+class Scanner:
+    """
+    Scanner compilado do Léxico.
+
+    Monta, a partir de private_tokens.yml e identifiers.yml, as tabelas de
+    classes de caracteres, palavras reservadas e operadores, e percorre a
+    entrada por sequências (identificadores, números, strings, comentários e
+    espaços são consumidos por expressões regulares) em vez de caractere a
+    caractere. Produz exatamente a mesma saída que Lexico.generateLegacyOutput.
+    """
+    privateTokens: Dict[str, Token]
+    identifiers: Dict[str, Identifier]
+    templates: Dict[str, str]
+    """
+    Formato de saída de cada categoria de token
+    """
+    kinds: Dict[str, str]
+    """
+    Categoria de token de cada identificador (id -> ID, number -> NUM, ...)
+    """
+    formats: Dict[int, str]
+    """
+    Formato de saída indexado pelo identificador inteiro da categoria
+    """
+    keywords: frozenset
+    keywordLengths: List[int]
+
+    def __init__(self, privateTokens: Dict[str, Token], identifiers: Dict[str, Identifier]):
+        self.privateTokens = privateTokens
+        self.identifiers = identifiers
+        self.buildTables()
+
+    def buildTables(self):
+        """
+        Monta as tabelas usadas pelo scanner
+        """
+        self.private = frozenset(self.privateTokens)
+        self.keywords = frozenset(token for token in self.private if IDENTIFIER_RUN.fullmatch(token))
+        self.keywordLengths = sorted({len(token) for token in self.keywords})
+        self.templates = {token: value.get('output', '') for token, value in self.privateTokens.items()}
+        self.kinds = {}
+        for name, value in self.identifiers.items():
+            template = value.get('output')
+            kind = template.strip('<>').split(',')[0]
+            if kind in self.templates:
+                raise ValueError(f"Categoria {kind} de {name} conflita com um token privado")
+            self.kinds[name] = kind
+            self.templates[kind] = template
+        self.templates[BLANK] = '{VALUE}'
+        self.templates[KIND_NAMES[EOF]] = '<EOF>'
+        self.formats = {internKind(kind): template for kind, template in self.templates.items()}
+        self.privateKinds = frozenset(KIND_IDS[token] for token in self.private)
+
+    def keywordPrefix(self, word: str) -> int:
+        """
+        Retorna o tamanho da menor palavra reservada que é prefixo de word (0 se não houver).
+        """
+        for length in self.keywordLengths:
+            if length > len(word):
+                break
+            if word[:length] in self.keywords:
+                return length
+        return 0
+
+    def wordKind(self, word: str) -> str:
+        """
+        Categoria de uma palavra encerrada no modo de leitura.
+        """
+        if word in self.private:
+            return word
+        return self.kinds['id'] if word[0] in IDENTIFIER_START else self.kinds['error']
+
+    def charKind(self, word: str) -> str:
+        """
+        Categoria de um literal de caractere, com as mesmas regras de Lexico.validateCharWord.
+        """
+        size = len(word)
+        if size > 4:
+            return self.kinds['error']
+        if size == 4:
+            return self.kinds['char'] if word[1] == '\\' else self.kinds['error']
+        if size > 2 and word[1] == '\\':
+            return self.kinds['error']
+        return self.kinds['char']
+
+    def scan(self, text: str, index: int = 0, fresh: Optional[List[int]] = None) -> Iterator[Tuple[str, str, int]]:
+        """
+        Percorre o texto a partir de index e gera tuplas (categoria, lexema,
+        posição inicial). A categoria é a chave do token privado, a categoria
+        do identificador (ID, NUM, ...) ou BLANK para espaços copiados para a
+        saída. Com fresh, cada posição em que o scanner começa um token sem
+        nada pendente é anotada na lista: os tokens gerados dali em diante só
+        dependem do texto a partir dessa posição.
+        """
+        private = self.private
+        NUM, FLOAT, LITERAL, ERROR = (self.kinds[name] for name in ('number', 'float', 'string', 'error'))
+        keywordPrefix = self.keywordPrefix
+        prefixes: Dict[str, int] = {}
+        wordKind = self.wordKind
+        n = len(text)
+        word = ''
+        start = 0
+        while True:
+            if not word:
+                if index >= n:
+                    break
+                if fresh is not None:
+                    fresh.append(index)
+                char = text[index]
+                if char in BLANKS:
+                    end = BLANK_RUN.match(text, index).end()
+                    yield BLANK, text[index:end], index
+                    index = end
+                elif char in IDENTIFIER_START:
+                    end = IDENTIFIER_RUN.match(text, index).end()
+                    run = text[index:end]
+                    length = prefixes.get(run)
+                    if length is None:
+                        length = prefixes[run] = keywordPrefix(run)
+                    if length and index + length < end:
+                        yield text[index:index + length], text[index:index + length], index
+                        index += length
+                        if text[index] in DIGITS and index + 1 == n:
+                            yield ERROR, text[index], index
+                            index = n
+                    else:
+                        word = run
+                        start = index
+                        index = end
+                elif char in DIGITS:
+                    end = DIGIT_RUN.match(text, index).end()
+                    if end < n and text[end] == '.':
+                        end = DIGIT_RUN.match(text, end + 1).end()
+                        yield (ERROR if text[end - 1] == '.' else FLOAT), text[index:end], index
+                    else:
+                        yield NUM, text[index:end], index
+                    if end < n and text[end] in BLANKS:
+                        yield BLANK, text[end], end
+                    index = end
+                elif char == '"':
+                    match = STRING.match(text, index)
+                    if match:
+                        yield LITERAL, match.group(), index
+                        index = match.end()
+                    else:
+                        yield ERROR, text[index:], index
+                        index = n
+                elif char == "'":
+                    end = text.find("'", index + 1) + 1 or n
+                    yield self.charKind(text[index:end]), text[index:end], index
+                    index = end
+                elif char in private:
+                    yield char, char, index
+                    index += 1
+                else:
+                    word = char
+                    start = index
+                    index += 1
+                continue
+
+            if index >= n:
+                yield wordKind(word), word, start
+                break
+            char = text[index]
+            if char == '"' or char == "'":
+                yield wordKind(word), word, start
+                word = ''
+            elif word == '/' and char == '*':
+                match = COMMENT_TAIL.match(text, index)
+                if match:
+                    index = match.end()
+                else:
+                    yield ERROR, text[start:].replace(' ', '').replace('\n', ''), start
+                    index = n
+                word = ''
+            elif word == '!' and word + char in private:
+                yield word + char, word + char, start
+                word = ''
+                index += 1
+            elif char == '.':
+                end = DIGIT_RUN.match(text, index + 1).end()
+                yield (ERROR if end == index + 1 else FLOAT), word + text[index:end], start
+                if end < n and text[end] in BLANKS:
+                    yield BLANK, text[end], end
+                word = ''
+                index = end
+            elif char not in IDENTIFIER_CHARS:
+                if word in private:
+                    if word + char in private:
+                        word += char
+                        index += 1
+                        continue
+                    yield word, word, start
+                elif word + char in private:
+                    yield word + char, word + char, start
+                    word = ''
+                    index += 1
+                    continue
+                else:
+                    yield wordKind(word), word, start
+                if char in BLANKS:
+                    word = ''
+                else:
+                    word = char
+                    start = index
+                    index += 1
+            elif word in private:
+                yield word, word, start
+                word = ''
+                if char in DIGITS and index + 1 == n:
+                    yield ERROR, char, index
+                    index = n
+            else:
+                yield ERROR, word, start
+                word = ''
+
+    def tokens(self, text: str, trivia: bool = False, index: int = 0, fresh: Optional[List[int]] = None,
+               report: bool = True) -> Iterator[LexicalToken]:
+        """
+        Gera os tokens do texto sob demanda, com linha e coluna de início,
+        terminando com o token EOF. Com trivia=True os espaços copiados para
+        a saída também são gerados (categoria WHITESPACE). index e fresh são
+        repassados para scan; com report=False as mensagens dos tokens de erro
+        não são impressas.
+        """
+        kindIds = KIND_IDS
+        privateKinds = self.privateKinds
+        names = KIND_NAMES
+        identifier = kindIds[self.kinds['id']]
+        error = kindIds[self.kinds['error']]
+        intern = sys.intern
+        line = text.count('\n', 0, index) + 1
+        lineStart = text.rfind('\n', 0, index) + 1
+        last = index
+        for name, lexeme, start in self.scan(text, index, fresh):
+            newlines = text.count('\n', last, start)
+            if newlines:
+                line += newlines
+                lineStart = text.rfind('\n', last, start) + 1
+            last = start
+            kind = kindIds[name]
+            if kind in privateKinds:
+                lexeme = names[kind]
+            elif kind == identifier:
+                lexeme = intern(lexeme)
+            elif kind == WHITESPACE and not trivia:
+                continue
+            elif kind == error and report:
+                print(f"Erro ao ler token \"{lexeme}\" na linha {line} e coluna {start - lineStart + 1}")
+            yield LexicalToken(kind, lexeme, line, start - lineStart + 1)
+        newlines = text.count('\n', last)
+        if newlines:
+            line += newlines
+            lineStart = text.rfind('\n', last) + 1
+        yield LexicalToken(EOF, '', line, len(text) - lineStart + 1)
+
+    def format(self, token: LexicalToken) -> str:
+        """
+        Converte o token para o formato textual de saida.txt.
+        """
+        return self.formats[token.kind].replace('{VALUE}', token.lexeme)
+
+    def serialize(self, tokens: Iterable[LexicalToken]) -> Iterator[str]:
+        """
+        Converte os tokens para o formato textual de saida.txt.
+        """
+        formats = self.formats
+        for token in tokens:
+            yield formats[token.kind].replace('{VALUE}', token.lexeme)
+
+    def generateOutput(self, text: str) -> str:
+        """
+        Gera a saída textual do Léxico (o mesmo formato de saida.txt)
+        direto das categorias do scanner, sem criar os objetos de token.
+        """
+        templates = self.templates
+        error = self.kinds['error']
+        output = []
+        for kind, lexeme, start in self.scan(text):
+            if kind == error:
+                self.printError(text, lexeme, start)
+            output.append(templates[kind].replace('{VALUE}', lexeme))
+        output.append('<EOF>')
+        return ''.join(output)
+
+    def printError(self, text: str, word: str, start: int):
+        line = text.count('\n', 0, start) + 1
+        column = start - text.rfind('\n', 0, start)
+        print(f"Erro ao ler token \"{word}\" na linha {line} e coluna {column}")
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import TypedDict
+from typing import Dict, List, TypedDict
 
 class Token(TypedDict):
     output: str
@@ -13,4 +13,89 @@ class LexicoModes(Enum):
     STRING = "STRING"
     NUMBER = "NUMBER"
     FLOAT = "FLOAT"
-    CHAR = "CHAR"
\ No newline at end of file
+    CHAR = "CHAR"
+
+KIND_NAMES: List[str] = []
+"""
+Nome de cada categoria de token, indexado pelo identificador inteiro
+"""
+KIND_IDS: Dict[str, int] = {}
+"""
+Identificador inteiro de cada categoria de token
+"""
+
+def internKind(name: str) -> int:
+    """
+    Retorna o identificador inteiro da categoria, registrando-a se for nova.
+    Léxico e sintático compartilham o mesmo registro.
+    """
+    kind = KIND_IDS.get(name)
+    if kind is None:
+        kind = KIND_IDS[name] = len(KIND_NAMES)
+        KIND_NAMES.append(name)
+    return kind
+
+EOF = internKind('EOF')
+"""
+Categoria do token que encerra a entrada
+"""
+WHITESPACE = internKind('WHITESPACE')
+"""
+Categoria dos espaços e quebras de linha copiados para a saída
+"""
+
+class LexicalToken:
+    """
+    Token produzido pelo Léxico e consumido diretamente pelo Sintático.
+    """
+    __slots__ = ('kind', 'lexeme', 'line', 'column')
+    kind: int
+    """
+    Identificador da categoria (ver KIND_NAMES): token privado (int, ==, ...) ou categoria do identificador (ID, NUM, ...)
+    """
+    lexeme: str
+    line: int
+    column: int
+
+    def __init__(self, kind: int, lexeme: str, line: int, column: int):
+        self.kind = kind
+        self.lexeme = lexeme
+        self.line = line
+        self.column = column
+
+    @property
+    def name(self) -> str:
+        return KIND_NAMES[self.kind]
+
+    def __repr__(self):
+        return f"LexicalToken({self.name!r}, {self.lexeme!r}, {self.line}, {self.column})"
+
+class TokenChange:
+    """
+    Diferença entre a lista de tokens atual e a anterior no modo incremental
+    do Léxico: os tokens [start:end] da lista anterior foram trocados pelos
+    tokens [start:newEnd] da atual. Os tokens antes de start são os mesmos
+    objetos; os depois de end (newEnd na lista atual) têm o mesmo tipo e lexema,
+    com a linha deslocada em lineDelta.
+    """
+    __slots__ = ('previous', 'current', 'start', 'end', 'newEnd', 'lineDelta')
+    previous: List[LexicalToken]
+    """
+    Lista de tokens anterior, para conferir que a diferença é relativa à lista que o Sintático analisou
+    """
+    current: List[LexicalToken]
+    start: int
+    end: int
+    newEnd: int
+    lineDelta: int
+
+    def __init__(self, previous: List[LexicalToken], current: List[LexicalToken], start: int, end: int, newEnd: int, lineDelta: int):
+        self.previous = previous
+        self.current = current
+        self.start = start
+        self.end = end
+        self.newEnd = newEnd
+        self.lineDelta = lineDelta
+
+    def __repr__(self):
+        return f"TokenChange([{self.start}:{self.end}] -> [{self.start}:{self.newEnd}], {self.lineDelta:+} linhas)"
@@ -0,0 +1,160 @@
+from typing import Dict, Iterable, List, Set
+
+EPSILON = "LAMBDA"
+END = '$'
+
+class Grammar:
+    """
+    Análise de uma gramática livre de contexto: conjuntos anuláveis, first e follow.
+
+    Os conjuntos são calculados por worklist sobre um grafo de dependências
+    montado uma única vez a partir das produções: quando o conjunto de um não
+    terminal ganha símbolos, apenas esses símbolos novos são propagados para os
+    não terminais que dependem dele, em vez de repetir todas as produções até
+    nada mudar.
+
+    rules segue o formato de language.yml (não terminal -> lista de produções);
+    uma produção vazia ou [epsilon] é a produção vazia. Como no restante do
+    Sintático, first[nt] contém epsilon quando nt é anulável.
+    """
+    rules: Dict[str, List[List[str]]]
+    start: str
+    epsilon: str
+    end: str
+    nullable: Set[str]
+    first: Dict[str, Set[str]]
+    follow: Dict[str, Set[str]]
+
+    def __init__(self, rules: Dict[str, List[List[str]]], start: str = 'Program', epsilon: str = EPSILON, end: str = END):
+        self.rules = rules
+        self.start = start
+        self.epsilon = epsilon
+        self.end = end
+        self.nullable = self.computeNullable()
+        self.first = self.computeFirst()
+        self.follow = self.computeFollow()
+
+    def isTerminal(self, s: str) -> bool:
+        return s not in self.rules
+
+    def symbols(self, production: List[str]) -> List[str]:
+        """
+        Símbolos da produção, sem o epsilon
+        """
+        return [s for s in production if s != self.epsilon]
+
+    def productions(self):
+        for nt, productions in self.rules.items():
+            for production in productions:
+                yield nt, self.symbols(production)
+
+    def computeNullable(self) -> Set[str]:
+        """
+        Não terminais que derivam a cadeia vazia. Cada produção guarda quantos
+        de seus símbolos ainda não são anuláveis; quando um não terminal passa
+        a ser anulável, só as produções em que ele aparece são atualizadas.
+        """
+        nullable = set()
+        remaining = []
+        occurrences: Dict[str, List[int]] = {nt: [] for nt in self.rules}
+        heads = []
+        worklist = []
+        for nt, symbols in self.productions():
+            index = len(heads)
+            heads.append(nt)
+            remaining.append(len(symbols))
+            for s in symbols:
+                if not self.isTerminal(s):
+                    occurrences[s].append(index)
+            if not symbols and nt not in nullable:
+                nullable.add(nt)
+                worklist.append(nt)
+        while worklist:
+            s = worklist.pop()
+            for index in occurrences[s]:
+                remaining[index] -= 1
+                head = heads[index]
+                if remaining[index] == 0 and head not in nullable:
+                    nullable.add(head)
+                    worklist.append(head)
+        return nullable
+
+    def propagate(self, sets: Dict[str, Set[str]], edges: Dict[str, Set[str]]):
+        """
+        Propaga os conjuntos ao longo do grafo (sets[dst] contém sets[src] para
+        cada dst em edges[src]), enviando apenas os símbolos ainda não propagados.
+        """
+        pending = {nt: set(values) for nt, values in sets.items() if values}
+        worklist = list(pending)
+        while worklist:
+            source = worklist.pop()
+            delta = pending.pop(source)
+            for target in edges[source]:
+                added = delta - sets[target]
+                if not added:
+                    continue
+                sets[target] |= added
+                if target in pending:
+                    pending[target] |= added
+                else:
+                    pending[target] = added
+                    worklist.append(target)
+
+    def computeFirst(self) -> Dict[str, Set[str]]:
+        """
+        first[nt]: terminais que iniciam as derivações de nt (mais epsilon se nt for anulável).
+        Aresta Y -> X quando X -> a Y b com a anulável, pois first(X) contém first(Y).
+        """
+        first = {nt: set() for nt in self.rules}
+        edges = {nt: set() for nt in self.rules}
+        for nt, symbols in self.productions():
+            for s in symbols:
+                if self.isTerminal(s):
+                    first[nt].add(s)
+                    break
+                edges[s].add(nt)
+                if s not in self.nullable:
+                    break
+        self.propagate(first, edges)
+        for nt in self.nullable:
+            first[nt].add(self.epsilon)
+        return first
+
+    def firstOfSequence(self, symbols: Iterable[str]) -> Set[str]:
+        """
+        Conjunto first de uma sequência de símbolos (contém epsilon se toda a sequência é anulável)
+        """
+        result = set()
+        for s in symbols:
+            if s == self.epsilon:
+                continue
+            if self.isTerminal(s):
+                result.add(s)
+                return result
+            result.update(self.first[s])
+            result.discard(self.epsilon)
+            if s not in self.nullable:
+                return result
+        result.add(self.epsilon)
+        return result
+
+    def computeFollow(self) -> Dict[str, Set[str]]:
+        """
+        follow[nt]: terminais que podem aparecer logo após nt ($ após o símbolo inicial).
+        Para X -> a B b, follow(B) recebe first(b) e, se b for anulável, aresta X -> B.
+        """
+        follow = {nt: set() for nt in self.rules}
+        edges = {nt: set() for nt in self.rules}
+        follow[self.start].add(self.end)
+        for nt, symbols in self.productions():
+            for index, s in enumerate(symbols):
+                if self.isTerminal(s):
+                    continue
+                rest = self.firstOfSequence(symbols[index + 1:])
+                if self.epsilon in rest:
+                    rest.discard(self.epsilon)
+                    if nt != s:
+                        edges[nt].add(s)
+                follow[s] |= rest
+        self.propagate(follow, edges)
+        return follow
@@ -1,13 +1,17 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+from modules.Lexico.types import LexicalToken, TokenChange
 
 class ISintatico(ABC):
     """
     Interface do código Sintático
     """
     @abstractmethod
-    def input(self, buffer: str):
+    def input(self, tokens: Iterable[LexicalToken], change: Optional[TokenChange] = None):
         """
-        Recebe o buffer dos dados de entrada.
+        Recebe o fluxo de tokens do léxico, consumido sob demanda durante a análise.
+        change é a diferença para a entrada anterior, dada pelo léxico no modo incremental.
         """
         ...    
     
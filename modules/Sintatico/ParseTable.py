@@ -0,0 +1,65 @@
+from typing import Dict, List, Set, Tuple
+
+from .Grammar import Grammar
+
+class ParseTable:
+    """
+    Tabela LL(1) gerada a partir da gramática (language.yml) e dos seus conjuntos first e follow.
+
+    table[nt][terminal] é o índice da produção de nt escolhida quando o lookahead
+    é terminal. Quando mais de uma produção disputa a mesma célula a gramática
+    não é LL(1): o conflito é registrado em conflicts e a célula fica com a
+    primeira produção listada na gramática, a mesma ordem de tentativa da
+    descida recursiva com retrocesso.
+    """
+    analysis: Grammar
+    grammar: Dict[str, List[List[str]]]
+    first: Dict[str, Set[str]]
+    follow: Dict[str, Set[str]]
+    table: Dict[str, Dict[str, int]]
+    conflicts: List[Tuple[str, str, List[int]]]
+    """
+    Células com mais de uma produção: (não terminal, terminal, índices das produções)
+    """
+
+    def __init__(self, analysis: Grammar):
+        self.analysis = analysis
+        self.grammar = analysis.rules
+        self.first = analysis.first
+        self.follow = analysis.follow
+        self.build()
+
+    def build(self):
+        """
+        Preenche a tabela: cada produção entra nas células de first(produção)
+        e, se for anulável, também nas de follow(nt).
+        """
+        self.table = {}
+        self.conflicts = []
+        epsilon = self.analysis.epsilon
+        cells: Dict[Tuple[str, str], List[int]] = {}
+        for nt, productions in self.grammar.items():
+            row = self.table[nt] = {}
+            for index, production in enumerate(productions):
+                lookaheads = self.analysis.firstOfSequence(production)
+                if epsilon in lookaheads:
+                    lookaheads = (lookaheads - {epsilon}) | self.follow[nt]
+                for terminal in sorted(lookaheads):
+                    candidates = cells.setdefault((nt, terminal), [])
+                    candidates.append(index)
+                    if len(candidates) == 1:
+                        row[terminal] = index
+        for (nt, terminal), candidates in cells.items():
+            if len(candidates) > 1:
+                self.conflicts.append((nt, terminal, candidates))
+
+    def production(self, nt: str, index: int) -> List[str]:
+        """
+        Símbolos da produção, sem o epsilon
+        """
+        return self.analysis.symbols(self.grammar[nt][index])
+
+    def describeConflict(self, conflict: Tuple[str, str, List[int]]) -> str:
+        nt, terminal, candidates = conflict
+        options = ' | '.join(' '.join(self.grammar[nt][index]) for index in candidates)
+        return f"Conflito LL(1) em {nt} com '{terminal}': {options} (usando {' '.join(self.grammar[nt][candidates[0]])})"
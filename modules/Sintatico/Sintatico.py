@@ -1,37 +1,115 @@
+import hashlib
 import os
+import pickle
+from bisect import bisect_left, bisect_right
 from injector import inject
 import yaml
 
 from modules.FileSystem import IFileSystem
+from modules.Lexico.types import LexicalToken, TokenChange, KIND_NAMES, EOF, internKind
 from .ISintatico import ISintatico
+from .Grammar import Grammar, EPSILON, END
+from .ParseTable import ParseTable
+from .asa import ASA, ASABuilder, ExpressionChecker, node, shiftLines
 from .types import LexicoModes, Token, Identifier
-from typing import List, cast, Dict
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union, cast, Dict
 
 LANGUAGE = 'language.yml'
 TOKENS_FILE = 'private_tokens.yml'
-EPSILON = "LAMBDA"
+CACHE_PATH = os.path.join('tmp', 'sintatico')
+CACHE_FILE = 'gramatica.pickle'
+CACHE_VERSION = 2
+"""
+Versão do formato do cache; deve ser incrementada quando o cálculo dos conjuntos ou da tabela mudar
+"""
 
 class Sintatico(ISintatico):
     language: Dict[str, List[List [str]]]
     index: int
     currentToken: str
-    buffer: str
+    tokens: Iterator[LexicalToken]
+    """
+    Fluxo de tokens do léxico, consumido sob demanda
+    """
+    word: List[LexicalToken]
+    """
+    Tokens já lidos do fluxo (mantidos para o retrocesso das regras opcionais)
+    """
+    lookahead: LexicalToken
     fs: IFileSystem
-    dict: Token
-    languageStack: List[str]
+    privateKinds: set
+    firstKinds: Dict[str, set]
+    """
+    Conjuntos first com as categorias já convertidas para os identificadores inteiros
+    """
+    languageStack: List[Union[str, LexicalToken]]
     errorMessage: str
+    parseTable: ParseTable
+    predictions: Dict[str, Dict[int, tuple]]
+    """
+    Tabela LL(1) indexada pelo identificador inteiro do lookahead, com as
+    produções já invertidas para serem empilhadas
+    """
+    builder: ASABuilder
+    reductions: List[Tuple[Callable, int]]
+    """
+    Ações semânticas referenciadas pelos marcadores de asaPredictions: (ação, índice da produção)
+    """
+    actionNonterminals: frozenset
+    """
+    Não terminais com ação no ASABuilder; os demais são transparentes e deixam os valores dos filhos para o pai
+    """
+    checkedKinds: frozenset
+    """
+    Identificadores dos tokens de ExpressionChecker.TOKENS, conferidos na análise sem ASA
+    """
+    asaPredictions: Dict[str, Dict[int, tuple]]
+    asa: Optional[ASA] = None
+    """
+    Árvore sintática abstrata da última análise preditiva
+    """
+    buildAsa: bool = True
+    """
+    Monta a árvore sintática abstrata durante a análise preditiva
+    """
+    useCache: bool = True
+    """
+    Reaproveita first, follow e a tabela LL(1) salvos em tmp/sintatico enquanto as configurações não mudarem
+    """
+    predictive: bool = True
+    """
+    Usa o analisador preditivo dirigido pela tabela LL(1); False usa a descida recursiva com retrocesso
+    """
+    incremental: bool = False
+    """
+    Reaproveita as declarações globais da análise anterior que não foram alteradas (ver parseIncremental)
+    """
+    change: Optional[TokenChange] = None
+    """
+    Diferença entre os tokens recebidos e os da entrada anterior, dada pelo léxico incremental
+    """
+    parsedTokens: Optional[List[LexicalToken]] = None
+    """
+    Tokens da última análise incremental bem-sucedida
+    """
+    bounds: List[int] = []
+    """
+    Fim (índice em parsedTokens, exclusivo) de cada trecho de declarações globais: variáveis seguidas de uma função
+    """
+    declarations: List[List[node]] = []
+    """
+    Nós da ASA de cada trecho de bounds
+    """
 
     @inject
     def __init__(self, fs: IFileSystem):
         self.fs = fs
         self.startConfig()
 
-    def loadLanguage(self) -> Token:
+    def loadLanguage(self, file: str) -> Dict[str, List[List [str]]]:
         """
-        Carrega as configurações dos tokens privados
+        Carrega as regras da gramática
         """
-        print("Carregando linguagem do sintático")
-        file = self.fs.downloadFile(os.path.join('config', 'sintatico', LANGUAGE))
         data = yaml.safe_load(file)
         return cast(Dict[str, List[List [str]]], data)
     
@@ -41,190 +119,366 @@ class Sintatico(ISintatico):
         """
         self.errorMessage = ""
         self.languageStack = []
-        self.language = self.loadLanguage()
+        print("Carregando linguagem do sintático")
+        languageFile = self.fs.downloadFile(os.path.join('config', 'sintatico', LANGUAGE))
+        tokensFile = self.fs.downloadFile(os.path.join('config', 'lexico', TOKENS_FILE))
+        key = self.grammarHash(languageFile, tokensFile)
+        cached = self.loadCache(key) if self.useCache else None
+        if cached is not None:
+            print("Gramática carregada do cache")
+            self.language, tokens, self.parseTable = cached
+        else:
+            self.language = self.loadLanguage(languageFile)
+            tokens = self.loadTokens(tokensFile)
+            self.parseTable = ParseTable(Grammar(self.language, 'Program', EPSILON, END))
+            if self.useCache:
+                self.saveCache(key, (self.language, tokens, self.parseTable))
 
         for k,v in self.language.items():
             print(f"{k}: {v}")
 
-        #self.dict = tokens
-        tokens = self.loadTokens()
-        self.dict = {}
-        for key in tokens:
-            value = tokens.get(key).get('output')
-            self.dict.update({value: key})
-        self.dict.update({'$':'$'})
-        self.first = self.computeFirst(self.language)
+        self.privateKinds = {internKind(token) for token in tokens}
+        self.end = LexicalToken(internKind('$'), '$', 0, 0)
+        self.first = self.parseTable.first
+        self.firstKinds = {nt: {internKind(s) for s in first} for nt, first in self.first.items()}
         self.printDict(self.first)
-        self.follow = self.computeFollow(self.language,self.first)
+        self.follow = self.parseTable.follow
         self.printDict(self.follow)
-        self.word = ''
+        for conflict in self.parseTable.conflicts:
+            print(self.parseTable.describeConflict(conflict))
+        self.predictions = self.buildPredictions(self.parseTable)
+        self.builder = ASABuilder()
+        self.reductions = []
+        self.asaPredictions = self.buildPredictions(self.parseTable, actions=True)
+        self.actionNonterminals = frozenset(nt for nt in self.language if hasattr(self.builder, nt))
+        self.checkedKinds = frozenset(internKind(name) for name in ExpressionChecker.TOKENS)
+        self.word = []
 
         print("Configurações do sintático carregadas")
 
-    def loadTokens(self):
+    def loadTokens(self, file: str) -> List[str]:
+        """
+        Carrega os tokens privados do léxico
+        """
         print("Carregando tokens do léxico para o sintático")
-        file = self.fs.downloadFile(os.path.join('config', 'lexico', TOKENS_FILE))
         data = yaml.safe_load(file)
-        return cast(List[Token], data)
+        return list(cast(Dict[str, Token], data))
+
+    def grammarHash(self, *files: str) -> str:
+        """
+        Chave do cache: hash do conteúdo dos arquivos de configuração e da versão do formato
+        """
+        digest = hashlib.sha256(str(CACHE_VERSION).encode())
+        for file in files:
+            digest.update(b'\0')
+            digest.update((file or '').encode('utf-8'))
+        return digest.hexdigest()
+
+    def loadCache(self, key: str):
+        """
+        Retorna (linguagem, tokens privados, tabela LL(1)) do cache, ou None se
+        o cache não existir ou tiver sido gerado para outra gramática.
+        """
+        data = self.fs.downloadBinaryFile(os.path.join(CACHE_PATH, CACHE_FILE))
+        if data is None:
+            return None
+        try:
+            cachedKey, artifacts = pickle.loads(data)
+        except Exception:
+            return None
+        if cachedKey != key:
+            return None
+        return artifacts
+
+    def saveCache(self, key: str, artifacts):
+        self.fs.uploadFile(CACHE_PATH, CACHE_FILE, 'wb', pickle.dumps((key, artifacts), pickle.HIGHEST_PROTOCOL))
 
     def printDict(self,dict):
         for k,v in dict.items():
             print(f'{k}:{v}')
 
-    def isTerminal(self,s,grammar):
-        return s not in grammar
-    
-    def computeFirst(self,grammar):
-        first = {nt: set() for nt in grammar}
-
-        aux = True
-        while aux:
-            aux = False
-            for nt, productions in grammar.items():
-                for prod in productions:
-                    if prod == [EPSILON]:
-                        if EPSILON not in first[nt]:
-                            first[nt].add(EPSILON)
-                            aux = True
-                        continue
-                    for s in prod:
-                        if self.isTerminal(s,grammar):
-                            if s not in first[nt]:
-                                first[nt].add(s)
-                                aux = True
-                            break
-                        before = len(first[nt])
-                        first[nt].update(first[s]-{EPSILON})
-                        after = len(first[nt])
-                        if after > before:
-                            aux = True
+    def kindOf(self, terminal: str) -> int:
+        """
+        Identificador inteiro de um terminal da gramática ($ é o token EOF do léxico)
+        """
+        return EOF if terminal == END else internKind(terminal)
 
-                        if EPSILON not in first[s]:
-                            break
-        return first
-
-    def computeFollow(self,grammar,first):
-        initial = 'Program'
-        follow = {nt: set() for nt in grammar}
-        follow[initial] = {'$'}
-        aux = True
-        while aux:
-            aux = False
-            vis = set()
-            fila = [initial]
-            while len(fila):
-                nt = fila.pop(0)
-                for prod in grammar[nt]:
-                    for idx in range(len(prod)):
-                        s = prod[idx]
-                        if not self.isTerminal(s,grammar):
-                            if s not in vis:
-                                vis.add(s)
-                                fila.append(s)
-                            next = idx+1
-                            while -1 < next < len(prod):
-                                if self.isTerminal(prod[next],grammar) and prod[next] != EPSILON:
-                                    before = len(follow[s])
-                                    follow[s].add(prod[next])
-                                    if len(follow[s]) != before:
-                                        aux = True
-                                    next = -1
-                                else:
-                                    if prod[next] != EPSILON:
-                                        before = len(follow[s])
-                                        follow[s].update(first[prod[next]]-{EPSILON})
-                                        if len(follow[s]) != before:
-                                            aux = True
-                                    if prod[next] == EPSILON or EPSILON in first[prod[next]]:
-                                        next+=1
-                                    else:
-                                        next=-1
-                            if next >= len(prod):
-                                before = len(follow[s])
-                                follow[s].update(follow[nt])
-                                if len(follow[s]) != before:
-                                    aux = True
-        return follow 
-
-    def processInput(self):
-        lexico = self.buffer
-        tokenlist: list[str] = []
-
-        id = 0
-        while True:
-            while id < len(lexico) and lexico[id] != '<':
-                id+=1
-            if id >= len(lexico):
-                break
-            
-            token = lexico[id]
-            charstr = False
-            while True:
-                id+=1
-                token += lexico[id]
-                if lexico[id] == '>' and not charstr:
+    def buildPredictions(self, parseTable: ParseTable, actions: bool = False) -> Dict[str, Dict[int, tuple]]:
+        """
+        Converte a tabela LL(1) para o formato usado por parsePredictive: os terminais
+        viram identificadores inteiros e cada produção é guardada invertida.
+        Com actions=True cada produção de um não terminal com ação no ASABuilder
+        começa com um marcador (inteiro negativo ~i, índice em self.reductions) que é
+        desempilhado depois de todos os símbolos da produção e executa a ação.
+        """
+        predictions = {}
+        markers = {}
+        for nt, row in parseTable.table.items():
+            predictions[nt] = {}
+            action = getattr(self.builder, nt, None) if actions else None
+            for terminal, index in row.items():
+                production = parseTable.production(nt, index)
+                symbols = tuple(s if s in parseTable.grammar else self.kindOf(s) for s in reversed(production))
+                if action is not None:
+                    marker = markers.get((nt, index))
+                    if marker is None:
+                        marker = markers[(nt, index)] = ~len(self.reductions)
+                        self.reductions.append((action, index))
+                    symbols = (marker,) + symbols
+                predictions[nt][self.kindOf(terminal)] = symbols
+        return predictions
+
+    def parse(self):
+        self.languageStack = []
+        self.errorMessage = ""
+        if self.predictive and self.incremental and self.buildAsa:
+            return self.parseIncremental()
+        if self.predictive:
+            return self.parsePredictive()
+        return self.parseBacktracking()
+
+    def parsePredictive(self):
+        """
+        Analisador preditivo LL(1) com pilha explícita, sem recursão e sem retrocesso.
+        Não terminais são empilhados pelo nome e terminais pelo identificador inteiro.
+        Com buildAsa, os valores dos símbolos reconhecidos ficam numa segunda pilha e
+        cada produção completa é reduzida pela ação do ASABuilder, montando self.asa.
+        heights guarda a altura da pilha de valores na expansão de cada não terminal
+        com ação, delimitando os valores que a ação recebe. Sem buildAsa, as
+        expressões são conferidas por um ExpressionChecker, que recusa os mesmos
+        programas que o ASABuilder.
+        """
+        building = self.buildAsa
+        predictions = self.asaPredictions if building else self.predictions
+        reductions = self.reductions
+        actionNonterminals = self.actionNonterminals if building else frozenset()
+        checker = None if building else ExpressionChecker()
+        checkedNonterminals = ExpressionChecker.NONTERMINALS if checker is not None else frozenset()
+        checkedKinds = self.checkedKinds if checker is not None else frozenset()
+        heights: List[int] = []
+        languageStack = self.languageStack
+        tokens = self.tokens
+        end = self.end
+        values: list = []
+        self.resp = False
+        self.asa = None
+
+        token = next(tokens, end)
+        stack: List[Union[str, int]] = [EOF, 'Program']
+        while stack:
+            top = stack.pop()
+            row = predictions.get(top)
+            if row is not None:
+                production = row.get(token.kind)
+                if production is None:
+                    self.lookahead = token
+                    expected = ','.join(self.expected(top, stack, predictions))
+                    self.errorMessage = f"ERRO: tokens esperados: {expected}. Foi encontrado {token.name}"
+                    raise SyntaxError(self.errorMessage)
+                languageStack.append(top)
+                stack.extend(production)
+                if top in actionNonterminals:
+                    heights.append(len(values))
+                elif top in checkedNonterminals:
+                    self.check(checker.expand, top, token)
+            elif top < 0:
+                action, index = reductions[~top]
+                start = heights.pop()
+                children = values[start:]
+                del values[start:]
+                try:
+                    values.append(action(index, children))
+                except SyntaxError as error:
+                    self.lookahead = token
+                    self.errorMessage = str(error)
+                    raise
+            elif token.kind == top:
+                if top == EOF:
                     break
-                if (lexico[id] == '\'' or lexico[id] == '\"') and lexico[id-1] != '\\':
-                    charstr = not charstr
+                languageStack.append(token)
+                if building:
+                    values.append(token)
+                elif top in checkedKinds:
+                    self.check(checker.match, token)
+                token = next(tokens, end)
+            elif top == EOF:
+                self.lookahead = token
+                self.errorMessage = "EOF não encontrado"
+                raise SyntaxError(self.errorMessage)
+            else:
+                self.lookahead = token
+                self.errorMessage = f"ERRO: tokens esperados: {KIND_NAMES[top]}. Foi encontrado {token.name}"
+                raise SyntaxError(self.errorMessage)
+        self.lookahead = token
+        if building:
+            self.asa = self.builder.finish(values[0])
+        self.resp = True
+        return self.resp
 
-            tokenlist.append(token)
-        return tokenlist
+    def expected(self, top: str, stack: List[Union[str, int]], predictions: Dict[str, Dict[int, tuple]]) -> List[str]:
+        """
+        Tokens aceitos no lugar do token encontrado: FIRST do não terminal do
+        topo e, enquanto os símbolos podem ser vazios, dos que estão abaixo dele
+        na pilha, e não as entradas de FOLLOW da linha da tabela, que valem para
+        qualquer contexto do não terminal
+        """
+        names: List[str] = []
+        for symbol in [top] + stack[::-1]:
+            if isinstance(symbol, str):
+                first = self.first[symbol]
+                names.extend(KIND_NAMES[kind] for kind in predictions[symbol] if KIND_NAMES[kind] in first)
+                if EPSILON not in first:
+                    break
+            elif symbol >= 0:
+                names.append(KIND_NAMES[symbol])
+                break
+        return list(dict.fromkeys(names))
 
+    def check(self, step: Callable, *args):
+        try:
+            step(*args)
+        except SyntaxError as error:
+            self.lookahead = args[-1]
+            self.errorMessage = str(error)
+            raise
 
-    def parse(self):
-        self.word = self.processInput()
-        self.word.append('$')
+    def parseIncremental(self):
+        """
+        Análise preditiva que reaproveita a anterior. O programa é dividido em
+        trechos que terminam na chave que fecha cada função (variáveis globais
+        seguidas de uma função), e cada trecho é um Program válido sozinho. Os
+        trechos antes da alteração indicada por self.change são mantidos; a
+        partir do primeiro trecho alterado as chaves são contadas até um fim de
+        trecho, depois da alteração, que também era fim de trecho na análise
+        anterior. Só os tokens entre os dois são analisados, e os trechos
+        seguintes são reaproveitados com as linhas deslocadas (shiftLines).
+        Se a análise parcial falhar, o programa inteiro é analisado de novo
+        para que a mensagem de erro seja a mesma da análise completa.
+        languageStack guarda só o trecho analisado.
+        """
+        change = self.change
+        tokens = change.current if change is not None else list(self.tokens)
+        reuse = change is not None and change.previous is self.parsedTokens
+        self.parsedTokens = None
+        try:
+            self.reparse(tokens, change if reuse else None)
+        except SyntaxError:
+            if not reuse:
+                raise
+            self.languageStack = []
+            self.reparse(tokens, None)
+        return self.resp
 
+    def reparse(self, tokens: List[LexicalToken], change: Optional[TokenChange]):
+        """
+        Analisa os trechos alterados de tokens (todos, sem change) e monta self.asa
+        """
+        bounds = self.bounds if change is not None else []
+        declarations = self.declarations if change is not None else []
+        first = bisect_right(bounds, change.start) if change is not None else 0
+        regionStart = bounds[first - 1] if first else 0
+        shift = change.newEnd - change.end if change is not None else 0
+        opening, closing = internKind('{'), internKind('}')
+        newBounds = []
+        resync = len(bounds)
+        depth = 0
+        for index in range(regionStart, len(tokens) - 1):
+            kind = tokens[index].kind
+            if kind == opening:
+                depth += 1
+            elif kind == closing:
+                depth -= 1
+                if depth == 0:
+                    newBounds.append(index + 1)
+                    if change is not None and index + 1 >= change.newEnd:
+                        old = bisect_left(bounds, index + 1 - shift)
+                        if old < len(bounds) and bounds[old] == index + 1 - shift:
+                            resync = old + 1
+                            break
+        regionEnd = newBounds[-1] if resync < len(bounds) else len(tokens) - 1
+        parsed: List[List[node]] = []
+        if regionStart < regionEnd or not first and resync == len(bounds):
+            end = tokens[regionEnd]
+            self.tokens = iter(tokens[regionStart:regionEnd] + [LexicalToken(EOF, '', end.line, end.column)])
+            self.parsePredictive()
+            segment: List[node] = []
+            for child in self.asa.root.children:
+                segment.append(child)
+                if child.kind == 'Function':
+                    parsed.append(segment)
+                    segment = []
+            if segment or len(parsed) != len(newBounds):
+                raise SyntaxError("ERRO: declarações globais fora de um trecho")
+        delta = change.lineDelta if change is not None else 0
+        rest = [[shiftLines(n, delta) for n in segment] for segment in declarations[resync:]] if delta else declarations[resync:]
+        self.bounds = bounds[:first] + newBounds + [bound + shift for bound in bounds[resync:]]
+        self.declarations = declarations[:first] + parsed + rest
+        self.asa = self.builder.finish([n for segment in reversed(self.declarations) for n in reversed(segment)])
+        self.lookahead = tokens[-1]
+        self.resp = True
+        self.parsedTokens = tokens
+
+    def parseBacktracking(self):
+        """
+        Descida recursiva original, com as regras opcionais tentadas por retrocesso (lambdaWrapper).
+        Cada comando e cada nível de aninhamento consomem quadros da pilha do Python,
+        então programas longos esbarram no limite de recursão.
+        """
+        self.word = []
         self.idx = 0
-        self.lookahead = self.convert(self.word[0])
+        self.lookahead = self.tokenAt(0)
         self.resp = False
 
-        self.Program()
+        try:
+            self.Program()
+        except RecursionError:
+            self.errorMessage = "ERRO: limite de recursão atingido na descida recursiva; use o analisador preditivo"
+            raise
 
-        if self.lookahead != '<EOF>':
-            elf.errorMessage = "EOF não encontrado"
+        if self.lookahead.kind != EOF:
+            self.errorMessage = "EOF não encontrado"
             raise SyntaxError("EOF não encontrado")
         return self.resp
 
-    def convert(self, symbol):
-        if symbol in self.dict:
-            return self.dict.get(symbol)
-        return symbol
+    def tokenAt(self, idx: int) -> LexicalToken:
+        """
+        Retorna o token na posição idx, lendo do fluxo do léxico apenas o necessário.
+        Depois do fim do fluxo retorna o token $.
+        """
+        while len(self.word) <= idx:
+            self.word.append(next(self.tokens, self.end))
+        return self.word[idx]
+
+    def convert(self, token: LexicalToken) -> str:
+        """
+        Representação textual do token, no formato da saída do léxico (<ID,main>) ou o próprio token privado.
+        """
+        if token.kind in self.privateKinds or token.kind == self.end.kind:
+            return token.name
+        if token.kind == EOF:
+            return '<EOF>'
+        return f'<{token.name},{token.lexeme}>'
 
     def match(self, tokens: set):
         lookaheadToken = self.getLookAheadToken()
-        if lookaheadToken in list(tokens):            
-            self.languageStack.append(f"Match: {self.lookahead}")
+        if lookaheadToken in tokens:
+            self.languageStack.append(self.lookahead)
             self.idx+=1 # avança o índice de leitura
-            self.lookahead = self.convert(self.word[self.idx])
+            self.lookahead = self.tokenAt(self.idx)
         else:
             self.errorMessage = f"ERRO: tokens esperados: {','.join(list(tokens))}. Foi encontrado {lookaheadToken}"
             raise SyntaxError(f"ERRO: tokens esperados: {','.join(list(tokens))}. Foi encontrado {lookaheadToken}")
 
-    def getLookAheadToken(self):
-        if ',' in self.lookahead:
-            # Caso em que é um token interno Precisamos realizar o split do token
-            #<ID,main> precisamos extrair o ID
-            index = 1
-            current = self.lookahead[index] # vamos pular o <
-            token = ""
-            while current != ',':
-                token+=current
-                index+=1
-                current=self.lookahead[index]
-            return token
-        else:
-            return self.lookahead          
-    
+    def getLookAheadToken(self) -> str:
+        return KIND_NAMES[self.lookahead.kind]
+
     def computeMatch(self, type: str):
         self.languageStack.append(type)
         currentSet = self.first.get(type, set())
         self.match(currentSet)
 
     def tryComputeMatch(self, type: str):
-        currentSet = self.first.get(type, set())
-        lookaheadToken = self.getLookAheadToken()
-        return lookaheadToken in list(currentSet)
+        return self.lookahead.kind in self.firstKinds.get(type, ())
 
     def Program(self):
         self.languageStack.append(self.Program.__name__)
@@ -240,7 +494,7 @@ class Sintatico(ISintatico):
 
     def Program2(self):
         self.languageStack.append(self.Program2.__name__)
-        if self.lookahead == '(':
+        if self.getLookAheadToken() == '(':
             self.FunctionDecl()
         else:
             self.IdList()
@@ -276,9 +530,11 @@ class Sintatico(ISintatico):
         try:
             func = getattr(self, functionName)
             func()
+        except RecursionError:
+            raise
         except:
             self.idx = currentIndex
-            self.lookahead = self.convert(self.word[self.idx])
+            self.lookahead = self.tokenAt(self.idx)
             self.languageStack.pop()
 
     def VarDecl(self):
@@ -299,7 +555,7 @@ class Sintatico(ISintatico):
 
     def Stmt(self):
         self.languageStack.append(self.Stmt.__name__)
-        match self.lookahead:
+        match self.getLookAheadToken():
             case 'if':
                 self.match({'if'})
                 self.match({'('})
@@ -369,7 +625,7 @@ class Sintatico(ISintatico):
             case 'false':
                 self.match({'false'})
             case _:
-                self.errorMessage = f"ERRO: unexpected token {self.lookahead}"
+                self.errorMessage = f"ERRO: unexpected token {self.convert(self.lookahead)}"
                 raise SyntaxError(self.errorMessage)
 
     def Ident(self):
@@ -386,7 +642,7 @@ class Sintatico(ISintatico):
         self.lambdaWrapper('_AltExpr')
 
     def _AltExpr(self):
-        if self.lookahead == '[':
+        if self.getLookAheadToken() == '[':
             self.match({'['})
             self.Expr()
             self.match({']'})
@@ -403,7 +659,7 @@ class Sintatico(ISintatico):
 
     def CmplExpr(self):
         self.languageStack.append(self.CmplExpr.__name__)
-        if self.lookahead == '=':
+        if self.getLookAheadToken() == '=':
             self.match({'='})
             self.Expr()
         else:
@@ -575,11 +831,9 @@ class Sintatico(ISintatico):
         self.Array()
         self.FormalRest()        
 
-    def generateOutput(self):
-        return self.buffer
-
-    def input(self, buffer):
-        self.buffer = buffer
+    def input(self, tokens: Iterable[LexicalToken], change: Optional[TokenChange] = None):
+        self.tokens = iter(tokens)
+        self.change = change
         
     def output(self) -> str:
         hasError = False
@@ -589,8 +843,8 @@ class Sintatico(ISintatico):
             hasError = True       
         finally:
             for token in self.languageStack:
-                if token.startswith('Match:'):
-                    print(token)
+                if isinstance(token, LexicalToken):
+                    print(f"Match: {self.convert(token)}")
             
         if hasError:
             print(f"{self.errorMessage}")            
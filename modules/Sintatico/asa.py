@@ -1,31 +1,528 @@
-class node:
-    def __init__(self,token,level=0):
-        self.token = token
-        self.level = level
-        self.fields = {}
+from typing import Iterator, List, Optional, Tuple
+
+from modules.Lexico.types import LexicalToken
 
-    def add_children(self,field,tokens):
-        if field not in self.fields:
-            self.fields[field] = []
+PRECEDENCE = {
+    '=': 1,
+    '||': 2,
+    '&&': 3,
+    '==': 4, '!=': 4,
+    '<': 5, '>': 5, '<=': 5, '>=': 5,
+    '+': 6, '-': 6,
+    '*': 7, '/': 7, '%': 7,
+}
+"""
+Precedência dos operadores binários (maior liga mais forte); '=' associa à direita
+"""
+UNARY = frozenset(('!', '-', '+', '++', '--'))
+"""
+Operadores aceitos na posição de operando (prefixos)
+"""
+LVALUES = frozenset(('Name', 'Index'))
+
+class node:
+    """
+    Nó da árvore sintática abstrata.
 
-        for t in tokens:
-            self.fields[field].append(node(t,self.level+1))
+    Usa __slots__ para não carregar um dict por nó:
+        kind: tipo do nó (Program, Function, If, Binary, Name, ...)
+        value: dado do próprio nó (nome, operador, lexema ou tipo declarado)
+        children: filhos, na ordem do código fonte
+        line: linha do código fonte
+    """
+    __slots__ = ('kind', 'value', 'children', 'line')
 
-        return self.fields[field]
+    def __init__(self, kind: str, value=None, children: Tuple['node', ...] = (), line: int = 0):
+        self.kind = kind
+        self.value = value
+        self.children = children
+        self.line = line
 
     def __repr__(self):
-        print(f'{' '*self.level}{self.token}')
-        for child in self.fields:
-            print(child)
+        return f"node({self.kind!r}, {self.value!r}, {len(self.children)} filhos, linha {self.line})"
+
+def shiftLines(root: node, delta: int) -> node:
+    """
+    Cópia da subárvore com as linhas deslocadas em delta, montada em pós-ordem
+    com pilha explícita; os nós originais não mudam
+    """
+    if not delta:
+        return root
+    done: List[node] = []
+    stack = [(root, False)]
+    while stack:
+        current, visited = stack.pop()
+        if visited:
+            size = len(current.children)
+            children = tuple(done[len(done) - size:]) if size else ()
+            del done[len(done) - size:]
+            done.append(node(current.kind, current.value, children, current.line + delta))
+        else:
+            stack.append((current, True))
+            for child in reversed(current.children):
+                stack.append((child, False))
+    return done[0]
+
+class Visitor:
+    """
+    Percorre a árvore chamando visit<Kind> para cada tipo de nó (visitBinary,
+    visitWhile, ...); tipos sem método próprio caem em genericVisit, que visita os filhos.
+    """
+    def visit(self, n: node):
+        return getattr(self, 'visit' + n.kind, self.genericVisit)(n)
+
+    def genericVisit(self, n: node):
+        for child in n.children:
+            self.visit(child)
 
 class ASA:
-    def __init__(self,stack):
-        self.stack = stack
-        self.root = self.process(self.stack)
+    """
+    Árvore sintática abstrata produzida pelo Sintático
+    """
+    root: node
+
+    def __init__(self, root: node):
+        self.root = root
 
-    def process(self,stack):
-        pass
+    def walk(self) -> Iterator[Tuple[node, int]]:
+        """
+        Percorre a árvore em pré-ordem com pilha explícita, gerando (nó, profundidade)
+        """
+        stack = [(self.root, 0)]
+        while stack:
+            current, level = stack.pop()
+            yield current, level
+            children = current.children
+            for index in range(len(children) - 1, -1, -1):
+                stack.append((children[index], level + 1))
+
+    def size(self) -> int:
+        return sum(1 for _ in self.walk())
+
+    def dump(self) -> str:
+        lines = []
+        for current, level in self.walk():
+            value = '' if current.value is None else f' {current.value}'
+            lines.append(f"{' ' * level}{current.kind}{value}")
+        return '\n'.join(lines)
 
     def __repr__(self):
-        print(self.root)
-        
\ No newline at end of file
+        return self.dump()
+
+class ASABuilder:
+    """
+    Ações semânticas do analisador preditivo: cada método, com o nome de um não
+    terminal de language.yml, recebe o índice da produção usada e os valores dos
+    seus símbolos (tokens para terminais, o retorno da ação para não terminais)
+    e devolve o valor do não terminal. Não terminais sem método (Type, OrExpr,
+    AddOp, ...) são transparentes: os valores dos seus filhos vão direto para
+    a ação do pai, o que evita uma chamada por regra de encadeamento.
+
+    A gramática não dá estrutura às expressões: CmplExpr -> OrExpr Expr gera
+    apenas os operadores, e o operando seguinte vem no Expr aninhado. As ações
+    de expressão acumulam a sequência de operandos e operadores (invertida, para
+    as listas recursivas à direita crescerem por append) e resolve() monta a
+    árvore com as precedências usuais quando a expressão termina. Listas de
+    comandos e declarações também são acumuladas invertidas.
+    """
+
+    def finish(self, program: list) -> ASA:
+        program.reverse()
+        line = program[0].line if program else 0
+        return ASA(node('Program', None, tuple(program), line))
+
+    def error(self, message: str, line: int):
+        raise SyntaxError(f"ERRO: {message} na linha {line}")
+
+    def resolve(self, sequence: list) -> node:
+        """
+        Monta a expressão a partir da sequência invertida de operandos (nós) e
+        operadores (tokens), pelo algoritmo shunting-yard. Um operador na posição
+        de operando é prefixo.
+        """
+        if len(sequence) == 1 and isinstance(sequence[0], node):
+            return sequence[0]
+        operands: List[node] = []
+        operators: List[Tuple[LexicalToken, bool]] = []
+        expectOperand = True
+
+        def reduce():
+            token, unary = operators.pop()
+            if unary:
+                operand = operands.pop()
+                operands.append(node('Unary', token.name, (operand,), token.line))
+                return
+            right = operands.pop()
+            left = operands.pop()
+            if token.name == '=':
+                if left.kind not in LVALUES:
+                    self.error("atribuição a uma expressão que não é variável", token.line)
+                operands.append(node('Assign', '=', (left, right), token.line))
+            else:
+                operands.append(node('Binary', token.name, (left, right), token.line))
+
+        for index in range(len(sequence) - 1, -1, -1):
+            item = sequence[index]
+            if isinstance(item, node):
+                if not expectOperand:
+                    self.error("operador esperado entre dois operandos", item.line)
+                operands.append(item)
+                expectOperand = False
+            elif expectOperand:
+                if item.name not in UNARY:
+                    self.error(f"operando esperado antes de {item.name}", item.line)
+                operators.append((item, True))
+            else:
+                if item.name not in PRECEDENCE:
+                    self.error(f"operador binário esperado no lugar de {item.name}", item.line)
+                precedence = PRECEDENCE[item.name]
+                while operators:
+                    top, unary = operators[-1]
+                    topPrecedence = 8 if unary else PRECEDENCE[top.name]
+                    if topPrecedence > precedence or (topPrecedence == precedence and precedence != PRECEDENCE['=']):
+                        reduce()
+                    else:
+                        break
+                operators.append((item, False))
+                expectOperand = True
+        if expectOperand:
+            line = sequence[0].line if sequence else 0
+            self.error("expressão incompleta", line)
+        while operators:
+            reduce()
+        return operands[0]
+
+    def leaf(self, token: LexicalToken, kind: str) -> node:
+        return node(kind, token.lexeme, (), token.line)
+
+    def variable(self, name: LexicalToken, size: Optional[LexicalToken]) -> node:
+        children = () if size is None else (self.leaf(size, 'Num'),)
+        return node('Var', name.lexeme, children, name.line)
+
+    # Declarações
+
+    def Program(self, index, values):
+        type, (name, rest) = values
+        kind, data = rest
+        if kind == 'vars':
+            names, program = data
+            variables = (self.variable(name, None),) + tuple(self.variable(n, size) for n, size in names)
+            program.append(node('VarDecl', type.name, variables, type.line))
+        else:
+            params, locals, body, program = data
+            children = (
+                node('Params', None, tuple(params), name.line),
+                node('Locals', None, tuple(locals), name.line),
+                node('Block', None, tuple(body), name.line),
+            )
+            program.append(node('Function', (type.name, name.lexeme), children, type.line))
+        return program
+
+    def Program1(self, index, values):
+        return values[0], values[1]
+
+    def Program2(self, index, values):
+        if index == 0:
+            return 'vars', (values[0], values[1])
+        return 'func', values[0]
+
+    def FunctionDecl(self, index, values):
+        _, params, _, _, locals, body, _, program = values
+        locals.reverse()
+        return params, locals, body, program
+
+    def FunctionDecl1(self, index, values):
+        return values[0] if index == 0 else []
+
+    def VarDecl(self, index, values):
+        if index == 1:
+            return []
+        type, names, _, rest = values
+        rest.append(node('VarDecl', type.name, tuple(self.variable(n, size) for n, size in names), type.line))
+        return rest
+
+    def IdList(self, index, values):
+        name, (size, rest) = values
+        return [(name, size)] + rest
+
+    def Array1(self, index, values):
+        return values[0], values[1]
+
+    def Array2(self, index, values):
+        if index == 1:
+            return []
+        _, name, (size, rest) = values
+        return [(name, size)] + rest
+
+    def Array(self, index, values):
+        return values[1] if index == 0 else None
+
+    def FormalList(self, index, values):
+        if index == 1:
+            return []
+        type, name, size, rest = values
+        return [node('Param', type.name, (self.variable(name, size),), type.line)] + rest
+
+    def FormalRest(self, index, values):
+        if index == 1:
+            return []
+        _, type, name, size, rest = values
+        return [node('Param', type.name, (self.variable(name, size),), type.line)] + rest
+
+    # Comandos
+
+    def StmtList(self, index, values):
+        stmt, rest = values
+        rest.append(stmt)
+        rest.reverse()
+        return rest
+
+    def StmtList1(self, index, values):
+        if index == 1:
+            return []
+        stmt, rest = values
+        rest.append(stmt)
+        return rest
+
+    def Stmt(self, index, values):
+        if index == 7:
+            return self.resolve(values[0])
+        line = values[0].line
+        if index == 0:
+            return node('If', None, (self.resolve(values[2]), values[4], values[6]), line)
+        if index == 1:
+            return node('While', None, (self.resolve(values[2]), values[4]), line)
+        if index == 2:
+            return node('Break', None, (), line)
+        if index == 3:
+            return node('Print', None, tuple(values[2]), line)
+        if index == 4:
+            return node('Readln', None, (self.resolve(values[2]),), line)
+        if index == 5:
+            return node('Return', None, (self.resolve(values[1]),), line)
+        return node('Block', None, tuple(values[1]), line)
+
+    # Expressões
+
+    def Expr(self, index, values):
+        if index == 0:
+            primary, (subscript, sequence) = values
+            if subscript is not None:
+                primary = node('Index', None, (primary, subscript), primary.line)
+            sequence.append(primary)
+            return sequence
+        operator, sequence = values
+        sequence.append(operator)
+        return sequence
+
+    def AltExpr(self, index, values):
+        if index == 0:
+            return self.resolve(values[1]), values[3]
+        if index == 1:
+            return None, values[0]
+        return None, []
+
+    def AltExpr1(self, index, values):
+        return values[0] if index == 0 else []
+
+    def CmplExpr(self, index, values):
+        # '=' Expr ou os operadores gerados por OrExpr seguidos do Expr
+        sequence = values[-1]
+        sequence.extend(reversed(values[:-1]))
+        return sequence
+
+    def Primary(self, index, values):
+        if index == 0:
+            return self.resolve(values[1])
+        token = values[0]
+        if index == 1:
+            arguments = values[1]
+            if arguments is None:
+                return self.leaf(token, 'Name')
+            return node('Call', token.lexeme, tuple(arguments), token.line)
+        if index == 2:
+            return self.leaf(token, 'Num')
+        if index == 3:
+            return self.leaf(token, 'Literal')
+        return node('Bool', token.name == 'true', (), token.line)
+
+    def Ident(self, index, values):
+        return values[1] if index == 0 else None
+
+    def ExprList(self, index, values):
+        if index == 1:
+            return []
+        arguments = values[0]
+        arguments.reverse()
+        return arguments
+
+    def ExprListTail(self, index, values):
+        sequence, rest = values
+        rest.append(self.resolve(sequence))
+        return rest
+
+    def ExprListTail1(self, index, values):
+        return values[1] if index == 0 else []
+
+class Expression:
+    """
+    Expressão aberta durante a conferência sem ASA:
+        closer: token que fecha a expressão (')', ']' ou ';')
+        group: se é um operando entre parênteses da expressão de fora
+        deferred: se o erro só é informado no fim do comando (condição de if e while, readln)
+        expect: se o próximo item é um operando
+        operands, operators: itens desde o último '=' (ou do começo)
+        lvalue: se o último operando é uma variável ou posição de array
+        assigned: se a expressão tem '='
+        pending: linha do '=' mais à direita com algo que não é variável à esquerda
+        error: primeiro erro dos operandos e operadores
+        index: erro do último índice [...], informado antes dos da expressão
+        argument: erro do último argumento anterior com erro, nas listas separadas por ','
+    """
+    __slots__ = ('closer', 'group', 'deferred', 'expect', 'operands', 'operators', 'lvalue', 'assigned',
+                 'pending', 'error', 'index', 'argument')
+
+    def __init__(self, closer: str, group: bool = False, deferred: bool = False):
+        self.closer = closer
+        self.group = group
+        self.deferred = deferred
+        self.argument = None
+        self.reset()
+
+    def reset(self):
+        self.expect = True
+        self.operands = 0
+        self.operators = 0
+        self.lvalue = False
+        self.assigned = False
+        self.pending = 0
+        self.error = None
+        self.index = None
+
+class ExpressionChecker:
+    """
+    Confere as expressões na análise preditiva sem ASA com as mesmas regras de
+    ASABuilder.resolve (operando entre dois operadores, operadores só prefixos
+    fora da posição de operando, atribuição a algo que não é variável), para
+    que as duas análises aceitem os mesmos programas. Recebe as expansões dos
+    não terminais de NONTERMINALS e os tokens de TOKENS reconhecidos. Cada
+    erro é informado no ponto em que a ação correspondente do ASABuilder
+    resolveria a expressão (a condição de um if, por exemplo, só depois do
+    comando inteiro), com a mesma mensagem.
+    """
+    NONTERMINALS = frozenset(('Stmt', 'Primary', 'Ident', 'AltExpr'))
+    TOKENS = frozenset(PRECEDENCE) | UNARY | {',', ')', ']', ';', '}'}
+    PARENTHESIZED = frozenset(('if', 'while', 'print', 'readln'))
+    NESTED = {'if': 2, 'while': 1}
+    """
+    Comandos aninhados em cada comando
+    """
+
+    def __init__(self):
+        self.open: List[Expression] = []
+        self.statements: List[list] = []
+        """
+        [comandos aninhados que faltam, token final, erro adiado] de cada comando aberto
+        """
+
+    def error(self, current: Expression, message: str, line: int):
+        if current.error is None:
+            current.error = f"ERRO: {message} na linha {line}"
+
+    def expand(self, nonterminal: str, token: LexicalToken):
+        open = self.open
+        if nonterminal == 'Stmt':
+            name = token.name
+            self.statements.append([self.NESTED.get(name, 0), '}' if name == '{' else ';', None])
+            if name in self.PARENTHESIZED:
+                open.append(Expression(')', deferred=name != 'print'))
+            elif name not in ('break', '{'):
+                open.append(Expression(';'))
+        elif nonterminal == 'Primary':
+            current = open[-1]
+            if not current.expect:
+                self.error(current, "operador esperado entre dois operandos", token.line)
+            current.expect = False
+            current.operands += 1
+            current.lvalue = token.name == 'ID'
+            if token.name == '(':
+                open.append(Expression(')', True))
+        elif nonterminal == 'Ident' and token.name == '(':
+            open[-1].lvalue = False
+            open.append(Expression(')'))
+        elif nonterminal == 'AltExpr' and token.name == '[':
+            open[-1].lvalue = True
+            open.append(Expression(']'))
+
+    def match(self, token: LexicalToken):
+        open = self.open
+        name = token.name
+        if name == ',':
+            if open:
+                current = open[-1]
+                current.argument = self.problem(current) or current.argument
+                current.reset()
+        elif name in (')', ']', ';', '}'):
+            if open and open[-1].closer == name:
+                self.close(open.pop())
+            statements = self.statements
+            if name in (';', '}') and statements and statements[-1][1] == name and not statements[-1][0]:
+                self.complete()
+        else:
+            current = open[-1]
+            if current.expect:
+                if name not in UNARY:
+                    self.error(current, f"operando esperado antes de {name}", token.line)
+                current.operators += 1
+                return
+            if name not in PRECEDENCE:
+                self.error(current, f"operador binário esperado no lugar de {name}", token.line)
+            current.expect = True
+            if name == '=':
+                if current.operators or current.operands != 1 or not current.lvalue:
+                    current.pending = token.line
+                current.assigned = True
+                current.operands = current.operators = 0
+            else:
+                current.operators += 1
+
+    def problem(self, current: Expression) -> Optional[str]:
+        """
+        Erro que resolve encontraria na expressão (ou no último argumento da lista)
+        """
+        if current.index is not None:
+            return current.index
+        if current.error is not None:
+            return current.error
+        if current.pending:
+            return f"ERRO: atribuição a uma expressão que não é variável na linha {current.pending}"
+        return None
+
+    def close(self, current: Expression):
+        error = self.problem(current) or current.argument
+        if current.closer == ']':
+            # o índice é resolvido depois do resto da expressão de fora, antes dela
+            if error is not None:
+                self.open[-1].index = error
+        elif current.deferred:
+            self.statements[-1][2] = error
+        elif error is not None:
+            raise SyntaxError(error)
+        elif current.group:
+            self.open[-1].lvalue = not current.assigned and not current.operators \
+                and current.operands == 1 and current.lvalue
+
+    def complete(self):
+        """
+        Fecha o comando atual e os comandos que terminam com ele
+        """
+        statements = self.statements
+        while statements:
+            _, _, error = statements.pop()
+            if error is not None:
+                raise SyntaxError(error)
+            if not statements or not statements[-1][0]:
+                return
+            statements[-1][0] -= 1
+            if statements[-1][0]:
+                return
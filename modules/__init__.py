@@ -2,14 +2,17 @@ from injector import Injector
 from modules.FileSystem import FileSystemModule, IFileSystem
 from modules.Lexico import LexicoModule, ILexico
 from modules.Sintatico import SintaticoModule, ISintatico
+from modules.Gerador import GeradorModule, IGerador
 
 
 injector = Injector([
     FileSystemModule(),
     LexicoModule(),
     SintaticoModule(),
+    GeradorModule(),
     ])
 
 fileSystem = injector.get(IFileSystem)
 lexico = injector.get(ILexico)
-sintatico = injector.get(ISintatico)
\ No newline at end of file
+sintatico = injector.get(ISintatico)
+gerador = injector.get(IGerador)
\ No newline at end of file
@@ -1,58 +1,22 @@
 import json
 
+from modules.Sintatico.Grammar import Grammar
+
+EPSILON = "ε"
+
 class LL1Parser():
-    def __init__(self,grammar):
-        #self.dict = tokens
+    def __init__(self,grammar,tokens):
+        self.dict = tokens
         self.dict.update({'$':'$'})
-        self.first = self.computeFirst(grammar)
+        analysis = Grammar(grammar, 'Program', EPSILON)
+        self.first = analysis.first
+        self.follow = analysis.follow
         self.word = ''
-        #self.follow = self.computeFollow(grammar,self.first)
 
     def printDict(self,dict):
         for k,v in dict.items():
             print(f'{k}:{v}')
 
-    def isTerminal(self,s,grammar):
-        return s not in grammar
-    
-    def computeFirst(self,grammar):
-        EPSILON = "ε"
-        first = {nt: set() for nt in grammar}
-
-        aux = True
-        while aux:
-            aux = False
-            for nt, productions in grammar.items():
-                for prod in productions:
-                    if len(prod) == 0 or prod == [EPSILON]:
-                        if EPSILON not in first[nt]:
-                            first[nt].add(EPSILON)
-                            aux = True
-                        continue
-                    for s in prod:
-                        if self.isTerminal(s, grammar):
-                            if s not in first[nt]:
-                                first[nt].add(s)
-                                aux = True
-                            break
-                        before = len(first[nt])
-                        first[nt].update(first[s] - {EPSILON})
-                        after = len(first[nt])
-                        if after > before:
-                            aux = True
-
-                        if EPSILON not in first[s]:
-                            break
-                    else:
-                        if EPSILON not in first[nt]:
-                            first[nt].add(EPSILON)
-                            aux = True
-        return first
-
-
-    def computeFollow(self,grammar,first):
-        pass
-    
     def processInput(self):
         with open("./saida.txt", 'r') as f:
             lexico = f.read()